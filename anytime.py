@@ -0,0 +1,395 @@
+"""
+Anytime solver: a usable answer within a wall-clock / node budget, and the
+exact top-k when the budget allows.
+
+1. A greedy pass from the core heroes seeds the top-k with one good team.
+2. An ordered branch-and-bound DFS then improves it. Every node scores all
+   its branches with an admissible bound (see helper.gain_ratio_tables) and
+   visits them best first, cutting the rest as soon as one cannot beat the
+   current k-th best score.
+3. When the budget runs out, the largest bound among the branches not yet
+   explored caps what the missing part of the search could still find.
+   That gives an optimality gap, or a proof if nothing unexplored can beat
+   the k-th best score.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty).
+"""
+
+import heapq
+import time
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_THRESHOLD,
+    bnb_pool_order,
+    compile_roster,
+    gain_ratio_tables,
+    query_hero_traits,
+    require_default_scoring,
+    trait_tables,
+)
+from stats import PRUNE_BOUND
+
+class _BudgetExhausted(Exception):
+    pass
+
+def find_best_team_anytime(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    time_budget=None,
+    node_budget=None,
+    on_snapshot=None,
+    should_stop=None,
+    stats=None,
+    model=None,
+):
+    """
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    time_budget    : seconds before returning the best teams so far (None = no limit)
+    node_budget    : search nodes before returning (None = no limit)
+    on_snapshot    : optional callback(results, status), called after the
+                     greedy seed and every time the top-k improves
+    should_stop    : optional callable checked with the budgets; returning
+                     True ends the search like an exhausted budget (ex: the
+                     caller went away)
+    stats          : optional stats.SolverStats to fill in
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+
+    Returns
+    -------
+    (results, status)
+        results : same shape as find_best_team
+        status  : dict with
+            proven       True if results are the exact top-k
+            upper_bound  no team missing from results scores above this
+                         (None if unknown)
+            gap          upper_bound - k-th best score (0 when proven)
+            nodes, teams, elapsed
+    """
+
+    require_default_scoring(model, "find_best_team_anytime")
+
+    start_time = time.perf_counter()
+    deadline = None if time_budget is None else start_time + time_budget
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team_anytime")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+
+    free_pool = [hid for hid in range(roster.num_heroes) if hid not in core_hero_ids]
+    dfs_pool = bnb_pool_order(hero_index, free_pool)
+    pool_size = len(dfs_pool)
+
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+    pool_quality = [roster.quality[hid] for hid in dfs_pool]
+    pool_metro = [roster.metro_zero[hid] for hid in dfs_pool]
+
+    remaining_metro_suffix = [0] * (pool_size + 1)
+    for i in range(pool_size - 1, -1, -1):
+        remaining_metro_suffix[i] = remaining_metro_suffix[i + 1] + pool_metro[i]
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, reached_table = trait_tables(trait_index, max_count)
+    gain_ratio_table = gain_ratio_tables(points_table, remaining_slots)
+    trait_ids_range = range(roster.num_traits)
+
+    # -----------------------------
+    # Incremental state
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    synergy_score = 0
+    current_quality = 0
+    current_metro = 0
+    team = []
+
+    def add_traits(tids):
+        nonlocal synergy_score
+        for tid in tids:
+            count = trait_counts[tid]
+            synergy_score += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+
+    def add_hero(i):
+        """Add the hero at dfs_pool position i."""
+        nonlocal current_quality, current_metro
+        team.append(dfs_pool[i])
+        add_traits(pool_traits[i])
+        current_quality += pool_quality[i]
+        current_metro += pool_metro[i]
+
+    def remove_hero(i):
+        nonlocal current_quality, current_metro, synergy_score
+        team.pop()
+        for tid in pool_traits[i]:
+            count = trait_counts[tid]
+            synergy_score += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+        current_quality -= pool_quality[i]
+        current_metro -= pool_metro[i]
+
+    for hid in core_hero_ids:
+        team.append(hid)
+        add_traits(hero_traits[hid])
+        current_quality += roster.quality[hid]
+        current_metro += roster.metro_zero[hid]
+
+    for tid, bonus in magic_crystal_ids.items():
+        for _ in range(bonus):
+            add_traits((tid,))
+
+    def leaf_score():
+        score = synergy_score + current_quality
+        if current_metro >= METRO_ZERO_THRESHOLD:
+            return score + METRO_ZERO_BONUS
+        return score - METRO_ZERO_BONUS
+
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    best_heap = []
+    in_heap = set()      # the greedy seed is found again by the DFS
+    nodes = 0
+    evaluated = 0
+    pruned = 0
+    replacements = 0
+
+    def results():
+        return sorted(best_heap, reverse=True, key=lambda x: x[0])
+
+    def snapshot_status(proven=False, upper_bound=None):
+        gap = None
+        if proven:
+            gap = 0
+            if best_heap:
+                upper_bound = best_heap[0][0]
+        elif upper_bound is not None and len(best_heap) >= top_k:
+            gap = max(0, upper_bound - best_heap[0][0])
+
+        return {
+            "proven": proven,
+            "upper_bound": upper_bound,
+            "gap": gap,
+            "nodes": nodes,
+            "teams": evaluated,
+            "elapsed": time.perf_counter() - start_time,
+        }
+
+    def offer():
+        """Push the current team into the top-k if it qualifies."""
+        nonlocal evaluated, scoring_seconds
+        evaluated += 1
+
+        if timed:
+            scoring_start = time.perf_counter()
+            offer_team()
+            scoring_seconds += time.perf_counter() - scoring_start
+        else:
+            offer_team()
+
+    def offer_team():
+        nonlocal replacements
+
+        score = leaf_score()
+        if len(best_heap) >= top_k and score <= best_heap[0][0]:
+            return
+
+        sorted_team = tuple(sorted(team))
+        if sorted_team in in_heap:
+            return
+
+        synergy_info = {
+            tid: reached_table[tid][count]
+            for tid, count in enumerate(trait_counts)
+            if reached_table[tid][count]
+        }
+        entry = (score, sorted_team, synergy_info)
+
+        if len(best_heap) < top_k:
+            if not best_heap and stats is not None:
+                stats.first_result()
+            heapq.heappush(best_heap, entry)
+        else:
+            evicted = heapq.heapreplace(best_heap, entry)
+            in_heap.discard(evicted[1])
+            replacements += 1
+        in_heap.add(sorted_team)
+
+        if on_snapshot is not None:
+            on_snapshot(results(), snapshot_status())
+
+    # -----------------------------
+    # Greedy seed
+    # -----------------------------
+    picked = []
+    for _ in range(min(remaining_slots, pool_size)):
+        best_pick = None
+        for i in range(pool_size):
+            if i in picked:
+                continue
+            add_hero(i)
+            score = leaf_score()
+            remove_hero(i)
+            if best_pick is None or score > best_pick[0]:
+                best_pick = (score, i)
+
+        add_hero(best_pick[1])
+        picked.append(best_pick[1])
+
+    if len(picked) == remaining_slots:
+        offer()
+
+    for i in reversed(picked):
+        remove_hero(i)
+
+    # -----------------------------
+    # Ordered branch-and-bound DFS
+    # -----------------------------
+    def branch_bounds(start_idx, slots_left):
+        """
+        (bound, pool position) for every branch of the current node, best first.
+
+        Branch i picks dfs_pool[i] next and the rest from dfs_pool[i + 1:].
+        """
+        ratio = [gain_ratio_table[tid][trait_counts[tid]][slots_left] for tid in trait_ids_range]
+
+        gains = [
+            pool_quality[i] + sum(ratio[tid] for tid in pool_traits[i])
+            for i in range(start_idx, pool_size)
+        ]
+
+        # best_rest[k] = sum of the top (slots_left - 1) gains after offset k
+        best_rest = [0.0] * len(gains)
+        window = []
+        window_sum = 0.0
+        for k in range(len(gains) - 1, -1, -1):
+            best_rest[k] = window_sum
+            if slots_left > 1:
+                if len(window) < slots_left - 1:
+                    heapq.heappush(window, gains[k])
+                    window_sum += gains[k]
+                elif gains[k] > window[0]:
+                    window_sum += gains[k] - heapq.heapreplace(window, gains[k])
+
+        base = synergy_score + current_quality
+        branches = []
+
+        for i in range(start_idx, pool_size - slots_left + 1):
+            k = i - start_idx
+            bound = base + gains[k] + best_rest[k]
+
+            metro = current_metro + pool_metro[i] + min(slots_left - 1, remaining_metro_suffix[i + 1])
+            if metro >= METRO_ZERO_THRESHOLD:
+                bound += METRO_ZERO_BONUS
+            else:
+                bound -= METRO_ZERO_BONUS
+
+            branches.append((int(bound + 1e-9), i))
+
+        branches.sort(reverse=True)
+        return branches
+
+    # One [branches, position] frame per open DFS level, to bound what is
+    # left unexplored if the budget runs out
+    frontier = []
+
+    def out_of_budget():
+        if node_budget is not None and nodes >= node_budget:
+            return True
+        if should_stop is not None and should_stop():
+            return True
+        return deadline is not None and time.perf_counter() >= deadline
+
+    def dfs(start_idx, slots_left):
+        nonlocal nodes, pruned
+        nodes += 1
+
+        branches = branch_bounds(start_idx, slots_left)
+        frame = [branches, 0]
+        frontier.append(frame)
+
+        for position, (bound, i) in enumerate(branches):
+            frame[1] = position
+
+            # Branches are sorted: none of the rest can enter the heap either
+            if len(best_heap) >= top_k and bound <= best_heap[0][0]:
+                pruned += len(branches) - position
+                break
+
+            if slots_left == 1:
+                add_hero(i)
+                offer()
+                remove_hero(i)
+                continue
+
+            if out_of_budget():
+                raise _BudgetExhausted
+
+            add_hero(i)
+            dfs(i + 1, slots_left - 1)
+            remove_hero(i)
+
+        frontier.pop()
+
+    def done(status):
+        if stats is not None:
+            stats.nodes = nodes
+            stats.leaves = evaluated
+            stats.prune(PRUNE_BOUND, pruned)
+            stats.heap_pushes = len(best_heap)
+            stats.heap_replacements = replacements
+            stats.scoring_seconds = scoring_seconds
+            stats.extra["proven"] = status["proven"]
+            stats.finish()
+        return results(), status
+
+    if remaining_slots == 0:
+        offer()
+        return done(snapshot_status(proven=True))
+
+    if pool_size < remaining_slots:
+        return done(snapshot_status(proven=True))
+
+    try:
+        dfs(0, remaining_slots)
+    except _BudgetExhausted:
+        # Deepest frame: the branch about to start is unexplored.
+        # Shallower frames: only branches after the current one are.
+        upper_bound = None
+        for depth, (branches, position) in enumerate(frontier):
+            first_open = position if depth == len(frontier) - 1 else position + 1
+            if first_open < len(branches):
+                bound = branches[first_open][0]
+                if upper_bound is None or bound > upper_bound:
+                    upper_bound = bound
+
+        if upper_bound is None or (len(best_heap) >= top_k and upper_bound <= best_heap[0][0]):
+            status = snapshot_status(proven=len(best_heap) >= top_k or upper_bound is None)
+        else:
+            status = snapshot_status(upper_bound=upper_bound)
+
+        return done(status)
+
+    return done(snapshot_status(proven=True))
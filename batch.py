@@ -0,0 +1,430 @@
+"""
+Batch query API: many optimizer queries in one call.
+
+Specs use the benchmark scenario format (hero and trait names):
+
+    {"size": 9, "core_heroes": ["Irithel"], "glory_league": ["Kula", "Benedetta"],
+     "magic_crystals": ["Marksman"], "top_k": 5}
+
+run_batch(specs, hero_index, traits_index) returns one BatchResult per spec,
+in input order, and amortizes the work across the batch:
+
+1. Names are resolved once per distinct list, and identical normalized
+   queries (see cache.query_signature) are solved once.
+2. Queries with the same team size, core heroes and Glory League pair only
+   differ by their crystals, which are per-trait offsets on the same trait
+   counts. Each such group is solved by one branch-and-bound pass
+   (group_search): one DFS over shared trait counts, with one top-k heap and
+   one bound per query. A subtree is left as soon as no query in the group
+   can still improve in it, and a query drops out of a subtree as soon as it
+   can't improve there.
+3. Score tables are built once per (max count, slots) and shared by every
+   group. Groups are fanned out over a process pool when workers > 1.
+"""
+
+import heapq
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from cache import query_signature
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_THRESHOLD,
+    bnb_pool_order,
+    compile_roster,
+    gain_ratio_tables,
+    get_core_hid,
+    get_glory_league_hid,
+    get_mcid,
+    query_hero_traits,
+    require_default_scoring,
+    roster_hash,
+    trait_tables,
+)
+
+@dataclass(slots=True)
+class BatchResult:
+    results: list                         # same shape as find_best_team
+    seconds: float                        # this query's share of its group's solve time
+    group: int                            # queries solved by the same pass share a group
+    duplicate_of: Optional[int] = None    # index of the first identical spec, if any
+
+def resolve_query(spec, hero_index, trait_index):
+    """Benchmark-style spec -> (max_team_size, find_best_team keyword arguments)."""
+    return spec["size"], dict(
+        core_hero_ids=get_core_hid(hero_index, spec.get("core_heroes")),
+        glory_league_ids=get_glory_league_hid(hero_index, spec.get("glory_league")),
+        magic_crystal_ids=get_mcid(trait_index, spec.get("magic_crystals")),
+        top_k=spec.get("top_k", 5),
+    )
+
+# -----------------------------
+# Shared score tables
+# -----------------------------
+@dataclass(slots=True)
+class _Tables:
+    trait_index: list
+    cache: Dict[Tuple[int, int], tuple] = field(default_factory=dict)
+
+    def get(self, max_count, slots):
+        """(points_table, reached_table, gain_ratio_table), built once per key."""
+        key = (max_count, slots)
+        tables = self.cache.get(key)
+
+        if tables is None:
+            points_table, reached_table = trait_tables(self.trait_index, max_count)
+            tables = (points_table, reached_table, gain_ratio_tables(points_table, slots))
+            self.cache[key] = tables
+
+        return tables
+
+# -----------------------------
+# One pass for a group of crystal variants
+# -----------------------------
+def group_search(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids,
+    glory_league_ids,
+    crystal_sets,
+    top_k=5,
+    tables=None,
+):
+    """
+    Top-k teams for every magic_crystal_ids dict in crystal_sets, sharing one
+    branch-and-bound DFS. Same scores as find_best_team_bnb per query.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    crystal_sets   : list of magic_crystal_ids dicts, one per query
+    tables         : optional _Tables to share score tables across calls
+
+    Returns one sorted result list per crystal set.
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if tables is None:
+        tables = _Tables(trait_index)
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    metro_flags = roster.metro_zero
+
+    free_pool = [h.id for h in hero_index if h.id not in core_hero_ids]
+    dfs_pool = bnb_pool_order(hero_index, free_pool)
+    pool_size = len(dfs_pool)
+
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+    pool_quality = [roster.quality[hid] for hid in dfs_pool]
+    pool_metro = [metro_flags[hid] for hid in dfs_pool]
+
+    remaining_metro_suffix = [0] * (pool_size + 1)
+    for i in range(pool_size - 1, -1, -1):
+        remaining_metro_suffix[i] = remaining_metro_suffix[i + 1] + pool_metro[i]
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    max_crystals = max((sum(crystals.values()) for crystals in crystal_sets), default=0)
+    max_count = 2 * max_team_size + max_crystals
+    points_table, reached_table, gain_ratio_table = tables.get(max_count, max(remaining_slots, 1))
+
+    trait_ids_range = range(roster.num_traits)
+    queries = range(len(crystal_sets))
+    offsets = [sorted(crystals.items()) for crystals in crystal_sets]
+
+    # carriers[tid] = pool positions carrying tid, for per-query bound fixes
+    carriers = [[] for _ in trait_ids_range]
+    for i, tids in enumerate(pool_traits):
+        for tid in tids:
+            carriers[tid].append(i)
+
+    # -----------------------------
+    # Shared incremental state (no crystals)
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    current_synergy = 0
+    current_quality = 0
+    current_metro = 0
+    team = []
+
+    def add_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+
+    def remove_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+
+    for hid in core_hero_ids:
+        add_traits(hero_traits[hid])
+        team.append(hid)
+        current_quality += roster.quality[hid]
+        current_metro += metro_flags[hid]
+
+    def crystal_gain(q):
+        """Synergy the query's crystals add on top of the shared counts."""
+        gain = 0
+        for tid, bonus in offsets[q]:
+            count = trait_counts[tid]
+            gain += points_table[tid][count + bonus] - points_table[tid][count]
+        return gain
+
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    heaps = [[] for _ in queries]
+
+    def upper_bounds(active, start_idx, slots_left):
+        """Optimistic score of any completion, for each active query."""
+        ratio = [gain_ratio_table[tid][trait_counts[tid]][slots_left] for tid in trait_ids_range]
+        base_gains = [
+            pool_quality[i] + sum(ratio[tid] for tid in pool_traits[i])
+            for i in range(start_idx, pool_size)
+        ]
+
+        base = current_synergy + current_quality
+        if current_metro + min(slots_left, remaining_metro_suffix[start_idx]) >= METRO_ZERO_THRESHOLD:
+            base += METRO_ZERO_BONUS
+        else:
+            base -= METRO_ZERO_BONUS
+
+        bounds = []
+        for q in active:
+            gains = base_gains
+            if offsets[q]:
+                gains = list(base_gains)
+                for tid, bonus in offsets[q]:
+                    delta = gain_ratio_table[tid][trait_counts[tid] + bonus][slots_left] - ratio[tid]
+                    if delta:
+                        for i in carriers[tid]:
+                            if i >= start_idx:
+                                gains[i - start_idx] += delta
+
+            bounds.append(base + crystal_gain(q) + sum(heapq.nlargest(slots_left, gains)))
+
+        return bounds
+
+    def dfs(active, start_idx, slots_left):
+        nonlocal current_quality, current_metro
+
+        # Leaf
+        if slots_left == 0:
+            base = current_synergy + current_quality
+            if current_metro >= METRO_ZERO_THRESHOLD:
+                base += METRO_ZERO_BONUS
+            else:
+                base -= METRO_ZERO_BONUS
+
+            for q in active:
+                score = base + crystal_gain(q)
+                best_heap = heaps[q]
+
+                if len(best_heap) < top_k or score > best_heap[0][0]:
+                    counts = list(trait_counts)
+                    for tid, bonus in offsets[q]:
+                        counts[tid] += bonus
+                    synergy_info = {
+                        tid: reached_table[tid][count]
+                        for tid, count in enumerate(counts)
+                        if reached_table[tid][count]
+                    }
+                    entry = (score, tuple(sorted(team)), synergy_info)
+
+                    if len(best_heap) < top_k:
+                        heapq.heappush(best_heap, entry)
+                    else:
+                        heapq.heapreplace(best_heap, entry)
+            return
+
+        # Not enough heroes left to fill the team
+        if pool_size - start_idx < slots_left:
+            return
+
+        # Bound cut, per query: a query whose bound can't beat its k-th best
+        # score leaves this subtree
+        full = [q for q in active if len(heaps[q]) >= top_k]
+        if full:
+            bounds = dict(zip(full, upper_bounds(full, start_idx, slots_left)))
+            active = [
+                q for q in active
+                if q not in bounds or int(bounds[q] + 1e-9) > heaps[q][0][0]
+            ]
+            if not active:
+                return
+
+        # Expand
+        for i in range(start_idx, pool_size - slots_left + 1):
+            tids = pool_traits[i]
+
+            team.append(dfs_pool[i])
+            add_traits(tids)
+            current_quality += pool_quality[i]
+            current_metro += pool_metro[i]
+
+            dfs(active, i + 1, slots_left - 1)
+
+            team.pop()
+            remove_traits(tids)
+            current_quality -= pool_quality[i]
+            current_metro -= pool_metro[i]
+
+    dfs(list(queries), 0, remaining_slots)
+
+    return [sorted(best_heap, reverse=True, key=lambda x: x[0]) for best_heap in heaps]
+
+# -----------------------------
+# Batch runner
+# -----------------------------
+# Per-process state set once by _init_worker
+_worker_state = {}
+
+def _init_worker(hero_index, trait_index):
+    _worker_state["hero_index"] = hero_index
+    _worker_state["trait_index"] = trait_index
+    _worker_state["tables"] = _Tables(trait_index)
+
+def _solve_group(group_key, crystal_sets, top_k):
+    """One group in a worker; returns (result lists, seconds)."""
+    max_team_size, core_hero_ids, glory_league_ids = group_key
+    start = time.perf_counter()
+    results = group_search(
+        max_team_size,
+        _worker_state["hero_index"],
+        _worker_state["trait_index"],
+        list(core_hero_ids),
+        set(glory_league_ids),
+        crystal_sets,
+        top_k=top_k,
+        tables=_worker_state["tables"],
+    )
+    return results, time.perf_counter() - start
+
+def run_batch(specs, hero_index, trait_index, workers=1, model=None):
+    """
+    Solve every spec; returns a BatchResult per spec, in input order.
+
+    specs          : list of benchmark-style query dicts (see module docstring)
+    workers        : worker processes for the groups (None = os.cpu_count(),
+                     1 = solve in this process)
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+
+    A bad spec (unknown hero, invalid Glory League pair, ...) raises
+    ValueError before anything is solved.
+    """
+    require_default_scoring(model, "run_batch")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    roster_key = roster_hash(trait_index, hero_index)
+
+    # -----------------------------
+    # Resolve + deduplicate
+    # -----------------------------
+    resolved = {}       # raw spec key -> (size, query), names resolved once
+    first_index = {}    # signature -> index of its first spec
+    signatures = []
+
+    for index, spec in enumerate(specs):
+        raw_key = (
+            spec["size"],
+            tuple(spec.get("core_heroes") or ()),
+            tuple(spec.get("glory_league") or ()),
+            tuple(spec.get("magic_crystals") or ()),
+            spec.get("top_k", 5),
+        )
+        if raw_key not in resolved:
+            resolved[raw_key] = resolve_query(spec, hero_index, trait_index)
+        max_team_size, query = resolved[raw_key]
+
+        if len(query["core_hero_ids"]) > max_team_size:
+            raise ValueError(
+                f"Core heroes ({len(query['core_hero_ids'])}) exceed team size ({max_team_size})."
+            )
+
+        signature = query_signature(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=query["core_hero_ids"],
+            glory_league_ids=query["glory_league_ids"],
+            magic_crystal_ids=query["magic_crystal_ids"],
+            roster_key=roster_key,
+        )
+        signatures.append((signature, query["top_k"]))
+        first_index.setdefault(signature, (index, max_team_size, query))
+
+    # -----------------------------
+    # Group by (size, core heroes, Glory League pair)
+    # -----------------------------
+    groups = {}         # group key -> [signature, ...]
+    group_top_k = {}
+
+    for signature, top_k in signatures:
+        _, max_team_size, query = first_index[signature]
+        group_key = (
+            max_team_size,
+            tuple(sorted(query["core_hero_ids"])),
+            tuple(sorted(query["glory_league_ids"])),
+        )
+        members = groups.setdefault(group_key, [])
+        if signature not in members:
+            members.append(signature)
+        group_top_k[group_key] = max(group_top_k.get(group_key, 0), top_k)
+
+    jobs = [
+        (group_key, [dict(first_index[signature][2]["magic_crystal_ids"]) for signature in members], group_top_k[group_key])
+        for group_key, members in groups.items()
+    ]
+
+    # -----------------------------
+    # Solve
+    # -----------------------------
+    if workers == 1 or len(jobs) == 1:
+        _init_worker(hero_index, trait_index)
+        solved = [_solve_group(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(hero_index, trait_index),
+        ) as executor:
+            solved = list(executor.map(_solve_group, *zip(*jobs)))
+
+    answers = {}        # signature -> (results, seconds, group)
+    for group, ((_, members), (result_lists, seconds)) in enumerate(zip(groups.items(), solved)):
+        for signature, results in zip(members, result_lists):
+            answers[signature] = (results, seconds / len(members), group)
+
+    # -----------------------------
+    # Fan back out, input order
+    # -----------------------------
+    batch = []
+    for index, (signature, top_k) in enumerate(signatures):
+        results, seconds, group = answers[signature]
+        first = first_index[signature][0]
+        batch.append(BatchResult(
+            results=results[:top_k],
+            seconds=seconds,
+            group=group,
+            duplicate_of=first if first != index else None,
+        ))
+
+    return batch
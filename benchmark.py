@@ -0,0 +1,558 @@
+"""
+Benchmark suite and performance regression harness for every solver.
+
+Runs a fixed, seeded matrix of scenarios (team sizes 5-10, 0-5 core heroes,
+with / without a Glory League pair, 0-3 magic crystals) through every solver
+and records wall time, teams per second, search nodes and peak memory.
+Every result is checked against the reference solver and rescored with
+evaluate_team.
+
+    python benchmark.py run --out baseline.json
+    python benchmark.py run --quick --out current.json
+    python benchmark.py compare baseline.json current.json
+    python benchmark.py profile size9-core2-gl1-mc0 --solver find_best_team_dp
+
+compare exits with status 1 if a solver got slower or heavier than the
+tolerance allows, or if it broke (mismatch / error) where the baseline was ok.
+
+profile runs one scenario under cProfile, prints the hottest functions and
+writes a .prof file (snakeviz / flameprof turn it into a flame graph).
+
+Exhaustive solvers are skipped on scenarios with more than --max-combinations
+teams to enumerate; the branch-and-bound style solvers run everywhere.
+Wall times are the best of --repeat runs; use --repeat 3 or more for
+reports meant for compare on a noisy machine.
+With --memory, peak memory is measured by tracemalloc in a second, untimed
+run of the same query (parent process only, so worker processes are not
+included). tracemalloc slows the solvers down 10-20x, so it is opt-in.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+from anytime import find_best_team_anytime
+from heuristic import find_best_team_beam
+from helper import (
+    GLORY_LEAGUE_ALLOWED_PAIRS,
+    MAGIC_CRYSTAL_ALLOWED,
+    METRO_ZERO_ID,
+    evaluate_team,
+    find_best_team,
+    find_best_team_bnb,
+    find_best_team_increment_dfs,
+    find_best_team_m0_enforced,
+    find_best_team_m0_increment_dfs,
+    get_core_hid,
+    get_glory_league_hid,
+    get_mcid,
+    initialize_traits_and_heroes,
+    roster_hash,
+)
+from mitm import find_best_team_mitm
+from parallel import find_best_team_parallel
+from profile_dp import find_best_team_dp
+from reduction import find_best_team_reduced
+from stats import SolverStats, profile_query
+from stream import iter_best_teams
+
+DEFAULT_MAX_COMBINATIONS = 50_000
+DEFAULT_TOLERANCE = 0.5
+
+# Differences below these are noise, not regressions
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_KIB = 256
+
+FULL_MATRIX = dict(
+    sizes=range(5, 11),
+    core_counts=range(0, 6),
+    glory_league=(False, True),
+    crystal_counts=range(0, 4),
+)
+
+QUICK_MATRIX = dict(
+    sizes=(5, 7, 9),
+    core_counts=(0, 2, 4),
+    glory_league=(False, True),
+    crystal_counts=(0, 2),
+)
+
+# -----------------------------
+# Solvers
+# -----------------------------
+@dataclass(frozen=True, slots=True)
+class Solver:
+    name: str
+    run: Callable
+    exact: bool = True          # results must match the reference scores
+    exhaustive: bool = False    # enumerates every team: capped by max_combinations
+    metro_zero_only: bool = False   # drops teams without Metro Zero
+
+def _find_best_team_numpy(*args, **kwargs):
+    return find_best_team(*args, engine="numpy", **kwargs)
+
+def _find_best_team_bitset(*args, **kwargs):
+    return find_best_team(*args, engine="bitset", **kwargs)
+
+def _find_best_team_revolving(*args, **kwargs):
+    return find_best_team(*args, engine="revolving", **kwargs)
+
+def _find_best_team_m0_revolving(*args, **kwargs):
+    return find_best_team_m0_enforced(*args, engine="revolving", **kwargs)
+
+def _find_best_team_anytime(*args, **kwargs):
+    results, _ = find_best_team_anytime(*args, **kwargs)
+    return results
+
+def _iter_best_teams(*args, top_k=5, **kwargs):
+    return list(itertools.islice(iter_best_teams(*args, **kwargs), top_k))
+
+def _numpy_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def default_solvers():
+    """
+    Every solver in the repo, reference first: a scenario's reference is the
+    first exact solver in this order that ran and keeps teams without
+    Metro Zero.
+    """
+    solvers = [
+        Solver("find_best_team", find_best_team, exhaustive=True),
+        Solver("find_best_team[bitset]", _find_best_team_bitset, exhaustive=True),
+        Solver("find_best_team[revolving]", _find_best_team_revolving, exhaustive=True),
+        Solver("find_best_team_m0_enforced", find_best_team_m0_enforced, exhaustive=True, metro_zero_only=True),
+        Solver("find_best_team_m0_enforced[revolving]", _find_best_team_m0_revolving, exhaustive=True, metro_zero_only=True),
+        Solver("find_best_team_increment_dfs", find_best_team_increment_dfs, exhaustive=True, metro_zero_only=True),
+        Solver("find_best_team_m0_increment_dfs", find_best_team_m0_increment_dfs, exhaustive=True, metro_zero_only=True),
+        Solver("find_best_team_reduced", find_best_team_reduced, exhaustive=True),
+        # Not exhaustive, but its half tables grow with the pool: capped the same way
+        Solver("find_best_team_mitm", find_best_team_mitm, exhaustive=True),
+        Solver("find_best_team_bnb", find_best_team_bnb),
+        Solver("find_best_team_parallel", find_best_team_parallel),
+        Solver("find_best_team_anytime", _find_best_team_anytime),
+        Solver("find_best_team_dp", find_best_team_dp),
+        Solver("iter_best_teams", _iter_best_teams),
+        Solver("find_best_team_beam", find_best_team_beam, exact=False),
+    ]
+
+    if _numpy_available():
+        solvers.insert(1, Solver("find_best_team[numpy]", _find_best_team_numpy, exhaustive=True))
+
+    return solvers
+
+# -----------------------------
+# Scenarios
+# -----------------------------
+def build_scenarios(sizes, core_counts, glory_league, crystal_counts, hero_index):
+    """
+    The scenario matrix. Core heroes, Glory League pair and crystals are
+    drawn from a generator seeded by the scenario id, so every run (and
+    every machine) benchmarks the same queries.
+    """
+    hero_names = sorted(h.name for h in hero_index)
+    pairs = sorted(
+        (one_cost, five_cost)
+        for one_cost, five_costs in GLORY_LEAGUE_ALLOWED_PAIRS.items()
+        for five_cost in five_costs
+    )
+    crystals = sorted(MAGIC_CRYSTAL_ALLOWED)
+
+    scenarios = []
+
+    for size in sizes:
+        for core_count in core_counts:
+            if core_count > size:
+                continue
+
+            for with_glory_league in glory_league:
+                for crystal_count in crystal_counts:
+                    scenario_id = f"size{size}-core{core_count}-gl{int(with_glory_league)}-mc{crystal_count}"
+                    rng = random.Random(scenario_id)
+
+                    scenarios.append({
+                        "id": scenario_id,
+                        "size": size,
+                        "core_heroes": rng.sample(hero_names, core_count),
+                        "glory_league": list(rng.choice(pairs)) if with_glory_league else [],
+                        "magic_crystals": rng.sample(crystals, crystal_count),
+                    })
+
+    return scenarios
+
+def scenario_from_id(scenario_id, hero_index):
+    """Rebuild one scenario from its id (ex: size9-core2-gl1-mc0)."""
+    try:
+        size, core, gl, mc = scenario_id.split("-")
+        matrix = dict(
+            sizes=[int(size.removeprefix("size"))],
+            core_counts=[int(core.removeprefix("core"))],
+            glory_league=[bool(int(gl.removeprefix("gl")))],
+            crystal_counts=[int(mc.removeprefix("mc"))],
+        )
+    except ValueError:
+        raise ValueError(f"Bad scenario id: {scenario_id!r} (ex: size9-core2-gl1-mc0)") from None
+
+    scenarios = build_scenarios(hero_index=hero_index, **matrix)
+    if not scenarios or scenarios[0]["id"] != scenario_id:
+        raise ValueError(f"Bad scenario id: {scenario_id!r} (ex: size9-core2-gl1-mc0)")
+
+    return scenarios[0]
+
+def _resolve(scenario, hero_index, trait_index):
+    return dict(
+        core_hero_ids=get_core_hid(hero_index, scenario["core_heroes"]),
+        glory_league_ids=get_glory_league_hid(hero_index, scenario["glory_league"]),
+        magic_crystal_ids=get_mcid(trait_index, scenario["magic_crystals"]),
+    )
+
+def combinations_for(scenario, hero_index):
+    """Number of teams an exhaustive solver enumerates for a scenario."""
+    core_count = len(scenario["core_heroes"])
+    return math.comb(len(hero_index) - core_count, scenario["size"] - core_count)
+
+# -----------------------------
+# Running
+# -----------------------------
+def _run_once(solver, scenario, query, hero_index, trait_index, top_k):
+    """(results, seconds, SolverStats) for one solver call."""
+    stats = SolverStats()
+    start = time.perf_counter()
+    results = solver.run(scenario["size"], hero_index, trait_index, top_k=top_k, stats=stats, **query)
+    elapsed = time.perf_counter() - start
+    return results, elapsed, stats
+
+def _peak_memory_kib(solver, scenario, query, hero_index, trait_index, top_k):
+    tracemalloc.start()
+    try:
+        _run_once(solver, scenario, query, hero_index, trait_index, top_k)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
+
+def _expected_scores(solver, reference):
+    if solver.metro_zero_only:
+        return [score for score, _, synergy in reference if METRO_ZERO_ID in synergy]
+    return [score for score, _, _ in reference]
+
+def _check(solver, results, reference, query, hero_index, trait_index):
+    """None if results are consistent, else a short description."""
+    for score, team, synergy in results:
+        rescored = evaluate_team(
+            team,
+            hero_index,
+            trait_index,
+            glory_league_ids=query["glory_league_ids"],
+            magic_crystal_ids=query["magic_crystal_ids"],
+        )
+        if rescored != (score, synergy):
+            return f"team {list(team)} reported {score}, rescored {rescored[0]}"
+
+    if solver.exact and reference is not None:
+        scores = [score for score, _, _ in results]
+        expected = _expected_scores(solver, reference)
+        if scores != expected:
+            return f"scores {scores} != reference {expected}"
+
+    return None
+
+def run_benchmark(
+    scenarios,
+    solvers,
+    hero_index,
+    trait_index,
+    top_k=5,
+    max_combinations=DEFAULT_MAX_COMBINATIONS,
+    measure_memory=False,
+    repeat=1,
+    log=print,
+):
+    """Run every solver on every scenario. Returns the JSON-ready report."""
+    records = []
+    total = len(scenarios) * len(solvers)
+    done = 0
+
+    for scenario in scenarios:
+        query = _resolve(scenario, hero_index, trait_index)
+        combinations = combinations_for(scenario, hero_index)
+        finished = []
+
+        for solver in solvers:
+            done += 1
+            record = {
+                "scenario": scenario["id"],
+                "solver": solver.name,
+                "status": "ok",
+                "seconds": None,
+                "teams": None,
+                "teams_per_second": None,
+                "nodes": None,
+                "pruned": None,
+                "heap_replacements": None,
+                "first_result_seconds": None,
+                "peak_kib": None,
+                "scores": None,
+                "detail": None,
+            }
+            records.append(record)
+
+            if solver.exhaustive and combinations > max_combinations:
+                record["status"] = "skipped"
+                record["detail"] = f"{combinations:,} combinations > {max_combinations:,}"
+                continue
+
+            try:
+                results, elapsed, stats = _run_once(solver, scenario, query, hero_index, trait_index, top_k)
+                for _ in range(repeat - 1):
+                    elapsed = min(elapsed, _run_once(solver, scenario, query, hero_index, trait_index, top_k)[1])
+            except Exception as exc:
+                record["status"] = "error"
+                record["detail"] = f"{type(exc).__name__}: {exc}"
+                log(f"[{done}/{total}] {scenario['id']} {solver.name}: error {record['detail']}")
+                continue
+
+            teams = stats.leaves
+
+            record["seconds"] = round(elapsed, 6)
+            record["teams"] = teams
+            record["teams_per_second"] = round(teams / elapsed) if teams and elapsed > 0 else None
+            record["nodes"] = stats.nodes or None
+            record["pruned"] = stats.pruned or None
+            record["heap_replacements"] = stats.heap_replacements
+            if stats.first_result_seconds is not None:
+                record["first_result_seconds"] = round(stats.first_result_seconds, 6)
+            record["scores"] = [score for score, _, _ in results]
+
+            if measure_memory:
+                record["peak_kib"] = _peak_memory_kib(solver, scenario, query, hero_index, trait_index, top_k)
+
+            finished.append((solver, record, results))
+            log(f"[{done}/{total}] {scenario['id']} {solver.name}: {elapsed:.3f}s")
+
+        # Reference: the first exact solver that keeps teams without Metro Zero
+        reference, reference_name = None, None
+        for solver, _, results in finished:
+            if solver.exact and not solver.metro_zero_only:
+                reference, reference_name = results, solver.name
+                break
+
+        for solver, record, results in finished:
+            problem = _check(solver, results, reference, query, hero_index, trait_index)
+            if problem is not None:
+                record["status"] = "mismatch"
+                record["detail"] = f"{problem} (reference: {reference_name})"
+                log(f"  MISMATCH {scenario['id']} {solver.name}: {record['detail']}")
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "roster": roster_hash(trait_index, hero_index),
+            "top_k": top_k,
+            "max_combinations": max_combinations,
+            "repeat": repeat,
+        },
+        "scenarios": scenarios,
+        "runs": records,
+    }
+
+# -----------------------------
+# Comparing
+# -----------------------------
+def compare_reports(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Regressions of current vs baseline, as a list of strings.
+
+    A run regresses if it breaks where the baseline was ok, returns
+    different scores, or takes more than (1 + tolerance) x the baseline
+    time / peak memory (ignoring differences below the noise floor).
+    """
+    base_runs = {(r["scenario"], r["solver"]): r for r in baseline["runs"]}
+    regressions = []
+
+    if baseline["meta"].get("roster") != current["meta"].get("roster"):
+        regressions.append("roster changed since the baseline: scores are not comparable")
+
+    for run in current["runs"]:
+        key = (run["scenario"], run["solver"])
+        base = base_runs.get(key)
+        label = f"{run['scenario']} {run['solver']}"
+
+        if base is None or base["status"] != "ok":
+            continue
+
+        if run["status"] in ("mismatch", "error"):
+            regressions.append(f"{label}: {run['status']} ({run['detail']})")
+            continue
+
+        if run["status"] != "ok":
+            continue
+
+        if run["scores"] != base["scores"]:
+            regressions.append(f"{label}: scores {run['scores']} != baseline {base['scores']}")
+
+        slower = run["seconds"] - base["seconds"]
+        if slower > MIN_SECONDS_DELTA and run["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append(f"{label}: {base['seconds']:.3f}s -> {run['seconds']:.3f}s")
+
+        if run["peak_kib"] is not None and base["peak_kib"] is not None:
+            heavier = run["peak_kib"] - base["peak_kib"]
+            if heavier > MIN_MEMORY_DELTA_KIB and run["peak_kib"] > base["peak_kib"] * (1 + tolerance):
+                regressions.append(f"{label}: peak {base['peak_kib']:,} KiB -> {run['peak_kib']:,} KiB")
+
+    return regressions
+
+def summarize(report):
+    """Per-solver totals: runs ok / mismatched / skipped and total seconds."""
+    totals = {}
+    for run in report["runs"]:
+        row = totals.setdefault(run["solver"], {"ok": 0, "mismatch": 0, "error": 0, "skipped": 0, "seconds": 0.0})
+        row[run["status"]] += 1
+        if run["seconds"] is not None:
+            row["seconds"] += run["seconds"]
+    return totals
+
+def _print_summary(report):
+    print(f"\n{'solver':<34} {'ok':>4} {'mism':>5} {'err':>4} {'skip':>5} {'seconds':>9}")
+    for name, row in summarize(report).items():
+        print(
+            f"{name:<34} {row['ok']:>4} {row['mismatch']:>5} {row['error']:>4} "
+            f"{row['skipped']:>5} {row['seconds']:>9.2f}"
+        )
+
+    for run in report["runs"]:
+        if run["status"] in ("mismatch", "error"):
+            print(f"  {run['status'].upper()} {run['scenario']} {run['solver']}: {run['detail']}")
+
+def _parse_sizes(text):
+    if "-" in text:
+        low, high = text.split("-", 1)
+        return range(int(low), int(high) + 1)
+    return [int(size) for size in text.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solver benchmark suite and regression check.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="benchmark every solver over the scenario matrix")
+    run_parser.add_argument("--out", default="benchmark.json")
+    run_parser.add_argument("--quick", action="store_true", help="small matrix for quick checks")
+    run_parser.add_argument("--sizes", help="override team sizes, e.g. 5-10 or 7,9")
+    run_parser.add_argument("--solvers", help="comma-separated solver names (default: all)")
+    run_parser.add_argument("--top-k", type=int, default=5)
+    run_parser.add_argument("--max-combinations", type=int, default=DEFAULT_MAX_COMBINATIONS)
+    run_parser.add_argument("--repeat", type=int, default=1, help="time each run this many times, keep the best")
+    run_parser.add_argument("--memory", action="store_true", help="also record peak memory (slow)")
+
+    profile_parser = sub.add_parser("profile", help="run one scenario under cProfile")
+    profile_parser.add_argument("scenario", help="scenario id, e.g. size9-core2-gl1-mc0")
+    profile_parser.add_argument("--solver", default="find_best_team_bnb")
+    profile_parser.add_argument("--out", default="solver.prof")
+    profile_parser.add_argument("--top-k", type=int, default=5)
+    profile_parser.add_argument("--sort", default="cumulative", help="pstats sort key")
+    profile_parser.add_argument("--limit", type=int, default=25, help="functions to print")
+
+    compare_parser = sub.add_parser("compare", help="flag regressions against a baseline report")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        from heroes_and_traits import traits, heroes
+
+        traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+
+        matrix = dict(QUICK_MATRIX if args.quick else FULL_MATRIX)
+        if args.sizes:
+            matrix["sizes"] = _parse_sizes(args.sizes)
+
+        solvers = default_solvers()
+        if args.solvers:
+            wanted = set(args.solvers.split(","))
+            unknown = wanted - {s.name for s in solvers}
+            if unknown:
+                raise ValueError(f"Unknown solvers: {sorted(unknown)}")
+            solvers = [s for s in solvers if s.name in wanted]
+
+        scenarios = build_scenarios(hero_index=hero_index, **matrix)
+        report = run_benchmark(
+            scenarios,
+            solvers,
+            hero_index,
+            traits_index,
+            top_k=args.top_k,
+            max_combinations=args.max_combinations,
+            measure_memory=args.memory,
+            repeat=args.repeat,
+        )
+
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+
+        _print_summary(report)
+        print(f"\nWrote {len(report['runs']):,} runs to {args.out}")
+
+        failed = any(run["status"] in ("mismatch", "error") for run in report["runs"])
+        return 1 if failed else 0
+
+    if args.command == "profile":
+        from heroes_and_traits import traits, heroes
+
+        traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+
+        solvers = {s.name: s for s in default_solvers()}
+        if args.solver not in solvers:
+            raise ValueError(f"Unknown solver: {args.solver!r}")
+
+        scenario = scenario_from_id(args.scenario, hero_index)
+        query = _resolve(scenario, hero_index, traits_index)
+        stats = SolverStats(time_split=True)
+
+        results, profile = profile_query(
+            solvers[args.solver].run,
+            scenario["size"],
+            hero_index,
+            traits_index,
+            path=args.out,
+            top_k=args.top_k,
+            stats=stats,
+            **query,
+        )
+
+        profile.sort_stats(args.sort).print_stats(args.limit)
+        print(stats.summary())
+        print(f"Scores: {[score for score, _, _ in results]}")
+        print(f"Wrote profile to {args.out}")
+        return 0
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+        regressions = compare_reports(baseline, current, tolerance=args.tolerance)
+
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        print(f"{len(regressions)} regression(s) vs {args.baseline}")
+
+        return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Bitset evaluator for find_best_team(engine="bitset").
+
+The hero x trait incidence is stored the other way around: every trait
+gets an integer bitset of the free heroes carrying it, and a candidate team
+is one integer mask over the free pool, so a trait count is a popcount:
+
+    count[t] = offset[t] + (team_mask & trait_heroes[t]).bit_count()
+
+Core heroes and magic crystals are folded into the per-trait offsets, the
+Glory League pair into a second bitset on the Glory League trait, hero
+quality into one bitset per quality value, and the Metro Zero bonus /
+penalty into the Metro Zero row of the points table. Scoring a team is
+then a couple of AND + popcount + table lookups per trait, with no Counter
+and no per-hero loop.
+
+Teams are enumerated with Gosper's hack (next integer with the same number
+of set bits), in the same order as itertools.combinations: free_pool[j]
+is bit n - 1 - j, and masks are visited in decreasing order by walking
+their complements upward. Ties resolve exactly like find_best_team, and
+the teams that enter the top-k are rescored with evaluate_team.
+"""
+
+import heapq
+import time
+
+from helper import (
+    GLORY_LEAGUE_ID,
+    METRO_ZERO_BONUS,
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    evaluate_team,
+    trait_tables,
+)
+
+def next_combination(mask):
+    """Gosper's hack: the next larger integer with as many set bits as mask."""
+    lowest = mask & -mask
+    ripple = mask + lowest
+    return (((ripple ^ mask) >> 2) // lowest) | ripple
+
+def iter_masks(n, k):
+    """
+    Every n-bit mask with k bits set, largest first (bit n - 1 - j standing
+    for item j, this is itertools.combinations(range(n), k) order).
+    """
+    if k < 0 or k > n:
+        return
+
+    full = (1 << n) - 1
+
+    # Only one mask: Gosper's hack needs at least one set bit to walk
+    if k == n:
+        yield full
+        return
+
+    complement = (1 << (n - k)) - 1
+    while complement <= full:
+        yield full ^ complement
+        complement = next_combination(complement)
+
+def find_best_team_bitset(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+):
+    """
+    Bitset / popcount find_best_team. Same inputs and results.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team[bitset]")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    free_pool = [h for h in range(len(hero_index)) if h not in core_hero_ids]
+    remaining_slots = max_team_size - len(core_hero_ids)
+    n = len(free_pool)
+
+    def bit(j):
+        return 1 << (n - 1 - j)
+
+    # -----------------------------
+    # Bitsets + offsets
+    # -----------------------------
+    trait_heroes = [0] * len(trait_index)
+    quality_heroes = {}
+    glory_heroes = 0
+
+    for j, hid in enumerate(free_pool):
+        hero = hero_index[hid]
+        for tid in hero.trait_ids:
+            trait_heroes[tid] |= bit(j)
+        quality_heroes[hero.quality] = quality_heroes.get(hero.quality, 0) | bit(j)
+        if hid in glory_league_ids:
+            glory_heroes |= bit(j)
+
+    offset = [0] * len(trait_index)
+    for hid in core_hero_ids:
+        for tid in hero_index[hid].trait_ids:
+            offset[tid] += 1
+        if hid in glory_league_ids:
+            offset[GLORY_LEAGUE_ID] += 1
+    for tid, bonus in magic_crystal_ids.items():
+        offset[tid] += bonus
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, _ = trait_tables(trait_index, max_count)
+
+    # Metro Zero bonus / penalty folded into its points row
+    points_table[METRO_ZERO_ID] = [
+        points + (METRO_ZERO_BONUS if count >= METRO_ZERO_THRESHOLD else -METRO_ZERO_BONUS)
+        for count, points in enumerate(points_table[METRO_ZERO_ID])
+    ]
+
+    # Constant part: core quality + traits no free hero can change
+    constant = sum(hero_index[hid].quality for hid in core_hero_ids)
+
+    # (bitset, points row shifted by the trait's offset) for the others
+    terms = []
+    glory_term = None
+    for tid, heroes in enumerate(trait_heroes):
+        row = points_table[tid][offset[tid]:]
+        if tid == GLORY_LEAGUE_ID and glory_heroes:
+            glory_term = (heroes, glory_heroes, row)
+        elif heroes:
+            terms.append((heroes, row))
+        else:
+            constant += row[0]
+
+    quality_terms = [(quality, heroes) for quality, heroes in quality_heroes.items() if quality]
+
+    def team_of(mask):
+        team = list(core_hero_ids)
+        for j in range(n):
+            if mask & bit(j):
+                team.append(free_pool[j])
+        return tuple(sorted(team))
+
+    # -----------------------------
+    # Enumeration
+    # -----------------------------
+    best_heap = []
+    evaluated = 0
+    replacements = 0
+
+    if timed:
+        scoring_start = time.perf_counter()
+
+    for mask in iter_masks(n, remaining_slots):
+        evaluated += 1
+
+        score = constant
+        for heroes, row in terms:
+            score += row[(mask & heroes).bit_count()]
+        for quality, heroes in quality_terms:
+            score += quality * (mask & heroes).bit_count()
+        if glory_term is not None:
+            heroes, glory, row = glory_term
+            score += row[(mask & heroes).bit_count() + (mask & glory).bit_count()]
+
+        if len(best_heap) < top_k or score > best_heap[0][0]:
+            team = team_of(mask)
+            score, synergy = evaluate_team(
+                team,
+                hero_index,
+                trait_index,
+                glory_league_ids=glory_league_ids,
+                magic_crystal_ids=magic_crystal_ids,
+            )
+            entry = (score, team, synergy)
+
+            if len(best_heap) < top_k:
+                if not best_heap and stats is not None:
+                    stats.first_result()
+                heapq.heappush(best_heap, entry)
+            else:
+                heapq.heapreplace(best_heap, entry)
+                replacements += 1
+
+    if timed:
+        scoring_seconds = time.perf_counter() - scoring_start
+
+    if stats is not None:
+        stats.leaves = evaluated
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
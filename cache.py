@@ -0,0 +1,145 @@
+"""
+In-memory LRU cache of optimizer results.
+
+Queries are keyed on a normalized signature (see query_signature), so the
+same board asked twice, with the core heroes or crystals in a different
+order, only runs the solver once. top_k is stored with the entry rather
+than in the key: a cached top-10 also answers a top-3 request (as a
+prefix), while a larger top_k than cached triggers a fresh solve that
+replaces the entry.
+
+Entries are copied on the way in and out (synergy dicts included), so a
+caller editing its results can't change what the cache answers next.
+"""
+
+from collections import OrderedDict
+
+from helper import find_best_team_bnb, roster_hash
+
+def query_signature(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    roster_key=None,
+):
+    """
+    Normalized, hashable key for one optimizer query.
+
+    (team size, sorted core ids, Glory League ids, sorted crystal items,
+    roster hash). Duplicate core heroes are kept since they count twice.
+    roster_key can be passed in to skip rehashing the roster.
+    """
+    if roster_key is None:
+        roster_key = roster_hash(trait_index, hero_index)
+
+    return (
+        max_team_size,
+        tuple(sorted(core_hero_ids or ())),
+        frozenset(glory_league_ids or ()),
+        tuple(sorted((magic_crystal_ids or {}).items())),
+        roster_key,
+    )
+
+def _copy_results(results):
+    """Results list with its own synergy dicts (teams are tuples already)."""
+    return [(score, team, dict(synergy)) for score, team, synergy in results]
+
+class QueryCache:
+    """
+    Bounded LRU cache around a solver with the find_best_team signature.
+
+    Usage
+    -----
+    cache = QueryCache(maxsize=256)
+    results = cache.find_best_team(9, hero_index, traits_index, core_hero_ids=...)
+    cache.stats()  # {"hits": ..., "misses": ..., "evictions": ..., "size": ...}
+    """
+
+    def __init__(self, maxsize=128, solver=find_best_team_bnb):
+        if maxsize < 1:
+            raise ValueError("QueryCache maxsize must be at least 1.")
+
+        self.maxsize = maxsize
+        self.solver = solver
+        self._entries = OrderedDict()   # signature -> (top_k, results)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    def get(self, signature, top_k):
+        """Cached results for signature if at least top_k were stored, else None."""
+        entry = self._entries.get(signature)
+
+        if entry is None or entry[0] < top_k:
+            return None
+
+        self._entries.move_to_end(signature)
+        return _copy_results(entry[1][:top_k])
+
+    def put(self, signature, top_k, results):
+        self._entries[signature] = (top_k, _copy_results(results))
+        self._entries.move_to_end(signature)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def find_best_team(
+        self,
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids=None,
+        glory_league_ids=None,
+        magic_crystal_ids=None,
+        top_k=5,
+    ):
+        """Cached drop-in for find_best_team (same inputs and results)."""
+        signature = query_signature(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+        )
+
+        cached = self.get(signature, top_k)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+
+        results = self.solver(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+        )
+
+        self.put(signature, top_k, results)
+
+        return list(results)
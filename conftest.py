@@ -0,0 +1,94 @@
+"""
+Shared test fixtures: the shipped roster, a few queries and their
+reference results.
+
+QUERIES leave at most 3 open slots, so their find_best_team (exhaustive)
+reference enumerates a few tens of thousands of teams. WIDE_QUERIES leave
+4 or 5 open slots and use find_best_team_bnb (checked against
+find_best_team in test_helper.py) as their reference instead.
+"""
+
+from typing import Dict, List, NamedTuple
+
+import pytest
+
+from heroes_and_traits import heroes, traits
+from helper import (
+    find_best_team,
+    find_best_team_bnb,
+    get_core_hid,
+    get_glory_league_hid,
+    get_mcid,
+    initialize_traits_and_heroes,
+)
+
+TRAIT_INDEX, HERO_INDEX = initialize_traits_and_heroes(traits, heroes)
+
+class Query(NamedTuple):
+    name: str
+    size: int
+    core_hero_ids: List[int]
+    glory_league_ids: set
+    magic_crystal_ids: Dict[int, int]
+
+    def kwargs(self):
+        return dict(
+            core_hero_ids=self.core_hero_ids,
+            glory_league_ids=self.glory_league_ids,
+            magic_crystal_ids=self.magic_crystal_ids,
+        )
+
+def _query(name, size, core_heroes=(), glory_league=(), magic_crystals=()):
+    return Query(
+        name,
+        size,
+        get_core_hid(HERO_INDEX, list(core_heroes)),
+        get_glory_league_hid(HERO_INDEX, list(glory_league)),
+        get_mcid(TRAIT_INDEX, list(magic_crystals)),
+    )
+
+# No core / Metro Zero from the core (two, one) / Glory League / crystals / everything
+QUERIES = [
+    _query("size3", 3),
+    _query("size4-core2-m0", 4, ["Roger", "Ixia"]),
+    _query("size4-core1-m0", 4, ["Ixia"]),
+    _query("size6-core3-gl", 6, ["Irithel", "Hanabi", "Claude"], ["Benedetta", "Kula"]),
+    _query("size5-core2-mc", 5, ["X.Borg", "Masha"], (), ["Marksman"]),
+    _query("size7-core4-gl-mc", 7, ["Irithel", "Hanabi", "Claude", "Barats"], ["Benedetta", "Kula"], ["Marksman"]),
+]
+
+WIDE_QUERIES = [
+    _query("size5", 5),
+    _query("size6-core2", 6, ["Irithel", "Hanabi"]),
+    _query("size7-core2-gl-mc", 7, ["Irithel", "Hanabi"], ["Benedetta", "Kula"], ["Marksman"]),
+    _query("size9-core4-gl-mc", 9, ["Irithel", "Hanabi", "Claude", "Barats"], ["Benedetta", "Kula"], ["Marksman"]),
+]
+
+# (solver, query name, top_k) -> results
+_references = {}
+
+def _solve_once(solver, query, top_k):
+    key = (solver.__name__, query.name, top_k)
+    if key not in _references:
+        _references[key] = solver(query.size, HERO_INDEX, TRAIT_INDEX, top_k=top_k, **query.kwargs())
+    return _references[key]
+
+def reference(query, top_k=5):
+    """find_best_team results for one of QUERIES (computed once per session)."""
+    return _solve_once(find_best_team, query, top_k)
+
+def wide_reference(query, top_k=5):
+    """find_best_team_bnb results for one of WIDE_QUERIES (computed once per session)."""
+    return _solve_once(find_best_team_bnb, query, top_k)
+
+def scores(results):
+    """Scores of a results list: teams may differ between engines on ties."""
+    return [score for score, _, _ in results]
+
+@pytest.fixture(params=QUERIES, ids=lambda query: query.name)
+def query(request):
+    return request.param
+
+@pytest.fixture(params=WIDE_QUERIES, ids=lambda query: query.name)
+def wide_query(request):
+    return request.param
@@ -0,0 +1,298 @@
+"""
+Best Glory League pair: top-k teams for every legal pair in one search.
+
+    ranked = find_best_glory_league_pair(9, hero_index, traits_index, core_hero_ids=core_hero_ids)
+    (one_id, five_id), results = ranked[0]
+
+Instead of one find_best_team_bnb per pair (16 with the current rules),
+one branch-and-bound DFS is shared by every pair, like batch.group_search
+shares one for crystal variants. Pairs only differ by which heroes carry
+the extra Glory League trait, so the DFS keeps trait counts without it
+and each pair adds its own Glory League count: how many of its two heroes
+are in the team. Each pair has its own top-k heap and bound and leaves a
+subtree as soon as it can't improve there.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty).
+"""
+
+import heapq
+
+from helper import (
+    GLORY_LEAGUE_ID,
+    METRO_ZERO_BONUS,
+    METRO_ZERO_THRESHOLD,
+    bnb_pool_order,
+    compile_roster,
+    gain_ratio_tables,
+    glory_league_rules,
+    query_hero_traits,
+    require_default_scoring,
+    trait_tables,
+)
+from stats import PRUNE_BOUND, PRUNE_CAPACITY
+
+def find_best_glory_league_pair(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    pairs=None,
+    stats=None,
+    model=None,
+):
+    """
+    Top-k teams for each Glory League pair, in one shared search. Same
+    results per pair as find_best_team_bnb with glory_league_ids=set(pair).
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    pairs          : (1-cost id, 5-cost id) pairs to compare (default: every
+                     legal pair, see glory_league_rules)
+    stats          : optional stats.SolverStats to fill in
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+
+    Returns [(pair, results), ...], best pair first (by best score, then
+    by the rest of its top-k).
+    """
+
+    require_default_scoring(model, "find_best_glory_league_pair")
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    rules = glory_league_rules(hero_index)
+    if pairs is None:
+        pairs = rules.pairs()
+    pairs = [tuple(pair) for pair in pairs]
+
+    for pair in pairs:
+        if pair not in rules.allowed:
+            raise ValueError(f"Not a legal Glory League pair: {[hero_index[hid].name for hid in pair]}")
+
+    if stats is not None:
+        stats.start("find_best_glory_league_pair")
+
+    roster = compile_roster(trait_index, hero_index)
+    metro_flags = roster.metro_zero
+
+    # Trait counts without the Glory League bonus; pairs add it themselves
+    hero_traits = query_hero_traits(roster)
+
+    free_pool = [h.id for h in hero_index if h.id not in core_hero_ids]
+    dfs_pool = bnb_pool_order(hero_index, free_pool)
+    pool_size = len(dfs_pool)
+    pool_position = {hid: i for i, hid in enumerate(dfs_pool)}
+
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+    pool_quality = [roster.quality[hid] for hid in dfs_pool]
+    pool_metro = [metro_flags[hid] for hid in dfs_pool]
+
+    remaining_metro_suffix = [0] * (pool_size + 1)
+    for i in range(pool_size - 1, -1, -1):
+        remaining_metro_suffix[i] = remaining_metro_suffix[i + 1] + pool_metro[i]
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, reached_table = trait_tables(trait_index, max_count)
+    gain_ratio_table = gain_ratio_tables(points_table, max(remaining_slots, 1))
+    glory_points = points_table[GLORY_LEAGUE_ID]
+    glory_ratio = gain_ratio_table[GLORY_LEAGUE_ID]
+
+    trait_ids_range = range(roster.num_traits)
+    queries = range(len(pairs))
+
+    # Pool positions of each pair's heroes (core heroes are always in)
+    pair_positions = [[pool_position[hid] for hid in pair if hid in pool_position] for pair in pairs]
+
+    # Pool positions already carrying the Glory League trait natively
+    glory_carriers = [i for i, tids in enumerate(pool_traits) if GLORY_LEAGUE_ID in tids]
+
+    # -----------------------------
+    # Shared incremental state
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    current_synergy = 0
+    current_quality = 0
+    current_metro = 0
+    in_team = [False] * len(hero_index)
+    team = []
+
+    def add_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+
+    def remove_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+
+    for hid in core_hero_ids:
+        add_traits(hero_traits[hid])
+        team.append(hid)
+        in_team[hid] = True
+        current_quality += roster.quality[hid]
+        current_metro += metro_flags[hid]
+
+    for tid, bonus in magic_crystal_ids.items():
+        for _ in range(bonus):
+            add_traits((tid,))
+
+    def glory_bonus(q):
+        """Glory League count pair q adds: its heroes in the team."""
+        one_id, five_id = pairs[q]
+        return in_team[one_id] + in_team[five_id]
+
+    def glory_gain(q):
+        count = trait_counts[GLORY_LEAGUE_ID]
+        return glory_points[count + glory_bonus(q)] - glory_points[count]
+
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    heaps = [[] for _ in queries]
+    evaluated = 0
+    nodes = 0
+    pruned = 0
+    short = 0
+
+    def upper_bounds(active, start_idx, slots_left):
+        """Optimistic score of any completion, for each active pair."""
+        ratio = [gain_ratio_table[tid][trait_counts[tid]][slots_left] for tid in trait_ids_range]
+        base_gains = [
+            pool_quality[i] + sum(ratio[tid] for tid in pool_traits[i])
+            for i in range(start_idx, pool_size)
+        ]
+
+        base = current_synergy + current_quality
+        if current_metro + min(slots_left, remaining_metro_suffix[start_idx]) >= METRO_ZERO_THRESHOLD:
+            base += METRO_ZERO_BONUS
+        else:
+            base -= METRO_ZERO_BONUS
+
+        bounds = []
+        for q in active:
+            gains = list(base_gains)
+            bonus = glory_bonus(q)
+            pair_ratio = glory_ratio[trait_counts[GLORY_LEAGUE_ID] + bonus][slots_left]
+
+            # Native carriers see the pair's count, the pair's heroes left in
+            # the pool carry the trait too
+            if bonus:
+                delta = pair_ratio - ratio[GLORY_LEAGUE_ID]
+                for i in glory_carriers:
+                    if i >= start_idx:
+                        gains[i - start_idx] += delta
+            for i in pair_positions[q]:
+                if i >= start_idx:
+                    gains[i - start_idx] += pair_ratio
+
+            bounds.append(base + glory_gain(q) + sum(heapq.nlargest(slots_left, gains)))
+
+        return bounds
+
+    def dfs(active, start_idx, slots_left):
+        nonlocal evaluated, nodes, pruned, short, current_quality, current_metro
+
+        # Leaf
+        if slots_left == 0:
+            evaluated += 1
+
+            base = current_synergy + current_quality
+            if current_metro >= METRO_ZERO_THRESHOLD:
+                base += METRO_ZERO_BONUS
+            else:
+                base -= METRO_ZERO_BONUS
+
+            for q in active:
+                score = base + glory_gain(q)
+                best_heap = heaps[q]
+
+                if len(best_heap) < top_k or score > best_heap[0][0]:
+                    counts = list(trait_counts)
+                    counts[GLORY_LEAGUE_ID] += glory_bonus(q)
+                    synergy_info = {
+                        tid: reached_table[tid][count]
+                        for tid, count in enumerate(counts)
+                        if reached_table[tid][count]
+                    }
+                    entry = (score, tuple(sorted(team)), synergy_info)
+
+                    if len(best_heap) < top_k:
+                        if stats is not None and not any(heaps):
+                            stats.first_result()
+                        heapq.heappush(best_heap, entry)
+                    else:
+                        heapq.heapreplace(best_heap, entry)
+            return
+
+        nodes += 1
+
+        # Not enough heroes left to fill the team
+        if pool_size - start_idx < slots_left:
+            short += 1
+            return
+
+        # Bound cut, per pair
+        full = [q for q in active if len(heaps[q]) >= top_k]
+        if full:
+            bounds = dict(zip(full, upper_bounds(full, start_idx, slots_left)))
+            active = [
+                q for q in active
+                if q not in bounds or int(bounds[q] + 1e-9) > heaps[q][0][0]
+            ]
+            if not active:
+                pruned += 1
+                return
+
+        # Expand
+        for i in range(start_idx, pool_size - slots_left + 1):
+            tids = pool_traits[i]
+            hid = dfs_pool[i]
+
+            team.append(hid)
+            in_team[hid] = True
+            add_traits(tids)
+            current_quality += pool_quality[i]
+            current_metro += pool_metro[i]
+
+            dfs(active, i + 1, slots_left - 1)
+
+            team.pop()
+            in_team[hid] = False
+            remove_traits(tids)
+            current_quality -= pool_quality[i]
+            current_metro -= pool_metro[i]
+
+    dfs(list(queries), 0, remaining_slots)
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.leaves += evaluated
+        stats.prune(PRUNE_BOUND, pruned)
+        stats.prune(PRUNE_CAPACITY, short)
+        stats.heap_pushes += sum(len(best_heap) for best_heap in heaps)
+        stats.extra["pairs"] = len(pairs)
+        stats.finish()
+
+    ranked = [
+        (pair, sorted(best_heap, reverse=True, key=lambda x: x[0]))
+        for pair, best_heap in zip(pairs, heaps)
+    ]
+    ranked.sort(key=lambda item: [score for score, _, _ in item[1]], reverse=True)
+    return ranked
@@ -1,31 +1,26 @@
-from models import Trait, Hero
+from models import Trait, Hero, Roster, LEVEL_WEIGHT, CompiledScoring, GloryLeagueRules, MandatoryTrait, ScoringModel
+
+from array import array
+import hashlib
 
 import itertools
 from collections import Counter
 import heapq
+import time
+
+from names import hero_name_index, per_roster, trait_name_index
+from stats import PRUNE_BOUND, PRUNE_CAPACITY, PRUNE_METRO_ZERO, PRUNE_TARGET
 
 def get_hid(hero_index, hero_name):
     """
-    Resolve a single hero name to hero ID (case-insensitive).
+    Resolve a single hero name to hero ID (case-insensitive, typo-tolerant:
+    see names.NameIndex for aliases, prefixes and close spellings).
 
     Raises
     ------
-    ValueError if hero name is unknown.
+    ValueError if hero name is unknown or ambiguous.
     """
-    if not hero_name:
-        raise ValueError("Hero name cannot be empty.")
-
-    name_to_id = {h.name.lower(): h.id for h in hero_index}
-
-    key = hero_name.lower().strip()
-
-    if key not in name_to_id:
-        raise ValueError(
-            f"Unknown hero name: '{hero_name}'. "
-            f"Available heroes: {sorted(h.name for h in hero_index)}"
-        )
-
-    return name_to_id[key]
+    return hero_name_index(hero_index).resolve(hero_name)
 
 def get_core_hid(hero_index, hero_names, allow_duplicates=False):
     """
@@ -55,9 +50,10 @@ def get_core_hid(hero_index, hero_names, allow_duplicates=False):
 
     resolved_ids = []
     seen = set()
+    names = hero_name_index(hero_index)
 
     for name in hero_names:
-        hid = get_hid(hero_index, name)
+        hid = names.resolve(name)
 
         if not allow_duplicates:
             if hid in seen:
@@ -83,6 +79,38 @@ GLORY_LEAGUE_ALLOWED_PAIRS = {
     "Lolita":    {"Akai", "Benedetta", "Harley", "Vexana"},
 }
 
+def _build_glory_league_rules(hero_index):
+    name_to_id = {h.name: h.id for h in hero_index}
+
+    cost = array("b", [0] * len(hero_index))
+    for names, hero_cost in ((GLORY_LEAGUE_1_COST, 1), (GLORY_LEAGUE_5_COST, 5)):
+        for name in names:
+            if name in name_to_id:
+                cost[name_to_id[name]] = hero_cost
+
+    allowed = set()
+    allowed_names = {}
+    for one_name, five_names in GLORY_LEAGUE_ALLOWED_PAIRS.items():
+        if one_name not in name_to_id:
+            continue
+        one_id = name_to_id[one_name]
+        allowed_names[one_id] = tuple(sorted(five_names))
+        for five_name in five_names:
+            if five_name in name_to_id:
+                allowed.add((one_id, name_to_id[five_name]))
+
+    return GloryLeagueRules(
+        cost=cost,
+        allowed=frozenset(allowed),
+        one_cost_names=tuple(sorted(GLORY_LEAGUE_1_COST)),
+        five_cost_names=tuple(sorted(GLORY_LEAGUE_5_COST)),
+        allowed_names=allowed_names,
+    )
+
+def glory_league_rules(hero_index, refresh=False):
+    """GloryLeagueRules for hero_index, built on first use."""
+    return per_roster(hero_index, "glory league", _build_glory_league_rules, refresh)
+
 def get_glory_league_hid(hero_index, selected_heroes=None):
     if not selected_heroes:
         return set()   # Glory League disabled
@@ -90,42 +118,35 @@ def get_glory_league_hid(hero_index, selected_heroes=None):
     if len(selected_heroes) != 2:
         raise ValueError("Glory League requires exactly 2 heroes.")
 
+    rules = glory_league_rules(hero_index)
+
     # Resolve heroes
-    heroes = []
-    for name in selected_heroes:
-        hid = get_hid(hero_index, name)
-        heroes.append(hero_index[hid])
+    hids = hero_name_index(hero_index).resolve_all(selected_heroes)
 
     # Eligibility check
-    for h in heroes:
-        if h.name not in GLORY_LEAGUE_1_COST and h.name not in GLORY_LEAGUE_5_COST:
+    for hid in hids:
+        if not rules.cost[hid]:
             raise ValueError(
-                f"{h.name} is not eligible for Glory League.\n"
-                f"1-cost: {sorted(GLORY_LEAGUE_1_COST)}\n"
-                f"5-cost: {sorted(GLORY_LEAGUE_5_COST)}"
+                f"{hero_index[hid].name} is not eligible for Glory League.\n"
+                f"1-cost: {list(rules.one_cost_names)}\n"
+                f"5-cost: {list(rules.five_cost_names)}"
             )
 
-    one_cost = [h for h in heroes if h.name in GLORY_LEAGUE_1_COST]
-    five_cost = [h for h in heroes if h.name in GLORY_LEAGUE_5_COST]
+    one_id, five_id = sorted(hids, key=lambda hid: rules.cost[hid])
 
-    if len(one_cost) != 1 or len(five_cost) != 1:
+    if rules.cost[one_id] != 1 or rules.cost[five_id] != 5:
         raise ValueError(
             "Glory League requires exactly one 1-cost "
             "and one 5-cost hero."
         )
 
-    one_name = one_cost[0].name
-    five_name = five_cost[0].name
-
-    allowed_fives = GLORY_LEAGUE_ALLOWED_PAIRS.get(one_name, set())
-
-    if five_name not in allowed_fives:
+    if (one_id, five_id) not in rules.allowed:
         raise ValueError(
-            f"Invalid Glory League combination: {one_name} × {five_name}. "
-            f"Allowed: {sorted(allowed_fives)}"
+            f"Invalid Glory League combination: {hero_index[one_id].name} × {hero_index[five_id].name}. "
+            f"Allowed: {list(rules.allowed_names.get(one_id, ()))}"
         )
 
-    return {one_cost[0].id, five_cost[0].id}
+    return {one_id, five_id}
 
 # to future Miko: this is normalized to lowercase, don't change it just because you think it looks ugly
 MAGIC_CRYSTAL_ALLOWED = {
@@ -146,6 +167,9 @@ MAGIC_CRYSTAL_ALLOWED = {
     "toy mischief",
 }
 
+# Sorted once for error messages
+MAGIC_CRYSTAL_CHOICES = sorted(name.title() for name in MAGIC_CRYSTAL_ALLOWED)
+
 def get_mcid(trait_index, magic_crystals):
     """
     Convert magic crystal trait names to trait IDs.
@@ -155,7 +179,7 @@ def get_mcid(trait_index, magic_crystals):
     trait_index : list[Trait]
         Initialized trait list.
     magic_crystals : list[str]
-        Trait names (case-insensitive).
+        Trait names (case-insensitive, typo-tolerant: see names.NameIndex).
 
     Returns
     -------
@@ -170,42 +194,83 @@ def get_mcid(trait_index, magic_crystals):
     if not magic_crystals:
         return {}
 
-    # Build case-insensitive lookup
-    name_to_trait = {
-        t.name.lower(): t.id for t in trait_index
-    }
-
+    names = trait_name_index(trait_index)
     crystal_counter = {}
 
     for name in magic_crystals:
-        key = name.lower().strip()
+        try:
+            tid = names.resolve(name)
+        except ValueError:
+            tid = None
 
-        if key not in name_to_trait:
+        if tid is None or trait_index[tid].name.lower() not in MAGIC_CRYSTAL_ALLOWED:
             raise ValueError(
                 f"Trait '{name}' cannot be used as a Magic Crystal. "
-                f"Allowed Magic Crystals: {sorted(t.title() for t in MAGIC_CRYSTAL_ALLOWED)}"
+                f"Allowed Magic Crystals: {MAGIC_CRYSTAL_CHOICES}"
             )
 
-        if key not in MAGIC_CRYSTAL_ALLOWED:
-            raise ValueError(
-                f"Trait '{name}' cannot be used as a Magic Crystal. "
-                f"Allowed Magic Crystals: {sorted(MAGIC_CRYSTAL_ALLOWED)}"
-            )
-
-        tid = name_to_trait[key]
         crystal_counter[tid] = crystal_counter.get(tid, 0) + 1
 
     return crystal_counter
 
+def _threshold_points(thresholds, max_count):
+    """
+    Precompute count -> (reached threshold, synergy points) for one trait.
+
+    Returns two lists indexed by count (0..max_count).
+    """
+    reached_row = []
+    points_row = []
+
+    for count in range(max_count + 1):
+        reached = max((t for t in thresholds if count >= t), default=0)
+        reached_row.append(reached)
+        points_row.append(reached * LEVEL_WEIGHT)
+
+    return reached_row, points_row
+
+def trait_tables(trait_index, max_count):
+    """
+    Per-trait count lookup tables covering counts 0..max_count.
+
+    Reuses the tables built by initialize_traits_and_heroes, padding them
+    with their last (saturated) value when a query can count past them.
+
+    Returns (points_table, reached_table), both indexed [tid][count].
+    """
+    points_table = []
+    reached_table = []
+
+    for trait in trait_index:
+        points_row = list(trait.points_by_count[:max_count + 1])
+        reached_row = list(trait.reached_by_count[:max_count + 1])
+
+        if len(points_row) <= max_count:
+            padding = max_count + 1 - len(points_row)
+            points_row.extend([points_row[-1]] * padding)
+            reached_row.extend([reached_row[-1]] * padding)
+
+        points_table.append(points_row)
+        reached_table.append(reached_row)
+
+    return points_table, reached_table
+
 def initialize_traits_and_heroes(traits, heroes):
     # init traits
     trait_index = []
     for tid, t in enumerate(traits):
+        # Score tables cover a team holding every hero plus crystals up to
+        # the top threshold; solvers pad them (trait_tables) if they need more
+        max_count = len(heroes) + max(t["thresholds"])
+        reached_row, points_row = _threshold_points(t["thresholds"], max_count)
+
         trait_index.append(
             Trait(
                 id=tid,
                 name=t["name"],
-                thresholds=tuple(t["thresholds"])
+                thresholds=tuple(t["thresholds"]),
+                reached_by_count=tuple(reached_row),
+                points_by_count=tuple(points_row),
             )
         )
 
@@ -227,8 +292,105 @@ METRO_ZERO_ID = 9
 METRO_ZERO_THRESHOLD = 2 
 METRO_ZERO_BONUS = 500
 
-def evaluate_team(hero_ids, hero_index, trait_index, glory_league_ids=None, magic_crystal_ids=None):
-    """Returns (score, synergy_info) for a team of hero objects."""
+# The game's scoring: reached * 10 per trait + quality, Metro Zero +/- 500
+DEFAULT_SCORING = ScoringModel(
+    mandatory=(MandatoryTrait(METRO_ZERO_ID, METRO_ZERO_THRESHOLD, METRO_ZERO_BONUS, -METRO_ZERO_BONUS),),
+    name="default",
+)
+DEFAULT_MANDATORY = DEFAULT_SCORING.mandatory_rules()
+
+def compile_scoring(model, trait_index, hero_index):
+    """
+    CompiledScoring for a solver's model argument: None means DEFAULT_SCORING,
+    a ScoringModel is compiled, a CompiledScoring is used as is.
+    """
+    if model is None:
+        model = DEFAULT_SCORING
+
+    if isinstance(model, CompiledScoring):
+        return model
+
+    return model.compile(trait_index, hero_index)
+
+def require_default_scoring(model, solver):
+    """
+    ValueError unless model is None or DEFAULT_SCORING: for solvers whose
+    hot loops only implement the default scoring (Metro Zero +/- 500).
+    """
+    if model is not None and model != DEFAULT_SCORING:
+        raise ValueError(f"{solver} only scores with DEFAULT_SCORING.")
+
+def compile_roster(trait_index, hero_index):
+    """
+    Build the compact Roster the solvers iterate over.
+
+    Cheap (one pass over hero_index), so solvers compile it per query and
+    the friendly Hero / Trait objects stay the source of truth.
+    """
+    quality = array("i")
+    trait_offsets = array("i", [0])
+    trait_ids = array("i")
+    glory_league = array("b", (cost != 0 for cost in glory_league_rules(hero_index).cost))
+    metro_zero = array("b")
+
+    for hero in hero_index:
+        quality.append(hero.quality)
+        trait_ids.extend(hero.trait_ids)
+        trait_offsets.append(len(trait_ids))
+        metro_zero.append(METRO_ZERO_ID in hero.trait_ids)
+
+    return Roster(
+        num_heroes=len(hero_index),
+        num_traits=len(trait_index),
+        quality=quality,
+        trait_offsets=trait_offsets,
+        trait_ids=trait_ids,
+        glory_league=glory_league,
+        metro_zero=metro_zero,
+    )
+
+def roster_hash(trait_index, hero_index):
+    """
+    Fingerprint of everything that affects scoring in the roster tables.
+
+    Any edit to a hero (name, quality, traits) or a trait (name, thresholds)
+    changes the hash, so caches keyed on it are invalidated.
+    """
+    digest = hashlib.sha1()
+
+    for trait in trait_index:
+        digest.update(repr((trait.id, trait.name, tuple(trait.thresholds))).encode())
+
+    for hero in hero_index:
+        digest.update(repr((hero.id, hero.name, hero.quality, tuple(hero.trait_ids))).encode())
+
+    return digest.hexdigest()
+
+def query_hero_traits(roster, glory_league_ids=None):
+    """
+    Per-hero tuple of the trait ids a hero adds to trait counts in this
+    query, with this match's Glory League trait folded in.
+    """
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    hero_traits = []
+    for hid in range(roster.num_heroes):
+        tids = tuple(roster.traits_of(hid))
+        if hid in glory_league_ids:
+            tids += (GLORY_LEAGUE_ID,)
+        hero_traits.append(tids)
+
+    return hero_traits
+
+def evaluate_team(hero_ids, hero_index, trait_index, glory_league_ids=None, magic_crystal_ids=None, model=None):
+    """
+    Returns (score, synergy_info) for a team of hero objects.
+
+    model : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING,
+            whose tables are built into trait_index). Pass a compiled one
+            (compile_scoring) when scoring many teams.
+    """
     
     # 0. Check current match's Glory League heroes
     if glory_league_ids is None:
@@ -257,49 +419,123 @@ def evaluate_team(hero_ids, hero_index, trait_index, glory_league_ids=None, magi
         for tid, bonus in magic_crystal_ids.items():
             trait_counter[tid] += bonus
 
-    # 3. Check Metro Zero requirement
-    metro_zero_active = trait_counter[METRO_ZERO_ID] >= METRO_ZERO_THRESHOLD
+    # 3. Scoring tables
+    if model is None:
+        points_rows = None
+        quality = None
+        mandatory = DEFAULT_MANDATORY
+    else:
+        model = compile_scoring(model, trait_index, hero_index)
+        points_rows = model.points_by_count
+        quality = model.quality
+        mandatory = model.mandatory
 
     # 4. Compute synergy score
     synergy_score = 0
     synergy_info = {}
 
     for tid, count in trait_counter.items():
-        thresholds = trait_index[tid].thresholds
+        reached_by_count = trait_index[tid].reached_by_count
 
-        # Highest threshold reached
-        reached = max([t for t in thresholds if count >= t], default=None)
+        # Highest threshold reached (table saturates past its end)
+        count = min(count, len(reached_by_count) - 1)
+        reached = reached_by_count[count]
 
-        if reached is None:
+        if not reached:
             continue
 
-
-        # Weight synergy strength = reached * 10 (tune freely)
-        synergy_score += reached * 10
+        # Synergy strength = reached * 10 unless the model says otherwise
+        if points_rows is None:
+            synergy_score += trait_index[tid].points_by_count[count]
+        else:
+            synergy_score += points_rows[tid][count]
         synergy_info[tid] = reached
 
     # 5. Quality score
-    quality_score = sum(hero_index[hid].quality for hid in hero_ids)
+    if quality is None:
+        quality_score = sum(hero_index[hid].quality for hid in hero_ids)
+    else:
+        quality_score = sum(quality[hid] for hid in hero_ids)
 
     # 6. Final Score
     final_score = synergy_score + quality_score
-    
-    # FORCE METRO ZERO PRIORITY
-    if metro_zero_active:
-        final_score += METRO_ZERO_BONUS
-    # NOTE: with find_best_team_m0_enforced, this case should never happen
-    else:
-        final_score -= METRO_ZERO_BONUS  # penalize teams without Metro Zero
+
+    # FORCE METRO ZERO PRIORITY: mandatory traits add their bonus, or their
+    # penalty (teams without Metro Zero are penalized)
+    # NOTE: with find_best_team_m0_enforced, the penalty should never happen
+    for tid, min_count, bonus, penalty in mandatory:
+        if trait_counter[tid] >= min_count:
+            final_score += bonus
+        else:
+            final_score += penalty
 
     return final_score, synergy_info
 
 
-def find_best_team(max_team_size, hero_index, trait_index, core_hero_ids=None, glory_league_ids=None, magic_crystal_ids=None, top_k=5):
+def find_best_team(max_team_size, hero_index, trait_index, core_hero_ids=None, glory_league_ids=None, magic_crystal_ids=None, top_k=5, engine="python", stats=None, model=None):
     """
     max_team_size  : final team size (ex: 5, 6, 7)
     core_hero_ids  : list of hero IDs that must be in the team
+    engine         : "python" (one evaluate_team call per team),
+                     "numpy" (block-vectorized scoring, needs NumPy),
+                     "bitset" (popcount scoring over hero bitsets) or
+                     "revolving" (one-swap order, incremental scoring)
+    stats          : optional stats.SolverStats to fill in
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING,
+                     the only one the other engines support)
+
+    The python engine breaks score ties by team: it keeps the largest
+    (score, team) entries and returns them in that order, highest first.
     """
 
+    if engine != "python":
+        require_default_scoring(model, f"The {engine} engine")
+
+    if engine == "revolving":
+        from revolving_door import find_best_team_revolving
+
+        return find_best_team_revolving(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+            stats=stats,
+        )
+
+    if engine == "bitset":
+        from bitset_engine import find_best_team_bitset
+
+        return find_best_team_bitset(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+            stats=stats,
+        )
+
+    if engine == "numpy":
+        from numpy_engine import find_best_team_numpy
+
+        return find_best_team_numpy(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+            stats=stats,
+        )
+
+    if engine != "python":
+        raise ValueError(f"Unknown engine: '{engine}'. Expected 'python', 'numpy', 'bitset' or 'revolving'.")
+
     if core_hero_ids is None:
         core_hero_ids = []
 
@@ -318,19 +554,33 @@ def find_best_team(max_team_size, hero_index, trait_index, core_hero_ids=None, g
     # How many more we need
     remaining_slots = max_team_size - len(core_hero_ids)
 
+    # Compile once, not per team
+    if model is not None:
+        model = compile_scoring(model, trait_index, hero_index)
+
+    if stats is not None:
+        stats.start("find_best_team")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
     # MIN-HEAP of size <= top_k
     best_heap = []
     evaluated = 0
+    replacements = 0
 
     for combo in itertools.combinations(free_pool, remaining_slots):
         team = tuple(sorted(core_hero_ids + list(combo)))
 
+        if timed:
+            scoring_start = time.perf_counter()
+
         score, synergy = evaluate_team(
             team,
             hero_index,
             trait_index,
             glory_league_ids=glory_league_ids,
             magic_crystal_ids=magic_crystal_ids,
+            model=model,
         )
 
         evaluated += 1
@@ -338,23 +588,63 @@ def find_best_team(max_team_size, hero_index, trait_index, core_hero_ids=None, g
         entry = (score, team, synergy)
 
         if len(best_heap) < top_k:
+            if not best_heap and stats is not None:
+                stats.first_result()
             heapq.heappush(best_heap, entry)
         else:
-            # Only keep if better than worst in heap
-            if score > best_heap[0][0]:
+            # Only keep if better than worst in heap (ties: larger team tuple)
+            if entry[:2] > best_heap[0][:2]:
                 heapq.heapreplace(best_heap, entry)
+                replacements += 1
+
+        if timed:
+            scoring_seconds += time.perf_counter() - scoring_start
 
-    print(f"Checked {evaluated:,} teams")
+    if stats is not None:
+        stats.leaves = evaluated
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
 
     # Return sorted best results (highest first)
-    return sorted(best_heap, reverse=True, key=lambda x: x[0])
+    return sorted(best_heap, reverse=True)
 
-def find_best_team_m0_enforced(max_team_size, hero_index, trait_index, core_hero_ids=None, glory_league_ids=None, magic_crystal_ids=None, top_k=5):
+def find_best_team_m0_enforced(max_team_size, hero_index, trait_index, core_hero_ids=None, glory_league_ids=None, magic_crystal_ids=None, top_k=5, stats=None, engine="python", model=None):
     """
     max_team_size  : final team size (ex: 5, 6, 7)
     core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    engine         : "python" (one evaluate_team call per team) or
+                     "revolving" (one-swap order, incremental scoring)
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING,
+                     the only one the revolving engine supports). Only
+                     teams with Metro Zero are kept whatever the model.
+
+    The python engine breaks score ties by team, like find_best_team.
     """
 
+    if engine != "python":
+        require_default_scoring(model, f"The {engine} engine")
+
+    if engine == "revolving":
+        from revolving_door import find_best_team_revolving
+
+        return find_best_team_revolving(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+            metro_zero_only=True,
+            stats=stats,
+        )
+
+    if engine != "python":
+        raise ValueError(f"Unknown engine: '{engine}'. Expected 'python' or 'revolving'.")
+
     if core_hero_ids is None:
         core_hero_ids = []
 
@@ -387,12 +677,26 @@ def find_best_team_m0_enforced(max_team_size, hero_index, trait_index, core_hero
     metro_free = [h for h in free_pool if h in metro_zero_heroes]
     non_metro_free = [h for h in free_pool if h not in metro_zero_heroes]
 
+    # Compile once, not per team
+    if model is not None:
+        model = compile_scoring(model, trait_index, hero_index)
+
+    if stats is not None:
+        stats.start("find_best_team_m0_enforced")
+
     if required_metro > len(metro_free):
+        if stats is not None:
+            stats.prune(PRUNE_METRO_ZERO)
+            stats.finish()
         return []  # impossible to satisfy Metro Zero
 
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
     # MIN-HEAP of size <= top_k
     best_heap = []
     evaluated = 0
+    replacements = 0
 
     for k in range(required_metro, min(len(metro_free), remaining_slots) + 1):
         for metro_combo in itertools.combinations(metro_free, k):
@@ -404,26 +708,41 @@ def find_best_team_m0_enforced(max_team_size, hero_index, trait_index, core_hero
                     sorted(core_hero_ids + list(metro_combo) + list(rest_combo))
                 )
 
+                if timed:
+                    scoring_start = time.perf_counter()
+
                 score, synergy = evaluate_team(
                     team,
                     hero_index,
                     trait_index,
                     glory_league_ids=glory_league_ids,
                     magic_crystal_ids=magic_crystal_ids,
+                    model=model,
                 )
 
                 evaluated += 1
                 entry = (score, team, synergy)
 
                 if len(best_heap) < top_k:
+                    if not best_heap and stats is not None:
+                        stats.first_result()
                     heapq.heappush(best_heap, entry)
                 else:
-                    if score > best_heap[0][0]:
+                    if entry[:2] > best_heap[0][:2]:
                         heapq.heapreplace(best_heap, entry)
+                        replacements += 1
 
-    print(f"Checked {evaluated:,} teams")
+                if timed:
+                    scoring_seconds += time.perf_counter() - scoring_start
 
-    return sorted(best_heap, reverse=True, key=lambda x: x[0])
+    if stats is not None:
+        stats.leaves = evaluated
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
+
+    return sorted(best_heap, reverse=True)
 
 def find_best_team_increment_dfs(
     max_team_size,
@@ -433,7 +752,19 @@ def find_best_team_increment_dfs(
     glory_league_ids=None,
     magic_crystal_ids=None,
     top_k=5,
+    stats=None,
+    model=None,
 ):
+    """
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING).
+                     Only teams with Metro Zero are kept whatever the model.
+
+    Score ties are broken by team, like find_best_team: same results, in
+    the same order, as find_best_team_m0_enforced.
+    """
     if core_hero_ids is None:
         core_hero_ids = []
 
@@ -446,49 +777,57 @@ def find_best_team_increment_dfs(
     if len(core_hero_ids) > max_team_size:
         raise ValueError("Core heroes exceed team size")
 
-    # Precompute Metro Zero hero set
-    metro_zero_heroes = {
-        h.id for h in hero_index if METRO_ZERO_ID in h.trait_ids
-    }
+    if stats is not None:
+        stats.start("find_best_team_increment_dfs")
+
+    # Compact roster: flat per-hero columns, Glory League folded into
+    # each hero's trait tuple for this query
+    roster = compile_roster(trait_index, hero_index)
+    scoring = compile_scoring(model, trait_index, hero_index)
+    quality = scoring.quality
+    mandatory = scoring.mandatory
+    metro_flags = roster.metro_zero
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+
+    # Synergy points come from precomputed count tables; synergy_score is
+    # kept up to date by add_hero / remove_hero
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table = scoring.points_table(max_count)
+    _, reached_table = trait_tables(trait_index, max_count)
 
     # Initial incremental state from core heroes
-    trait_counts = {}
+    trait_counts = [0] * roster.num_traits
+    synergy_score = 0
     current_quality = 0
     current_metro = 0
     team = []
 
     def add_hero(hid):
-        nonlocal current_quality, current_metro
-        hero = hero_index[hid]
+        nonlocal current_quality, current_metro, synergy_score
         team.append(hid)
-        current_quality += hero.quality
+        current_quality += quality[hid]
 
-        for tid in hero.trait_ids:
-            trait_counts[tid] = trait_counts.get(tid, 0) + 1
-
-        if hid in glory_league_ids:
-            trait_counts[GLORY_LEAGUE_ID] = trait_counts.get(GLORY_LEAGUE_ID, 0) + 1
+        for tid in hero_traits[hid]:
+            count = trait_counts[tid]
+            points = points_table[tid]
+            synergy_score += points[count + 1] - points[count]
+            trait_counts[tid] = count + 1
 
-        if hid in metro_zero_heroes:
+        if metro_flags[hid]:
             current_metro += 1
 
     def remove_hero(hid):
-        nonlocal current_quality, current_metro
-        hero = hero_index[hid]
+        nonlocal current_quality, current_metro, synergy_score
         team.pop()
-        current_quality -= hero.quality
+        current_quality -= quality[hid]
 
-        for tid in hero.trait_ids:
-            trait_counts[tid] -= 1
-            if trait_counts[tid] == 0:
-                del trait_counts[tid]
+        for tid in hero_traits[hid]:
+            count = trait_counts[tid]
+            points = points_table[tid]
+            synergy_score += points[count - 1] - points[count]
+            trait_counts[tid] = count - 1
 
-        if hid in glory_league_ids:
-            trait_counts[GLORY_LEAGUE_ID] -= 1
-            if trait_counts[GLORY_LEAGUE_ID] == 0:
-                del trait_counts[GLORY_LEAGUE_ID]
-
-        if hid in metro_zero_heroes:
+        if metro_flags[hid]:
             current_metro -= 1
 
     # Apply core heroes
@@ -497,19 +836,27 @@ def find_best_team_increment_dfs(
 
     # Apply magic crystals ONCE (static bonus)
     for tid, bonus in magic_crystal_ids.items():
-        trait_counts[tid] = trait_counts.get(tid, 0) + bonus
+        count = trait_counts[tid]
+        synergy_score += points_table[tid][count + bonus] - points_table[tid][count]
+        trait_counts[tid] = count + bonus
 
     # MIN-HEAP for top K
     best_heap = []
 
     all_hero_ids = list(range(len(hero_index)))
     free_pool = [h for h in all_hero_ids if h not in core_hero_ids]
-    
+
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
     evaluated = 0
+    nodes = 0
+    rejected = 0
+    replacements = 0
 
     # Recursive DFS
     def dfs(start_idx):
-        nonlocal evaluated
+        nonlocal evaluated, nodes, rejected, replacements, scoring_seconds
         
         # Stop condition
         if len(team) == max_team_size:
@@ -517,31 +864,45 @@ def find_best_team_increment_dfs(
             evaluated += 1
             
             if current_metro < METRO_ZERO_THRESHOLD:
+                rejected += 1
                 return
 
-            # Compute synergy score incrementally
-            synergy_score = 0
-            synergy_info = {}
-
-            for tid, count in trait_counts.items():
-                thresholds = trait_index[tid].thresholds
-                reached = max((t for t in thresholds if count >= t), default=None)
-                if reached:
-                    synergy_score += reached * 10
-                    synergy_info[tid] = reached
-
-            score = synergy_score + current_quality + METRO_ZERO_BONUS
-
-            entry = (score, tuple(sorted(team)), synergy_info)
+            if timed:
+                scoring_start = time.perf_counter()
+
+            # synergy_score is maintained incrementally
+            score = synergy_score + current_quality
+            for tid, min_count, bonus, penalty in mandatory:
+                score += bonus if trait_counts[tid] >= min_count else penalty
+
+            # Team and synergy breakdown are only needed for teams that can
+            # make the heap (ties with the worst are broken by team tuple)
+            if len(best_heap) < top_k or score >= best_heap[0][0]:
+                sorted_team = tuple(sorted(team))
+
+                if len(best_heap) < top_k or (score, sorted_team) > best_heap[0][:2]:
+                    synergy_info = {
+                        tid: reached_table[tid][count]
+                        for tid, count in enumerate(trait_counts)
+                        if reached_table[tid][count]
+                    }
+                    entry = (score, sorted_team, synergy_info)
+
+                    if len(best_heap) < top_k:
+                        if not best_heap and stats is not None:
+                            stats.first_result()
+                        heapq.heappush(best_heap, entry)
+                    else:
+                        heapq.heapreplace(best_heap, entry)
+                        replacements += 1
 
-            if len(best_heap) < top_k:
-                heapq.heappush(best_heap, entry)
-            else:
-                if score > best_heap[0][0]:
-                    heapq.heapreplace(best_heap, entry)
+            if timed:
+                scoring_seconds += time.perf_counter() - scoring_start
 
             return
 
+        nodes += 1
+
         # Recursive expansion
         for i in range(start_idx, len(free_pool)):
             hid = free_pool[i]
@@ -550,10 +911,17 @@ def find_best_team_increment_dfs(
             remove_hero(hid)
 
     dfs(0)
-    
-    print(f"Checked {evaluated:,} teams")
 
-    return sorted(best_heap, reverse=True, key=lambda x: x[0])
+    if stats is not None:
+        stats.nodes = nodes
+        stats.leaves = evaluated
+        stats.prune(PRUNE_METRO_ZERO, rejected)
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
+
+    return sorted(best_heap, reverse=True)
 
 def find_best_team_m0_increment_dfs(
     max_team_size,
@@ -563,10 +931,18 @@ def find_best_team_m0_increment_dfs(
     glory_league_ids=None,
     magic_crystal_ids=None,
     top_k=5,
+    stats=None,
+    model=None,
 ):
     """
     max_team_size  : final team size (ex: 5, 6, 7)
     core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING).
+                     Only teams with Metro Zero are kept whatever the model.
+
+    Score ties are broken by team, like find_best_team: same results, in
+    the same order, as find_best_team_m0_enforced.
     """
 
     if core_hero_ids is None:
@@ -584,6 +960,9 @@ def find_best_team_m0_increment_dfs(
             f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
         )
 
+    if stats is not None:
+        stats.start("find_best_team_m0_increment_dfs")
+
     # All heroes except the core ones
     all_hero_ids = list(range(len(hero_index)))
     free_pool = [h for h in all_hero_ids if h not in core_hero_ids]
@@ -603,6 +982,9 @@ def find_best_team_m0_increment_dfs(
     non_metro_free = [h for h in free_pool if h not in metro_zero_heroes]
 
     if required_metro > len(metro_free):
+        if stats is not None:
+            stats.prune(PRUNE_METRO_ZERO)
+            stats.finish()
         return []  # impossible to satisfy Metro Zero
 
     # DFS pool = metro first, then non-metro
@@ -616,116 +998,541 @@ def find_best_team_m0_increment_dfs(
         if dfs_is_metro[i]:
             remaining_metro_suffix[i] += 1
 
+    # Compact roster: flat per-hero columns, Glory League folded into
+    # each hero's trait tuple for this query
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    scoring = compile_scoring(model, trait_index, hero_index)
+    mandatory = scoring.mandatory
+
+    # Per pool position, so the kernel never goes through hero ids
+    pool_size = len(dfs_pool)
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+    pool_quality = [scoring.quality[hid] for hid in dfs_pool]
+    pool_metro = [roster.metro_zero[hid] for hid in dfs_pool]
+
+    # Synergy points come from precomputed count tables; the kernel keeps
+    # synergy_score up to date on every add / remove
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table = scoring.points_table(max_count)
+    _, reached_table = trait_tables(trait_index, max_count)
+
     # -----------------------------
-    # Incremental state
+    # Preallocated state
     # -----------------------------
-    trait_counts = {}
+    trait_counts = [0] * roster.num_traits
+    synergy_score = 0
     current_quality = 0
-    current_metro = core_metro_count
-    team = []
+    current_metro = 0
 
-    def add_hero(hid):
-        nonlocal current_quality, current_metro
-        hero = hero_index[hid]
-        team.append(hid)
-        current_quality += hero.quality
+    # -----------------------------
+    # Apply core heroes
+    # -----------------------------
+    for hid in core_hero_ids:
+        for tid in hero_traits[hid]:
+            count = trait_counts[tid]
+            synergy_score += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+        current_quality += scoring.quality[hid]
+        current_metro += roster.metro_zero[hid]
 
-        for tid in hero.trait_ids:
-            trait_counts[tid] = trait_counts.get(tid, 0) + 1
+    # Apply magic crystals ONCE
+    for tid, bonus in magic_crystal_ids.items():
+        count = trait_counts[tid]
+        synergy_score += points_table[tid][count + bonus] - points_table[tid][count]
+        trait_counts[tid] = count + bonus
 
-        if hid in glory_league_ids:
-            trait_counts[GLORY_LEAGUE_ID] = trait_counts.get(GLORY_LEAGUE_ID, 0) + 1
+    remaining_slots = max_team_size - len(core_hero_ids)
 
-        if hid in metro_zero_heroes:
-            current_metro += 1
+    # chosen[d] = pool position picked at depth d (the explicit DFS stack)
+    chosen = [0] * remaining_slots
 
-    def remove_hero(hid):
-        nonlocal current_quality, current_metro
-        hero = hero_index[hid]
-        team.pop()
-        current_quality -= hero.quality
+    def materialize():
+        """Team tuple + synergy dict of the current leaf, for heap entries only."""
+        synergy_info = {
+            tid: reached_table[tid][count]
+            for tid, count in enumerate(trait_counts)
+            if reached_table[tid][count]
+        }
+        team = tuple(sorted(list(core_hero_ids) + [dfs_pool[i] for i in chosen]))
+        return team, synergy_info
 
-        for tid in hero.trait_ids:
-            trait_counts[tid] -= 1
-            if trait_counts[tid] == 0:
-                del trait_counts[tid]
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    best_heap = []
+    evaluated = 0
+    metro_pruned = 0
+    replacements = 0
 
-        if hid in glory_league_ids:
-            trait_counts[GLORY_LEAGUE_ID] -= 1
-            if trait_counts[GLORY_LEAGUE_ID] == 0:
-                del trait_counts[GLORY_LEAGUE_ID]
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
 
-        if hid in metro_zero_heroes:
-            current_metro -= 1
+    # -----------------------------
+    # Iterative DFS kernel
+    # -----------------------------
+    # Same visiting order as the recursive dfs(start_idx) it replaces: depth
+    # is the number of heroes picked, i the next pool position to try there.
+    # A leaf only computes its score; the team and synergy dict are built
+    # when it enters the heap.
+    depth = 0
+    i = 0
+    nodes = 1 if remaining_slots else 0
+    last_start = pool_size - remaining_slots   # last position depth 0 can pick
+
+    while True:
+        if depth == remaining_slots:
+            # Leaf
+            evaluated += 1
+
+            if current_metro < METRO_ZERO_THRESHOLD:
+                metro_pruned += 1
+            else:
+                if timed:
+                    scoring_start = time.perf_counter()
+
+                score = synergy_score + current_quality
+                for tid, min_count, bonus, penalty in mandatory:
+                    score += bonus if trait_counts[tid] >= min_count else penalty
+
+                if len(best_heap) < top_k:
+                    if not best_heap and stats is not None:
+                        stats.first_result()
+                    heapq.heappush(best_heap, (score,) + materialize())
+                elif score >= best_heap[0][0]:
+                    # Ties with the worst kept team are broken by team tuple
+                    entry = (score,) + materialize()
+                    if entry[:2] > best_heap[0][:2]:
+                        heapq.heapreplace(best_heap, entry)
+                        replacements += 1
+
+                if timed:
+                    scoring_seconds += time.perf_counter() - scoring_start
+
+        elif i <= last_start + depth and current_metro + remaining_metro_suffix[i] >= METRO_ZERO_THRESHOLD:
+            # Descend: pick position i at this depth
+            chosen[depth] = i
+            for tid in pool_traits[i]:
+                count = trait_counts[tid]
+                synergy_score += points_table[tid][count + 1] - points_table[tid][count]
+                trait_counts[tid] = count + 1
+            current_quality += pool_quality[i]
+            current_metro += pool_metro[i]
+
+            depth += 1
+            i += 1
+            if depth < remaining_slots:
+                nodes += 1
+            continue
+
+        else:
+            # Metro Zero out of reach, or too few heroes left: siblings too
+            if i <= last_start + depth:
+                metro_pruned += 1
+
+        # Backtrack: undo the last pick and move to its next sibling
+        if depth == 0:
+            break
+
+        depth -= 1
+        i = chosen[depth]
+        for tid in pool_traits[i]:
+            count = trait_counts[tid]
+            synergy_score += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+        current_quality -= pool_quality[i]
+        current_metro -= pool_metro[i]
+        i += 1
+
+    if stats is not None:
+        stats.nodes = nodes
+        stats.leaves = evaluated
+        stats.prune(PRUNE_METRO_ZERO, metro_pruned)
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
+
+    return sorted(best_heap, reverse=True)
+
+def gain_ratio_tables(points_table, max_slots):
+    """
+    Best synergy gain per added carrier, for optimistic bounds.
+
+    gain_ratio_table[tid][count][slots] = max over j in 1..slots of
+    (points[count + j] - points[count]) / j. Charging every carrier of a
+    trait this ratio never underestimates what the trait can still add.
+    """
+    gain_ratio_table = []
+
+    for points_row in points_table:
+        max_count = len(points_row) - 1
+        ratio_rows = []
+        for count in range(max_count + 1):
+            row = [0.0] * (max_slots + 1)
+            best = 0.0
+            for j in range(1, max_slots + 1):
+                if count + j <= max_count:
+                    gain = (points_row[count + j] - points_row[count]) / j
+                    if gain > best:
+                        best = gain
+                row[j] = best
+            ratio_rows.append(row)
+        gain_ratio_table.append(ratio_rows)
+
+    return gain_ratio_table
+
+def carrier_suffix(tid, pool_traits):
+    """
+    How much of trait tid the pool heroes from each position on still carry.
+
+    Returns (remaining_suffix, per_carrier): remaining_suffix[i] is the sum
+    over pool positions i.. of their tid count, per_carrier the most one of
+    them adds. A team completed from position i with n more heroes can
+    reach at most count + min(n * per_carrier, remaining_suffix[i]).
+    """
+    pool_size = len(pool_traits)
+    carried = [tids.count(tid) for tids in pool_traits]
+
+    remaining_suffix = [0] * (pool_size + 1)
+    for i in range(pool_size - 1, -1, -1):
+        remaining_suffix[i] = remaining_suffix[i + 1] + carried[i]
+
+    return remaining_suffix, max(carried, default=0)
+
+def mandatory_suffixes(scoring, pool_traits):
+    """
+    Mandatory rules of a CompiledScoring, prepared for branch-and-bound.
+
+    Returns (trait id, min count, bonus, penalty, remaining_suffix,
+    per_carrier) per rule, see carrier_suffix.
+    """
+    rules = []
+    for tid, min_count, bonus, penalty in scoring.mandatory:
+        remaining_suffix, per_carrier = carrier_suffix(tid, pool_traits)
+        rules.append((tid, min_count, bonus, penalty, remaining_suffix, per_carrier))
+
+    return rules
+
+def bnb_pool_order(hero_index, hero_ids):
+    """
+    Order in which the branch-and-bound search branches over hero_ids.
+
+    Metro Zero heroes first, then highest quality first: strong teams show
+    up early and tighten the cutoff sooner.
+    """
+    return sorted(
+        hero_ids,
+        key=lambda hid: (
+            METRO_ZERO_ID not in hero_index[hid].trait_ids,
+            -hero_index[hid].quality,
+            hid,
+        ),
+    )
+
+def _bnb_search(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    free_pool=None,
+    shared_cutoff=None,
+    stats=None,
+    model=None,
+    required=None,
+    pool_order=None,
+):
+    """
+    Branch-and-bound core shared by find_best_team_bnb, the parallel
+    shards and find_best_team_targets.
+
+    free_pool      : heroes to branch over (default: everyone not in core)
+    shared_cutoff  : optional multiprocessing Value holding a score that is
+                     already known to be reachable k times; subtrees that
+                     cannot beat it are cut even while the local heap is
+                     still filling up
+    required       : optional trait ID -> minimum count; only teams that
+                     reach every one qualify, and a branch is cut as soon
+                     as one can't be reached any more
+    pool_order     : optional callable(hero_ids, hero_traits) -> branching
+                     order, hero_traits with Glory League folded in
+                     (default: bnb_pool_order)
+    stats          : optional stats.SolverStats; counters are added to it
+                     (the caller starts and finishes the clock)
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING)
+
+    Returns the top-k min-heap.
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    scoring = compile_scoring(model, trait_index, hero_index)
+
+    if free_pool is None:
+        free_pool = [h.id for h in hero_index if h.id not in core_hero_ids]
+
+    if pool_order is None:
+        dfs_pool = bnb_pool_order(hero_index, free_pool)
+    else:
+        dfs_pool = pool_order(free_pool, hero_traits)
+    pool_size = len(dfs_pool)
+
+    # Traits each pool hero adds to trait_counts (Glory League folded in)
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+    pool_quality = [scoring.quality[hid] for hid in dfs_pool]
+
+    # Mandatory trait rules (Metro Zero by default)
+    mandatory = mandatory_suffixes(scoring, pool_traits)
+
+    # (trait id, min count, remaining_suffix, per_carrier) per requirement
+    requirements = [
+        (tid, min_count) + carrier_suffix(tid, pool_traits)
+        for tid, min_count in (required or {}).items()
+    ]
 
     # -----------------------------
-    # Apply core heroes
+    # Lookup tables
     # -----------------------------
+    # Every hero adds at most 1 per trait (+1 Glory League), so counts
+    # never go past this
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    points_table = scoring.points_table(max_count)
+    _, reached_table = trait_tables(trait_index, max_count)
+
+    gain_ratio_table = gain_ratio_tables(points_table, remaining_slots)
+
+    trait_ids_range = range(roster.num_traits)
+
+    # -----------------------------
+    # Incremental state
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    current_synergy = 0
+    current_quality = 0
+    team = []
+
+    def add_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+
+    def remove_traits(tids):
+        nonlocal current_synergy
+        for tid in tids:
+            count = trait_counts[tid]
+            current_synergy += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+
+    # Apply core heroes
     for hid in core_hero_ids:
-        add_hero(hid)
+        add_traits(hero_traits[hid])
+        team.append(hid)
+        current_quality += scoring.quality[hid]
 
     # Apply magic crystals ONCE
     for tid, bonus in magic_crystal_ids.items():
-        trait_counts[tid] = trait_counts.get(tid, 0) + bonus
+        for _ in range(bonus):
+            add_traits((tid,))
 
     # -----------------------------
     # Result tracking
     # -----------------------------
     best_heap = []
     evaluated = 0
-
-    # -----------------------------
-    # DFS with PRE-ENUMERATION pruning
-    # -----------------------------
-    def dfs(start_idx):
-        nonlocal evaluated
-
-        slots_left = max_team_size - len(team)
-
-        # 🚨 Metro Zero feasibility prune (BEFORE enumeration)
-        max_possible_metro = current_metro + remaining_metro_suffix[start_idx]
-        if max_possible_metro < METRO_ZERO_THRESHOLD:
-            return
-
-        # Not enough slots to finish
-        if slots_left < 0:
+    nodes = 0
+    pruned = 0
+    short = 0
+    missed = 0
+    replacements = 0
+
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    def upper_bound(start_idx, slots_left):
+        """
+        Optimistic score of any completion of the current team.
+
+        Each open slot is charged the quality of the hero that fills it plus,
+        for every trait it carries, the best synergy gain per carrier that
+        trait can still produce. Summing the top slots_left of those values
+        never underestimates the real gain.
+        """
+        ratio = [gain_ratio_table[tid][trait_counts[tid]][slots_left] for tid in trait_ids_range]
+
+        gains = [
+            pool_quality[i] + sum(ratio[tid] for tid in pool_traits[i])
+            for i in range(start_idx, pool_size)
+        ]
+
+        bound = current_synergy + current_quality + sum(heapq.nlargest(slots_left, gains))
+
+        # Bonus if the rule can still be met, penalty if it can't
+        for tid, min_count, bonus, penalty, remaining_suffix, per_carrier in mandatory:
+            reachable = trait_counts[tid] + min(slots_left * per_carrier, remaining_suffix[start_idx])
+            bound += max(bonus, penalty) if reachable >= min_count else penalty
+
+        return bound
+
+    def reachable(start_idx, slots_left):
+        """Can every required count still be met from this node?"""
+        for tid, min_count, remaining_suffix, per_carrier in requirements:
+            if trait_counts[tid] + min(slots_left * per_carrier, remaining_suffix[start_idx]) < min_count:
+                return False
+        return True
+
+    def dfs(start_idx, slots_left):
+        nonlocal evaluated, nodes, pruned, short, missed, replacements, scoring_seconds, current_quality
+
+        # Requirement prune (a leaf has to meet them outright)
+        if requirements and not reachable(start_idx, slots_left):
+            missed += 1
             return
 
         # Leaf
         if slots_left == 0:
             evaluated += 1
 
-            # Guaranteed Metro Zero satisfied due to pruning
-            synergy_score = 0
-            synergy_info = {}
+            if timed:
+                scoring_start = time.perf_counter()
 
-            for tid, count in trait_counts.items():
-                thresholds = trait_index[tid].thresholds
-                reached = max((t for t in thresholds if count >= t), default=None)
-                if reached:
-                    synergy_score += reached * 10
-                    synergy_info[tid] = reached
+            score = current_synergy + current_quality
+            for tid, min_count, bonus, penalty, _, _ in mandatory:
+                score += bonus if trait_counts[tid] >= min_count else penalty
 
-            score = synergy_score + current_quality + METRO_ZERO_BONUS
-            entry = (score, tuple(sorted(team)), synergy_info)
+            if len(best_heap) < top_k or score > best_heap[0][0]:
+                synergy_info = {
+                    tid: reached_table[tid][count]
+                    for tid, count in enumerate(trait_counts)
+                    if reached_table[tid][count]
+                }
+                entry = (score, tuple(sorted(team)), synergy_info)
 
-            if len(best_heap) < top_k:
-                heapq.heappush(best_heap, entry)
-            else:
-                if score > best_heap[0][0]:
+                if len(best_heap) < top_k:
+                    if not best_heap and stats is not None:
+                        stats.first_result()
+                    heapq.heappush(best_heap, entry)
+                else:
                     heapq.heapreplace(best_heap, entry)
+                    replacements += 1
+
+            if timed:
+                scoring_seconds += time.perf_counter() - scoring_start
 
             return
 
+        nodes += 1
+
+        # Not enough heroes left to fill the team
+        if pool_size - start_idx < slots_left:
+            short += 1
+            return
+
+        # Bound cut: nothing below this node can enter the heap
+        if len(best_heap) >= top_k:
+            cutoff = best_heap[0][0]
+            if shared_cutoff is not None and shared_cutoff.value > cutoff:
+                cutoff = shared_cutoff.value
+        elif shared_cutoff is not None:
+            cutoff = shared_cutoff.value
+        else:
+            cutoff = None
+
+        if cutoff is not None:
+            if int(upper_bound(start_idx, slots_left) + 1e-9) <= cutoff:
+                pruned += 1
+                return
+
         # Expand
-        for i in range(start_idx, len(dfs_pool)):
-            hid = dfs_pool[i]
-            add_hero(hid)
-            dfs(i + 1)
-            remove_hero(hid)
+        for i in range(start_idx, pool_size - slots_left + 1):
+            tids = pool_traits[i]
 
-    dfs(0)
+            team.append(dfs_pool[i])
+            add_traits(tids)
+            current_quality += pool_quality[i]
+
+            dfs(i + 1, slots_left - 1)
+
+            team.pop()
+            remove_traits(tids)
+            current_quality -= pool_quality[i]
+
+    dfs(0, remaining_slots)
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.leaves += evaluated
+        stats.prune(PRUNE_TARGET, missed)
+        stats.prune(PRUNE_BOUND, pruned)
+        stats.prune(PRUNE_CAPACITY, short)
+        stats.heap_pushes += len(best_heap)
+        stats.heap_replacements += replacements
+        stats.scoring_seconds += scoring_seconds
 
-    print(f"Checked {evaluated:,} teams")
+    return best_heap
 
-    return sorted(best_heap, reverse=True, key=lambda x: x[0])
\ No newline at end of file
+def find_best_team_bnb(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+    model=None,
+):
+    """
+    Branch-and-bound version of find_best_team.
+
+    Scores teams exactly like evaluate_team (Metro Zero bonus / penalty
+    included) and returns the same top-k scores as the exhaustive search,
+    but skips every subtree whose optimistic bound cannot beat the current
+    k-th best score.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING)
+    """
+
+    if stats is not None:
+        stats.start("find_best_team_bnb")
+
+    best_heap = _bnb_search(
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+        stats=stats,
+        model=model,
+    )
+
+    if stats is not None:
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
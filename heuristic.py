@@ -0,0 +1,306 @@
+"""
+Beam search + local search heuristic for rosters / team sizes where exact
+search is too slow for interactive use.
+
+1. Beam search grows partial teams one hero at a time from the core heroes.
+   Each child is ranked by its current score plus a weighted optimistic
+   completion estimate (the same per-carrier gain estimate the exact bound
+   uses), and only the best beam_width partial teams survive each level.
+2. Local search then hill-climbs from the best beam results by swapping one
+   free hero out and one unused hero in (core heroes never move) while
+   that improves the score.
+
+Results have the same shape as find_best_team but are not guaranteed to be
+optimal; beam_gap_report measures the gap against find_best_team_bnb on
+instances small enough to solve exactly.
+"""
+
+import heapq
+import time
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_THRESHOLD,
+    compile_roster,
+    evaluate_team,
+    find_best_team_bnb,
+    gain_ratio_tables,
+    query_hero_traits,
+    require_default_scoring,
+    trait_tables,
+)
+
+DEFAULT_BEAM_WIDTH = 64
+
+# The completion estimate is an upper bound; counting it in full overrates
+# heroes whose traits only pay off if the rest of the team lines up
+DEFAULT_ESTIMATE_WEIGHT = 0.5
+
+def find_best_team_beam(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    beam_width=DEFAULT_BEAM_WIDTH,
+    local_search=True,
+    estimate_weight=DEFAULT_ESTIMATE_WEIGHT,
+    stats=None,
+    model=None,
+):
+    """
+    Heuristic find_best_team. Same inputs and result shape.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    beam_width     : partial teams kept per level (wider = slower, closer to optimal)
+    local_search   : refine the best beam teams with single-hero swaps
+    estimate_weight: weight of the optimistic completion estimate when
+                     ranking partial teams (0 = plain greedy beam)
+    stats          : optional stats.SolverStats to fill in (nodes are beam
+                     children, leaves every team scored)
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+    """
+
+    require_default_scoring(model, "find_best_team_beam")
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team_beam")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    quality = roster.quality
+    metro_flags = roster.metro_zero
+
+    free_pool = [hid for hid in range(roster.num_heroes) if hid not in core_hero_ids]
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    if remaining_slots > len(free_pool):
+        if stats is not None:
+            stats.finish()
+        return []
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, _ = trait_tables(trait_index, max_count)
+    gain_ratio_table = gain_ratio_tables(points_table, max(remaining_slots, 1))
+    trait_ids_range = range(roster.num_traits)
+
+    # Counts fixed by the query
+    base_counts = [0] * roster.num_traits
+    base_quality = 0
+    base_metro = 0
+    for hid in core_hero_ids:
+        for tid in hero_traits[hid]:
+            base_counts[tid] += 1
+        base_quality += quality[hid]
+        base_metro += metro_flags[hid]
+    for tid, bonus in magic_crystal_ids.items():
+        base_counts[tid] += bonus
+
+    def metro_term(metro):
+        return METRO_ZERO_BONUS if metro >= METRO_ZERO_THRESHOLD else -METRO_ZERO_BONUS
+
+    def score_picks(picks):
+        """Exact score of core heroes + picks."""
+        counts = list(base_counts)
+        total = base_quality
+        metro = base_metro
+        for hid in picks:
+            for tid in hero_traits[hid]:
+                counts[tid] += 1
+            total += quality[hid]
+            metro += metro_flags[hid]
+        for tid in trait_ids_range:
+            total += points_table[tid][counts[tid]]
+        return total + metro_term(metro)
+
+    evaluated = 0
+
+    # -----------------------------
+    # Beam search
+    # -----------------------------
+    # state = (picks, counts, synergy + quality, metro)
+    base_synergy = sum(points_table[tid][base_counts[tid]] for tid in trait_ids_range)
+    beam = [((), base_counts, base_synergy + base_quality, base_metro)]
+
+    for depth in range(remaining_slots):
+        slots_left = remaining_slots - depth
+        children = {}
+
+        for picks, counts, current, metro in beam:
+            picked = set(picks)
+            ratio = [gain_ratio_table[tid][counts[tid]][slots_left] for tid in trait_ids_range]
+
+            gains = {
+                hid: quality[hid] + sum(ratio[tid] for tid in hero_traits[hid])
+                for hid in free_pool
+                if hid not in picked
+            }
+            # Completion estimate for a child = best (slots_left - 1) gains
+            # among the other heroes
+            top_gains = heapq.nlargest(slots_left, gains.items(), key=lambda x: x[1])
+            top_ids = {other for other, _ in top_gains}
+            top_sum = sum(gain for _, gain in top_gains)
+            last_gain = top_gains[-1][1] if len(top_gains) == slots_left else 0.0
+            metro_left = sum(metro_flags[hid] for hid in gains)
+
+            for hid in gains:
+                key = tuple(sorted(picks + (hid,)))
+                if key in children:
+                    continue
+
+                child_counts = list(counts)
+                child_current = current + quality[hid]
+                for tid in hero_traits[hid]:
+                    count = child_counts[tid]
+                    child_current += points_table[tid][count + 1] - points_table[tid][count]
+                    child_counts[tid] = count + 1
+                child_metro = metro + metro_flags[hid]
+
+                if hid in top_ids:
+                    estimate = top_sum - gains[hid]
+                else:
+                    estimate = top_sum - last_gain
+
+                reachable_metro = child_metro + min(slots_left - 1, metro_left - metro_flags[hid])
+                priority = child_current + estimate_weight * estimate + metro_term(reachable_metro)
+
+                children[key] = (priority, (key, child_counts, child_current, child_metro))
+
+        evaluated += len(children)
+        beam = [state for _, state in heapq.nlargest(beam_width, children.values(), key=lambda x: x[0])]
+
+    # Full teams: exact scores
+    candidates = {
+        picks: current + metro_term(metro)
+        for picks, _, current, metro in beam
+    }
+
+    # -----------------------------
+    # Local search: single swaps
+    # -----------------------------
+    swaps = 0
+
+    if local_search and remaining_slots > 0:
+        starts = heapq.nlargest(top_k, candidates.items(), key=lambda x: x[1])
+
+        for picks, score in starts:
+            improved = True
+            while improved:
+                improved = False
+                picked = set(picks)
+
+                for out_hid in picks:
+                    for in_hid in free_pool:
+                        if in_hid in picked:
+                            continue
+
+                        swapped = tuple(sorted([h for h in picks if h != out_hid] + [in_hid]))
+                        if swapped in candidates:
+                            continue
+
+                        if timed:
+                            scoring_start = time.perf_counter()
+                            swapped_score = score_picks(swapped)
+                            scoring_seconds += time.perf_counter() - scoring_start
+                        else:
+                            swapped_score = score_picks(swapped)
+                        candidates[swapped] = swapped_score
+                        swaps += 1
+
+                        if swapped_score > score:
+                            picks, score = swapped, swapped_score
+                            improved = True
+                            break
+
+                    if improved:
+                        break
+
+    # -----------------------------
+    # Results
+    # -----------------------------
+    best_heap = []
+
+    for picks, _ in heapq.nlargest(top_k, candidates.items(), key=lambda x: x[1]):
+        team = tuple(sorted(list(core_hero_ids) + list(picks)))
+        score, synergy = evaluate_team(
+            team,
+            hero_index,
+            trait_index,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+        )
+        best_heap.append((score, team, synergy))
+
+    if stats is not None:
+        if best_heap:
+            stats.first_result()
+        stats.nodes = evaluated
+        stats.leaves = len(beam) + swaps
+        stats.heap_pushes = len(best_heap)
+        stats.scoring_seconds = scoring_seconds
+        stats.extra["beam_width"] = beam_width
+        stats.extra["swaps"] = swaps
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
+
+def beam_gap_report(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    beam_width=DEFAULT_BEAM_WIDTH,
+    local_search=True,
+    estimate_weight=DEFAULT_ESTIMATE_WEIGHT,
+):
+    """
+    Compare find_best_team_beam with the exact find_best_team_bnb.
+
+    Only meant for instances the exact solver can finish.
+
+    Returns a dict with both score lists, best_gap (exact best - beam best)
+    and kth_gap (same for the k-th result).
+    """
+    query = dict(
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+    )
+
+    beam = find_best_team_beam(
+        max_team_size, hero_index, trait_index,
+        beam_width=beam_width, local_search=local_search,
+        estimate_weight=estimate_weight, **query,
+    )
+    exact = find_best_team_bnb(max_team_size, hero_index, trait_index, **query)
+
+    beam_scores = [score for score, _, _ in beam]
+    exact_scores = [score for score, _, _ in exact]
+
+    return {
+        "beam_scores": beam_scores,
+        "exact_scores": exact_scores,
+        "best_gap": exact_scores[0] - beam_scores[0] if beam and exact else None,
+        "kth_gap": exact_scores[-1] - beam_scores[-1] if len(beam) == len(exact) and exact else None,
+    }
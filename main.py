@@ -1,6 +1,9 @@
 from heroes_and_traits import traits, heroes
-from helper import get_core_hid, get_glory_league_hid, get_mcid, initialize_traits_and_heroes, find_best_team
+from helper import get_core_hid, get_glory_league_hid, get_mcid, initialize_traits_and_heroes, find_best_team_bnb
+from result_store import DEFAULT_STORE_PATH, ResultStore
+from stats import SolverStats
 
+import os
 import time
 
 traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
@@ -29,7 +32,17 @@ glory_league_ids = get_glory_league_hid(hero_index, selected_heroes=glory_league
 
 magic_crystal_ids = get_mcid(traits_index, magic_crystals)
 
-results = find_best_team(9, hero_index, traits_index, core_hero_ids=core_hero_ids, glory_league_ids=glory_league_ids, magic_crystal_ids=magic_crystal_ids, top_k=5)
+results = None
+
+# Precomputed results (python result_store.py warm) skip the solver entirely
+if os.path.exists(DEFAULT_STORE_PATH):
+    with ResultStore(DEFAULT_STORE_PATH, readonly=True) as store:
+        results = store.lookup(9, hero_index, traits_index, core_hero_ids=core_hero_ids, glory_league_ids=glory_league_ids, magic_crystal_ids=magic_crystal_ids, top_k=5)
+
+if results is None:
+    stats = SolverStats()
+    results = find_best_team_bnb(9, hero_index, traits_index, core_hero_ids=core_hero_ids, glory_league_ids=glory_league_ids, magic_crystal_ids=magic_crystal_ids, top_k=5, stats=stats)
+    print(stats.summary())
 
 for score, team, synergies in results:
     print("\nScore:", score)
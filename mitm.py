@@ -0,0 +1,368 @@
+"""
+Meet-in-the-middle solver over half-team trait profiles.
+
+The free pool is split into two halves A and B. Every team is a sub-team
+of A plus a sub-team of B whose sizes add up to remaining_slots, and its
+score only depends on:
+
+- the two sub-teams' trait counts (synergy, Metro Zero), and
+- the sum of their qualities.
+
+So each half is enumerated once. Its sub-teams are grouped by (size,
+trait-count profile) and only the top-k qualities of each profile are
+kept. Counts are capped where a trait stops scoring: at its top threshold
+minus what the core heroes and crystals already give. Most sub-teams
+therefore share a profile with many others.
+
+The join pairs every A profile with the B profiles of the complementary
+size. A pair's synergy is bounded by the A side's exact synergy, plus
+the B side's counts times each trait's best gain per count, plus the
+exact Metro Zero term. B profiles are sorted by that bound, so a pair
+whose bound can't beat the k-th best score ends the scan of its A
+profile. A profiles are sorted by their own best bound, so the join
+stops as soon as no A profile can help.
+
+Memory / time tradeoff
+----------------------
+With n free heroes and r open slots, each half stores up to
+sum_{s <= r} C(n / 2, s) sub-teams before grouping, and the profiles
+that survive grouping. Enumerating a half costs the same number of
+steps, against C(n, r) teams for the exhaustive solvers. But the profile
+tables must fit in memory, and without a good bound the join can cost as
+much as the product of the two halves' profile counts.
+
+On the main.py query (4 core heroes, Glory League pair, one crystal) it
+is 1.5x faster than find_best_team(engine="revolving") at size 8 and
+2.3x at size 9 (about 110k profiles), and the gap grows with the team
+size. find_best_team_bnb is still much faster there: its bound cuts the
+pool itself, where this solver always enumerates both halves. Use it for
+exact answers with a few open slots. It is not meant for size 10 with no
+core: 11M to 17M sub-teams per half.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty).
+"""
+
+import heapq
+import time
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    compile_roster,
+    evaluate_team,
+    query_hero_traits,
+    require_default_scoring,
+    trait_tables,
+)
+from stats import PRUNE_BOUND, PRUNE_METRO_ZERO
+
+def find_best_team_mitm(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    metro_zero_only=False,
+    stats=None,
+    model=None,
+):
+    """
+    Meet-in-the-middle find_best_team. Same inputs and scores.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    metro_zero_only: drop teams without Metro Zero, like
+                     find_best_team_m0_increment_dfs
+    stats          : optional stats.SolverStats to fill in (leaves are
+                     profile pairs scored, extra["profiles"] the number of
+                     half profiles kept)
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+    """
+
+    require_default_scoring(model, "find_best_team_mitm")
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team_mitm")
+    timed = stats is not None and stats.time_split
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+
+    free_pool = [h for h in range(len(hero_index)) if h not in core_hero_ids]
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    # -----------------------------
+    # Fixed part: core heroes + crystals
+    # -----------------------------
+    base_counts = [0] * roster.num_traits
+    for hid in core_hero_ids:
+        for tid in hero_traits[hid]:
+            base_counts[tid] += 1
+    for tid, bonus in magic_crystal_ids.items():
+        base_counts[tid] += bonus
+    base_quality = sum(roster.quality[hid] for hid in core_hero_ids)
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, _ = trait_tables(trait_index, max_count)
+
+    # Metro Zero bonus / penalty folded into its points row
+    points_table[METRO_ZERO_ID] = [
+        points + (METRO_ZERO_BONUS if count >= METRO_ZERO_THRESHOLD else -METRO_ZERO_BONUS)
+        for count, points in enumerate(points_table[METRO_ZERO_ID])
+    ]
+
+    # Profile traits: the ones the pool can still change the score of.
+    # Counts past cap score like cap (the row is flat from there)
+    profile_traits = []
+    rows = []          # rows[i][x] = points with x more of profile_traits[i]
+    caps = []
+    constant = base_quality
+
+    for tid in range(roster.num_traits):
+        row = points_table[tid][base_counts[tid]:]
+        cap = max((x for x in range(len(row)) if row[x] != row[-1]), default=-1) + 1
+        cap = min(cap, remaining_slots * 2)
+
+        if cap == 0:
+            constant += row[0]
+            continue
+
+        profile_traits.append(tid)
+        rows.append(row[:cap + 1])
+        caps.append(cap)
+
+    num_profile = len(profile_traits)
+    slot_of = {tid: i for i, tid in enumerate(profile_traits)}
+    metro_slot = slot_of.get(METRO_ZERO_ID)
+
+    # Best synergy gain per added count, for the join bound
+    best_gain = []
+    for row in rows:
+        best = 0.0
+        for x in range(len(row)):
+            for y in range(x + 1, len(row)):
+                best = max(best, (row[y] - row[x]) / (y - x))
+        best_gain.append(best)
+
+    # Metro Zero is bounded exactly in the join instead
+    if metro_slot is not None:
+        best_gain[metro_slot] = 0.0
+
+    pool_profiles = {hid: [slot_of[tid] for tid in hero_traits[hid] if tid in slot_of] for hid in free_pool}
+
+    # -----------------------------
+    # Half enumeration
+    # -----------------------------
+    half_a = free_pool[0::2]
+    half_b = free_pool[1::2]
+
+    def enumerate_half(half):
+        """
+        groups[size][profile] = top-k [(quality, members), ...], best first,
+        and profile -> (synergy, gain bound without Metro Zero).
+        """
+        groups = [{} for _ in range(remaining_slots + 1)]
+        profile_info = {}
+        counts = [0] * num_profile
+        members = []
+        synergy = 0
+        gain = 0.0
+
+        def record(quality):
+            key = tuple(counts)
+            sized = groups[len(members)]
+            bucket = sized.get(key)
+            entry = (quality, tuple(members))
+
+            if bucket is None:
+                sized[key] = [entry]
+                if key not in profile_info:
+                    profile_info[key] = (synergy, gain)
+            elif len(bucket) < top_k:
+                heapq.heappush(bucket, entry)
+            elif quality > bucket[0][0]:
+                heapq.heapreplace(bucket, entry)
+
+        def dfs(start_idx, quality):
+            nonlocal synergy, gain
+            record(quality)
+            if len(members) == remaining_slots:
+                return
+
+            for i in range(start_idx, len(half)):
+                hid = half[i]
+
+                # Counts past cap don't change the score: leave them at cap
+                raised = []
+                for s in pool_profiles[hid]:
+                    count = counts[s]
+                    if count < caps[s]:
+                        synergy += rows[s][count + 1] - rows[s][count]
+                        gain += best_gain[s]
+                        counts[s] = count + 1
+                        raised.append(s)
+                members.append(hid)
+
+                dfs(i + 1, quality + roster.quality[hid])
+
+                members.pop()
+                for s in raised:
+                    count = counts[s]
+                    synergy -= rows[s][count] - rows[s][count - 1]
+                    gain -= best_gain[s]
+                    counts[s] = count - 1
+
+        dfs(0, 0)
+
+        for sized in groups:
+            for bucket in sized.values():
+                bucket.sort(reverse=True)
+        return groups, profile_info
+
+    groups_a, info_a = enumerate_half(half_a)
+    groups_b, info_b = enumerate_half(half_b)
+
+    # Enumeration time is the rest of elapsed, see SolverStats
+    if timed:
+        scoring_start = time.perf_counter()
+
+    # -----------------------------
+    # Join
+    # -----------------------------
+    best_heap = []     # (score, members)
+    joined = 0
+    pruned = 0
+    metro_rejected = 0
+
+    def metro_of(profile):
+        return profile[metro_slot] if metro_slot is not None else 0
+
+    def metro_delta(metro_a, metro_b):
+        """Exact Metro Zero change when B's count adds to A's."""
+        if metro_slot is None:
+            return 0
+        row = rows[metro_slot]
+        return row[min(metro_a + metro_b, caps[metro_slot])] - row[metro_a]
+
+    # B profiles by size, then by Metro Zero count, each group sorted by
+    # bound: best quality plus best gain per count for the other traits
+    b_groups_by_size = []
+    for sized in groups_b:
+        b_groups = {}
+        for profile, bucket in sized.items():
+            bound = bucket[0][0] + info_b[profile][1]
+            b_groups.setdefault(metro_of(profile), []).append((bound, profile, bucket))
+        for group in b_groups.values():
+            group.sort(key=lambda item: item[0], reverse=True)
+        b_groups_by_size.append(b_groups)
+
+    # A profiles of every size, best bound first: the heap fills with good
+    # teams early, and the join stops at the first A profile that can't help
+    a_side = []
+    for size_a, sized in enumerate(groups_a):
+        b_groups = b_groups_by_size[remaining_slots - size_a]
+        if not b_groups:
+            continue
+
+        for profile, bucket in sized.items():
+            metro_a = metro_of(profile)
+            a_best = constant + info_a[profile][0] + bucket[0][0]
+
+            # (bound, Metro Zero change, Metro Zero count, B group), best first
+            pairings = []
+            for metro_b, group in b_groups.items():
+                delta = metro_delta(metro_a, metro_b)
+                pairings.append((a_best + delta + group[0][0], delta, metro_b, group))
+            pairings.sort(key=lambda item: item[0], reverse=True)
+
+            a_side.append((pairings[0][0], a_best, metro_a, profile, bucket, pairings))
+    a_side.sort(key=lambda item: item[0], reverse=True)
+
+    for a_bound, a_best, metro_a, profile_a, bucket_a, pairings in a_side:
+        if len(best_heap) >= top_k and int(a_bound + 1e-9) <= best_heap[0][0]:
+            pruned += 1
+            break
+
+        synergy_a = a_best - bucket_a[0][0]
+
+        for group_bound, delta, metro_b, group in pairings:
+            if len(best_heap) >= top_k and int(group_bound + 1e-9) <= best_heap[0][0]:
+                pruned += 1
+                break
+
+            if metro_zero_only and base_counts[METRO_ZERO_ID] + metro_a + metro_b < METRO_ZERO_THRESHOLD:
+                metro_rejected += 1
+                continue
+
+            group_best = a_best + delta
+
+            for b_bound, profile_b, bucket_b in group:
+                if len(best_heap) >= top_k and int(group_best + b_bound + 1e-9) <= best_heap[0][0]:
+                    pruned += 1
+                    break
+
+                joined += 1
+                synergy = synergy_a + delta
+                for i, count in enumerate(profile_b):
+                    if count and i != metro_slot:
+                        row = rows[i]
+                        current = profile_a[i]
+                        synergy += row[min(current + count, caps[i])] - row[current]
+
+                # Both buckets are best first: stop each scan at the first miss
+                for quality_a, members_a in bucket_a:
+                    if len(best_heap) >= top_k and synergy + quality_a + bucket_b[0][0] <= best_heap[0][0]:
+                        break
+                    for quality_b, members_b in bucket_b:
+                        score = synergy + quality_a + quality_b
+                        if len(best_heap) >= top_k and score <= best_heap[0][0]:
+                            break
+                        entry = (score, members_a + members_b)
+                        if len(best_heap) < top_k:
+                            if not best_heap and stats is not None:
+                                stats.first_result()
+                            heapq.heappush(best_heap, entry)
+                        else:
+                            heapq.heapreplace(best_heap, entry)
+
+    # -----------------------------
+    # Materialize the top-k
+    # -----------------------------
+    results = []
+    for _, members in best_heap:
+        team = tuple(sorted(list(core_hero_ids) + list(members)))
+        score, synergy_info = evaluate_team(
+            team,
+            hero_index,
+            trait_index,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+        )
+        results.append((score, team, synergy_info))
+
+    if stats is not None:
+        if timed:
+            stats.scoring_seconds = time.perf_counter() - scoring_start
+        stats.leaves = joined
+        stats.prune(PRUNE_BOUND, pruned)
+        stats.prune(PRUNE_METRO_ZERO, metro_rejected)
+        stats.heap_pushes = len(best_heap)
+        stats.extra["profiles"] = sum(len(sized) for groups in (groups_a, groups_b) for sized in groups)
+        stats.finish()
+
+    return sorted(results, reverse=True, key=lambda x: x[0])
@@ -1,13 +1,18 @@
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Tuple
+from typing import Dict, FrozenSet, List, Tuple
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Trait:
     id: int
     name: str
     thresholds: Tuple[int, ...] = (2,)    # e.g., (2,4,6,10)
+    # count -> highest reached threshold / synergy points (0 if none),
+    # filled in by initialize_traits_and_heroes
+    reached_by_count: Tuple[int, ...] = field(default=(), repr=False, compare=False)
+    points_by_count: Tuple[int, ...] = field(default=(), repr=False, compare=False)
 
-@dataclass
+@dataclass(slots=True)
 class Hero:
     id: int
     name: str
@@ -22,3 +27,135 @@ class Hero:
             mask |= (1 << t)
         self.trait_mask = mask
         return self.trait_mask
+
+@dataclass(frozen=True, slots=True)
+class Roster:
+    """
+    Compact, solver-facing form of hero_index (see compile_roster).
+
+    Heroes are stored column-wise in flat int arrays indexed by hero id.
+    Hero h carries trait_ids[trait_offsets[h]:trait_offsets[h + 1]] (CSR).
+    """
+    num_heroes: int
+    num_traits: int
+    quality: array                        # array('i'), per hero
+    trait_offsets: array                  # array('i'), num_heroes + 1 entries
+    trait_ids: array                      # array('i'), all heroes' traits
+    glory_league: array                   # array('b'), 1 if Glory League eligible
+    metro_zero: array                     # array('b'), 1 if hero is Metro Zero
+
+    def traits_of(self, hid):
+        return self.trait_ids[self.trait_offsets[hid]:self.trait_offsets[hid + 1]]
+
+@dataclass(frozen=True, slots=True)
+class GloryLeagueRules:
+    """
+    Glory League rules indexed by hero id (see glory_league_rules).
+
+    A legal pair is one 1-cost and one 5-cost hero from allowed.
+    """
+    cost: array                           # array('b'), 1 / 5 if eligible, else 0
+    allowed: FrozenSet[Tuple[int, int]]   # legal (1-cost id, 5-cost id) pairs
+    # Sorted names, for error messages
+    one_cost_names: Tuple[str, ...] = ()
+    five_cost_names: Tuple[str, ...] = ()
+    allowed_names: Dict[int, Tuple[str, ...]] = field(default_factory=dict, compare=False)
+
+    def pairs(self):
+        """Every legal pair, sorted."""
+        return sorted(self.allowed)
+
+# Synergy points per reached threshold level (reached * LEVEL_WEIGHT)
+LEVEL_WEIGHT = 10
+
+@dataclass(frozen=True, slots=True)
+class MandatoryTrait:
+    """Bonus when a team has min_count of a trait, penalty (ex: -500) otherwise."""
+    trait_id: int
+    min_count: int
+    bonus: int
+    penalty: int
+
+@dataclass(frozen=True, slots=True)
+class ScoringModel:
+    """
+    Weights of the team score, compiled into lookup tables by compile().
+
+    score = sum over traits of points[tid][count]
+          + quality_weight * sum of hero quality
+          + bonus / penalty of every mandatory trait rule
+
+    A trait at reached threshold t scores threshold_points[tid][t] if given,
+    else t * trait_weights.get(tid, level_weight). Weights must be ints
+    (scores are compared and bounded as ints).
+    """
+    level_weight: int = LEVEL_WEIGHT
+    trait_weights: Dict[int, int] = field(default_factory=dict)
+    threshold_points: Dict[int, Dict[int, int]] = field(default_factory=dict)
+    quality_weight: int = 1
+    mandatory: Tuple[MandatoryTrait, ...] = ()
+    name: str = "custom"
+
+    def __post_init__(self):
+        weights = [self.level_weight, self.quality_weight]
+        weights += list(self.trait_weights.values())
+        weights += [p for row in self.threshold_points.values() for p in row.values()]
+        weights += [w for rule in self.mandatory for w in (rule.min_count, rule.bonus, rule.penalty)]
+
+        if not all(isinstance(w, int) for w in weights):
+            raise ValueError(f"Scoring model '{self.name}': weights must be ints.")
+
+    def compile(self, trait_index, hero_index):
+        """Flat per-trait / per-hero lookup tables for the solvers."""
+        points_by_count = []
+        for trait in trait_index:
+            weight = self.trait_weights.get(trait.id, self.level_weight)
+            overrides = self.threshold_points.get(trait.id, {})
+            points_by_count.append(tuple(
+                overrides.get(reached, reached * weight) if reached else 0
+                for reached in trait.reached_by_count
+            ))
+
+        return CompiledScoring(
+            name=self.name,
+            points_by_count=tuple(points_by_count),
+            quality=array("i", (self.quality_weight * hero.quality for hero in hero_index)),
+            mandatory=self.mandatory_rules(),
+        )
+
+    def mandatory_rules(self):
+        """Mandatory traits as flat (trait id, min count, bonus, penalty) tuples."""
+        return tuple(
+            (rule.trait_id, rule.min_count, rule.bonus, rule.penalty)
+            for rule in self.mandatory
+        )
+
+@dataclass(frozen=True, slots=True)
+class CompiledScoring:
+    """
+    ScoringModel.compile output. Every solver scores with these tables:
+
+    points_by_count[tid][count]  synergy points (saturates past its end)
+    quality[hid]                 weighted hero quality
+    mandatory                    (trait id, min count, bonus, penalty) rules
+    """
+    name: str
+    points_by_count: Tuple[Tuple[int, ...], ...] = field(repr=False)
+    quality: array = field(repr=False)
+    mandatory: Tuple[Tuple[int, int, int, int], ...] = ()
+
+    def points_table(self, max_count):
+        """points_by_count as lists covering counts 0..max_count (padded)."""
+        table = []
+        for row in self.points_by_count:
+            padded = list(row[:max_count + 1])
+            padded.extend([row[-1]] * (max_count + 1 - len(padded)))
+            table.append(padded)
+        return table
+
+    def mandatory_term(self, trait_counts):
+        """Sum of the mandatory rules' bonus / penalty for final counts."""
+        term = 0
+        for tid, min_count, bonus, penalty in self.mandatory:
+            term += bonus if trait_counts[tid] >= min_count else penalty
+        return term
@@ -0,0 +1,205 @@
+"""
+Name -> id resolution for heroes and traits, built once per roster.
+
+    heroes = hero_name_index(hero_index)
+    heroes.resolve("irith")            # -> Irithel's id (unique prefix)
+    heroes.resolve("xborg")            # -> X.Borg's id (punctuation ignored)
+    heroes.resolve_all(["Kula", "kyo"])
+    trait_name_index(trait_index).resolve("king of fighters")   # -> KOF (alias)
+
+A name is matched, in order, by:
+
+1. exact name, case-insensitive (the only match get_hid used to accept)
+2. alias (HERO_ALIASES / TRAIT_ALIASES)
+3. exact name ignoring spaces and punctuation ("xborg", "k")
+4. unique prefix of the name or of one of its words ("irith", "yagami")
+5. unique close spelling ("irithal", difflib ratio >= FUZZY_CUTOFF)
+
+Steps 1-3 are dict lookups; every answer (and every error) is memoized per
+input string, so resolving the same names again, as a batch of queries
+does, costs one dict lookup per name. Unknown or ambiguous names raise
+ValueError with "did you mean" suggestions and the roster's names, both
+computed once.
+
+Indexes are cached per roster content, the (id, name) of every entry
+(hero_name_index / trait_name_index): equal rosters share an index, and a
+roster renamed or resized in place gets a new one on its next lookup.
+"""
+
+import bisect
+import difflib
+from typing import Dict, List, Tuple
+
+# Lower-case alias -> canonical name
+HERO_ALIASES = {
+    "k prime": "K'",
+}
+
+TRAIT_ALIASES = {
+    "king of fighters": "KOF",
+    "kof": "KOF",
+    "gl": "Glory League",
+    "mz": "Metro Zero",
+    "wm": "Weapon Master",
+    "btc": "Beyond the Clouds",
+}
+
+# Minimum difflib ratio for a misspelling to resolve on its own
+FUZZY_CUTOFF = 0.8
+
+# Suggestions listed in "did you mean" errors
+MAX_SUGGESTIONS = 3
+
+# Memoized inputs per index (cleared when full, inputs can be arbitrary text)
+MAX_MEMO = 4096
+
+def compact_name(name):
+    """Lower-case name without spaces or punctuation (ex: "X.Borg" -> "xborg")."""
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+class NameIndex:
+    """
+    Resolves names of one roster list (heroes or traits: anything with .id
+    and .name) to ids.
+
+    kind           : what the names are, for error messages (ex: "hero")
+    plural         : plural of kind (default: kind + "s")
+    aliases        : lower-case alias -> canonical name
+    """
+
+    def __init__(self, items, kind, plural=None, aliases=None):
+        self.kind = kind
+        self.size = len(items)
+        self.names = [item.name for item in items]
+
+        self._exact: Dict[str, int] = {}
+        self._compact: Dict[str, int] = {}
+        self._memo: Dict[str, object] = {}
+
+        for item in items:
+            self._exact.setdefault(item.name.lower(), item.id)
+            self._compact.setdefault(compact_name(item.name), item.id)
+
+        for alias, name in (aliases or {}).items():
+            item_id = self._exact.get(name.lower())
+            if item_id is not None:
+                self._exact.setdefault(alias.lower(), item_id)
+                self._compact.setdefault(compact_name(alias), item_id)
+
+        # Sorted (key, id) pairs for prefix search: each name's compact form
+        # plus the compact form starting at each of its later words
+        prefix_keys: List[Tuple[str, int]] = []
+        for item in items:
+            words = item.name.lower().split()
+            for i in range(len(words)):
+                prefix_keys.append((compact_name(" ".join(words[i:])), item.id))
+        prefix_keys.sort()
+        self._prefix_keys = [key for key, _ in prefix_keys]
+        self._prefix_ids = [item_id for _, item_id in prefix_keys]
+
+        self._fuzzy_keys = [compact_name(item.name) for item in items]
+        self._available = f"Available {plural or kind + 's'}: {sorted(self.names)}"
+
+    def resolve(self, name):
+        """Id of one name; ValueError if it is unknown or ambiguous."""
+        if not name or not name.strip():
+            raise ValueError(f"{self.kind.capitalize()} name cannot be empty.")
+
+        answer = self._memo.get(name)
+        if answer is None:
+            answer = self._match(name)
+            if len(self._memo) >= MAX_MEMO:
+                self._memo.clear()
+            self._memo[name] = answer
+
+        if isinstance(answer, str):
+            raise ValueError(answer)
+        return answer
+
+    def resolve_all(self, names):
+        """Ids of a list of names, same order."""
+        return [self.resolve(name) for name in names]
+
+    def suggestions(self, name):
+        """Closest known names, best first (at most MAX_SUGGESTIONS)."""
+        key = compact_name(name)
+        close = difflib.get_close_matches(key, self._fuzzy_keys, n=MAX_SUGGESTIONS, cutoff=0.5)
+        return [self.names[self._compact[match]] for match in close]
+
+    def _match(self, name):
+        """Id for name, or the error message to raise."""
+        key = name.lower().strip()
+
+        if key in self._exact:
+            return self._exact[key]
+
+        compact = compact_name(key)
+        if compact in self._compact:
+            return self._compact[compact]
+
+        # Unique prefix
+        if compact:
+            start = bisect.bisect_left(self._prefix_keys, compact)
+            matches = set()
+            for i in range(start, len(self._prefix_keys)):
+                if not self._prefix_keys[i].startswith(compact):
+                    break
+                matches.add(self._prefix_ids[i])
+
+            if len(matches) == 1:
+                return matches.pop()
+            if matches:
+                candidates = sorted(self.names[i] for i in matches)
+                return f"Ambiguous {self.kind} name: '{name}'. Did you mean one of {candidates}?"
+
+        # Unique close spelling
+        close = difflib.get_close_matches(compact, self._fuzzy_keys, n=2, cutoff=FUZZY_CUTOFF)
+        if len(close) == 1:
+            return self._compact[close[0]]
+
+        suggestions = self.suggestions(name)
+        hint = f"Did you mean {suggestions}? " if suggestions else ""
+        return f"Unknown {self.kind} name: '{name}'. {hint}{self._available}"
+
+# -----------------------------
+# Per-roster cache
+# -----------------------------
+# (kind, (id, name) of every entry) -> built object. Keyed on content rather
+# than id(list), so a new list at a freed address or a roster edited in place
+# never reuses a stale entry
+_per_roster = {}
+MAX_CACHED_ROSTERS = 16
+
+def roster_names_key(items):
+    """Hashable (id, name) of every entry: all that the cached builders read."""
+    return tuple((item.id, item.name) for item in items)
+
+def per_roster(items, kind, build, refresh=False):
+    """
+    build(items), built once per roster content and kind, then reused.
+
+    build must only depend on the entries' ids and names. Rebuilt when
+    refresh=True.
+    """
+    key = (kind, roster_names_key(items))
+    built = _per_roster.get(key)
+
+    if refresh or built is None:
+        if len(_per_roster) >= MAX_CACHED_ROSTERS:
+            _per_roster.clear()
+        built = build(items)
+        _per_roster[key] = built
+
+    return built
+
+def hero_name_index(hero_index, refresh=False):
+    """NameIndex for hero_index, built on first use."""
+    return per_roster(
+        hero_index, "hero names", lambda items: NameIndex(items, "hero", "heroes", HERO_ALIASES), refresh
+    )
+
+def trait_name_index(trait_index, refresh=False):
+    """NameIndex for trait_index, built on first use."""
+    return per_roster(
+        trait_index, "trait names", lambda items: NameIndex(items, "trait", "traits", TRAIT_ALIASES), refresh
+    )
@@ -0,0 +1,238 @@
+"""
+NumPy batch evaluator for find_best_team(engine="numpy").
+
+Instead of calling evaluate_team once per combination, candidate teams are
+scored in blocks of index arrays:
+
+    counts  = offset + incidence[block].sum(axis=1)     # (B, traits)
+    synergy = points_lut[trait, counts].sum(axis=1)
+    score   = synergy + quality[block].sum(axis=1) +/- METRO_ZERO_BONUS
+
+Only the few candidates that actually enter the top-k heap are turned back
+into Python tuples and rescored with evaluate_team, so the returned entries
+are exactly what find_best_team produces.
+
+NumPy is optional: it is only imported when this engine is selected.
+"""
+
+import heapq
+import itertools
+import time
+
+from helper import (
+    GLORY_LEAGUE_ID,
+    METRO_ZERO_BONUS,
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    evaluate_team,
+    trait_tables,
+)
+
+DEFAULT_BLOCK_SIZE = 8192
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise ImportError(
+            "engine='numpy' requires NumPy. Install it with: pip install numpy"
+        ) from exc
+    return np
+
+def build_incidence(hero_index, trait_index, glory_league_ids=None):
+    """
+    Dense hero x trait incidence matrix (int8).
+
+    Glory League heroes get an extra +1 in the Glory League column, the same
+    way evaluate_team counts them.
+    """
+    np = _require_numpy()
+
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    incidence = np.zeros((len(hero_index), len(trait_index)), dtype=np.int8)
+
+    for hero in hero_index:
+        for tid in hero.trait_ids:
+            incidence[hero.id, tid] += 1
+        if hero.id in glory_league_ids:
+            incidence[hero.id, GLORY_LEAGUE_ID] += 1
+
+    return incidence
+
+def build_points_lut(trait_index, max_count):
+    """
+    count -> synergy points lookup table, shape (traits, max_count + 1).
+
+    points_lut[tid, count] == highest reached threshold * 10 (0 if none).
+    """
+    np = _require_numpy()
+
+    points_lut = np.zeros((len(trait_index), max_count + 1), dtype=np.int32)
+
+    points_table, _ = trait_tables(trait_index, max_count)
+    for tid, points_row in enumerate(points_table):
+        points_lut[tid] = points_row
+
+    return points_lut
+
+def _iter_blocks(free_pool, slots, block_size):
+    """Yield (B, slots) index arrays covering combinations(free_pool, slots)."""
+    np = _require_numpy()
+
+    combos = itertools.combinations(free_pool, slots)
+
+    while True:
+        chunk = list(itertools.islice(combos, block_size))
+        if not chunk:
+            return
+
+        flat = np.fromiter(
+            itertools.chain.from_iterable(chunk),
+            dtype=np.intp,
+            count=len(chunk) * slots,
+        )
+        yield flat.reshape(len(chunk), slots)
+
+def score_block(block, incidence, quality, offset, points_lut):
+    """
+    Score a block of candidate teams.
+
+    block : int array (B, slots) of hero IDs (the free part of each team)
+    offset : int array (traits,) with core heroes and magic crystals applied
+
+    Returns an int array (B,) of final scores.
+    """
+    np = _require_numpy()
+
+    counts = incidence[block].sum(axis=1, dtype=np.int16) + offset
+
+    trait_cols = np.arange(points_lut.shape[0])
+    synergy = points_lut[trait_cols, counts].sum(axis=1)
+
+    scores = synergy + quality[block].sum(axis=1) + METRO_ZERO_BONUS
+    scores[counts[:, METRO_ZERO_ID] < METRO_ZERO_THRESHOLD] -= 2 * METRO_ZERO_BONUS
+
+    return scores
+
+def find_best_team_numpy(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    block_size=DEFAULT_BLOCK_SIZE,
+    stats=None,
+):
+    """
+    Batch-vectorized find_best_team. Same inputs and results.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    block_size     : number of candidate teams scored per NumPy call
+    stats          : optional stats.SolverStats to fill in
+    """
+    np = _require_numpy()
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team[numpy]")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    free_pool = [h for h in range(len(hero_index)) if h not in core_hero_ids]
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    # -----------------------------
+    # Precomputed tables
+    # -----------------------------
+    incidence = build_incidence(hero_index, trait_index, glory_league_ids)
+    quality = np.array([h.quality for h in hero_index], dtype=np.int32)
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_lut = build_points_lut(trait_index, max_count)
+
+    # Core heroes and crystals are the same for every candidate
+    offset = np.zeros(len(trait_index), dtype=np.int16)
+    for hid in core_hero_ids:
+        offset += incidence[hid]
+    for tid, bonus in magic_crystal_ids.items():
+        offset[tid] += bonus
+    core_quality = sum(hero_index[hid].quality for hid in core_hero_ids)
+
+    # -----------------------------
+    # Block enumeration
+    # -----------------------------
+    best_heap = []
+    evaluated = 0
+    replacements = 0
+
+    for block in _iter_blocks(free_pool, remaining_slots, block_size):
+        evaluated += len(block)
+
+        if timed:
+            scoring_start = time.perf_counter()
+
+        scores = score_block(block, incidence, quality, offset, points_lut) + core_quality
+
+        # The heap minimum only grows, so rows at or below it can never enter
+        if len(best_heap) >= top_k:
+            candidates = np.flatnonzero(scores > best_heap[0][0])
+        else:
+            candidates = np.arange(len(scores))
+
+        # Replay the heap logic in enumeration order so ties resolve exactly
+        # like find_best_team; teams are only built for rows that get in
+        for row, score in zip(candidates.tolist(), scores[candidates].tolist()):
+            if len(best_heap) >= top_k and score <= best_heap[0][0]:
+                continue
+
+            team = tuple(sorted(core_hero_ids + block[row].tolist()))
+
+            score, synergy = evaluate_team(
+                team,
+                hero_index,
+                trait_index,
+                glory_league_ids=glory_league_ids,
+                magic_crystal_ids=magic_crystal_ids,
+            )
+
+            entry = (score, team, synergy)
+
+            if len(best_heap) < top_k:
+                if not best_heap and stats is not None:
+                    stats.first_result()
+                heapq.heappush(best_heap, entry)
+            else:
+                heapq.heapreplace(best_heap, entry)
+                replacements += 1
+
+        if timed:
+            scoring_seconds += time.perf_counter() - scoring_start
+
+    if stats is not None:
+        stats.leaves = evaluated
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.extra["block_size"] = block_size
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
@@ -0,0 +1,220 @@
+"""
+Multi-core sharded branch-and-bound search.
+
+The combination space is split by the first hero picked from the
+branch-and-bound pool: shard i holds every team whose first pick is
+pool[i] and whose remaining picks come from pool[i + 1:]. Shards are
+disjoint and together cover the whole space, so merging the per-shard
+top-k heaps gives the global top-k.
+
+Workers get hero_index / trait_index once through the pool initializer.
+Every time a shard finishes, the merged k-th best score is published in a
+shared value so shards that are still running can prune against it.
+
+Run this file directly to benchmark scaling from 1 to N workers.
+"""
+
+import heapq
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from helper import _bnb_search, bnb_pool_order, compile_scoring
+from stats import SolverStats
+
+# Per-process state set once by _init_worker
+_worker_state = {}
+
+def _init_worker(hero_index, trait_index, shared_cutoff, scoring):
+    _worker_state["hero_index"] = hero_index
+    _worker_state["trait_index"] = trait_index
+    _worker_state["shared_cutoff"] = shared_cutoff
+    _worker_state["scoring"] = scoring
+
+def _run_shard(max_team_size, core_hero_ids, glory_league_ids, magic_crystal_ids, top_k, shard_pool, time_split):
+    """One shard; returns (top-k heap, the shard's SolverStats)."""
+    shard_stats = SolverStats(time_split=time_split)
+    best_heap = _bnb_search(
+        max_team_size,
+        _worker_state["hero_index"],
+        _worker_state["trait_index"],
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+        free_pool=shard_pool,
+        shared_cutoff=_worker_state["shared_cutoff"],
+        stats=shard_stats,
+        model=_worker_state["scoring"],
+    )
+    return best_heap, shard_stats
+
+def make_shards(hero_index, core_hero_ids, remaining_slots):
+    """
+    Split the free pool into (extra_core_hero, shard_pool) pairs by first pick.
+
+    Shards are returned largest first so the long ones start early.
+    """
+    free_pool = [h.id for h in hero_index if h.id not in core_hero_ids]
+    pool = bnb_pool_order(hero_index, free_pool)
+
+    shards = []
+    for i in range(len(pool) - remaining_slots + 1):
+        shards.append((pool[i], pool[i + 1:]))
+
+    return shards
+
+def find_best_team_parallel(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    workers=None,
+    stats=None,
+    model=None,
+):
+    """
+    Sharded find_best_team_bnb over a process pool. Same inputs and scores.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    workers        : number of worker processes (default: os.cpu_count())
+    stats          : optional stats.SolverStats to fill in (shard counters
+                     are summed; extra["shards"] is the shard count)
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING),
+                     compiled once and sent to every worker
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if glory_league_ids is None:
+        glory_league_ids = set()
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if stats is not None:
+        stats.start("find_best_team_parallel")
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    scoring = compile_scoring(model, trait_index, hero_index)
+
+    # Nothing to split: the only team is the core itself
+    if remaining_slots == 0:
+        best_heap = _bnb_search(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=top_k,
+            stats=stats,
+            model=scoring,
+        )
+        if stats is not None:
+            stats.finish()
+        return sorted(best_heap, reverse=True, key=lambda x: x[0])
+
+    shards = make_shards(hero_index, core_hero_ids, remaining_slots)
+
+    # Merged k-th best score, readable by every worker
+    shared_cutoff = multiprocessing.Value("q", -(1 << 62), lock=False)
+
+    best_heap = []
+    time_split = stats is not None and stats.time_split
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(hero_index, trait_index, shared_cutoff, scoring),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _run_shard,
+                max_team_size,
+                list(core_hero_ids) + [first],
+                glory_league_ids,
+                magic_crystal_ids,
+                top_k,
+                shard_pool,
+                time_split,
+            )
+            for first, shard_pool in shards
+        ]
+
+        for future in as_completed(futures):
+            shard_heap, shard_stats = future.result()
+
+            if stats is not None:
+                stats.absorb(shard_stats)
+
+            for entry in shard_heap:
+                if len(best_heap) < top_k:
+                    if not best_heap and stats is not None:
+                        stats.first_result()
+                    heapq.heappush(best_heap, entry)
+                else:
+                    if entry[0] > best_heap[0][0]:
+                        heapq.heapreplace(best_heap, entry)
+
+            # Publish the tighter bound to shards still running
+            if len(best_heap) >= top_k and best_heap[0][0] > shared_cutoff.value:
+                shared_cutoff.value = best_heap[0][0]
+
+    if stats is not None:
+        stats.extra["shards"] = len(shards)
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
+
+def benchmark_scaling(max_team_size, hero_index, trait_index, max_workers=None, **query):
+    """
+    Time find_best_team_parallel with 1..max_workers workers.
+
+    Returns a list of (workers, seconds, speedup vs 1 worker).
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    rows = []
+    baseline = None
+
+    for workers in range(1, max_workers + 1):
+        start = time.perf_counter()
+        find_best_team_parallel(max_team_size, hero_index, trait_index, workers=workers, **query)
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = elapsed
+
+        rows.append((workers, elapsed, baseline / elapsed))
+
+    return rows
+
+if __name__ == "__main__":
+    from heroes_and_traits import traits, heroes
+    from helper import initialize_traits_and_heroes
+
+    traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+
+    # Worst case for pruning: no core heroes, big team
+    rows = benchmark_scaling(9, hero_index, traits_index, top_k=5)
+
+    print("\nworkers  seconds  speedup")
+    for workers, elapsed, speedup in rows:
+        print(f"{workers:>7}  {elapsed:>7.3f}  {speedup:>6.2f}x")
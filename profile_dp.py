@@ -0,0 +1,363 @@
+"""
+Exact solver: dynamic program over trait-count profiles.
+
+A team's score only depends on its quality sum and its per-trait counts
+(Metro Zero's bonus included), so partial teams are merged on their count
+*profile* instead of being enumerated one combination at a time.
+
+The DP walks the free pool once, 0/1-knapsack style: after hero p, every
+state is a set of partial teams picked from pool[:p]. Its key is
+
+    (heroes picked, canonical count of every live trait)
+
+and its value keeps the top_k partial teams by
+
+    value = quality + sum of every live trait's points at its current count
+
+Only heroes in pool[p:] can still change a trait, at most
+horizon = min(slots left, carriers left) more times. Two counts with the same
+score increments over that horizon behave the same from here on, so each count
+is replaced by the smallest count with the same increments. Counts past the
+top threshold collapse together, and a trait with no carriers left drops out
+of the key. Partial teams sharing a key get the same points from every
+completion, so keeping the best top_k values per key is exact.
+
+Dead traits and dominated heroes are dropped first (reduction.reduce_free_pool),
+and states whose optimistic completion cannot reach the current k-th best
+score are discarded: first with a static per-hero gain bound, then with the
+count-aware gain ratios find_best_team_bnb uses. The k-th best starts from a
+beam-search seed and tightens as complete teams appear.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty).
+"""
+
+import heapq
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    compile_roster,
+    evaluate_team,
+    gain_ratio_tables,
+    query_hero_traits,
+    require_default_scoring,
+)
+from heuristic import find_best_team_beam
+from reduction import _trait_value, reduce_free_pool
+from stats import PRUNE_BOUND
+
+def find_best_team_dp(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+    model=None,
+):
+    """
+    Exact profile-merging DP. Same inputs and top-k scores as find_best_team.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in (nodes are state
+                     transitions, prunes count dropped states)
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+    """
+
+    require_default_scoring(model, "find_best_team_dp")
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    query = dict(
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+    )
+
+    if stats is not None:
+        stats.start("find_best_team_dp")
+
+    reduction = reduce_free_pool(max_team_size, hero_index, trait_index, **query)
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    quality = roster.quality
+    points_table = reduction["points_table"]
+    base_counts = reduction["base_counts"]
+    max_count = len(points_table[0]) - 1
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    # -----------------------------
+    # Live traits
+    # -----------------------------
+    live = sorted(reduction["live_traits"])
+    position = {tid: slot for slot, tid in enumerate(live)}
+    live_range = range(len(live))
+
+    # value_table[slot][count] = score contribution of a live trait
+    value_table = [
+        [_trait_value(points_table, tid, count) for count in range(max_count + 1)]
+        for tid in live
+    ]
+
+    # Core heroes and dead traits never change
+    fixed_score = sum(quality[hid] for hid in core_hero_ids) + sum(
+        _trait_value(points_table, tid, count)
+        for tid, count in enumerate(base_counts)
+        if tid not in position
+    )
+
+    # -----------------------------
+    # Pool order + static optimistic gains
+    # -----------------------------
+    pool = [hid for _, members in reduction["classes"] for hid in members]
+    pool_slots = {
+        hid: tuple(position[tid] for tid in hero_traits[hid] if tid in position)
+        for hid in pool
+    }
+
+    # Best points gain per carrier of each live trait, at any count. The
+    # Metro Zero bonus is left out here and bounded on its own below.
+    gain_ratio_table = gain_ratio_tables(points_table, max(remaining_slots, 1))
+    best_ratio = [max(max(row) for row in gain_ratio_table[tid]) for tid in live]
+    ratio_rows = [gain_ratio_table[tid] for tid in live]
+
+    gains = {
+        hid: quality[hid] + sum(best_ratio[slot] for slot in pool_slots[hid])
+        for hid in pool
+    }
+
+    # Best gains first: the suffix bounds below then shrink quickly
+    pool.sort(key=lambda hid: (-gains[hid], hid))
+    pool_size = len(pool)
+
+    # suffix_best[p][s] = best sum of s gains among pool[p:]
+    suffix_best = [[0.0] * (remaining_slots + 1) for _ in range(pool_size + 1)]
+    for p in range(pool_size - 1, -1, -1):
+        row = suffix_best[p]
+        below = suffix_best[p + 1]
+        for s in range(1, remaining_slots + 1):
+            row[s] = max(below[s], below[s - 1] + gains[pool[p]])
+
+    # carriers_left[p][slot] = carriers of a live trait in pool[p:]
+    carriers_left = [[0] * len(live) for _ in range(pool_size + 1)]
+    for p in range(pool_size - 1, -1, -1):
+        carriers_left[p] = list(carriers_left[p + 1])
+        for slot in pool_slots[pool[p]]:
+            carriers_left[p][slot] += 1
+
+    metro_slot = position.get(METRO_ZERO_ID)
+
+    # -----------------------------
+    # Canonical counts
+    # -----------------------------
+    canon_cache = {}
+
+    def canon(slot, count, horizon):
+        """Smallest count with the same score increments over the horizon."""
+        key = (slot, count, horizon)
+        rep = canon_cache.get(key)
+
+        if rep is None:
+            row = value_table[slot]
+            target = [row[count + j] - row[count] for j in range(1, horizon + 1)]
+
+            rep = count
+            for other in range(count):
+                if [row[other + j] - row[other] for j in range(1, horizon + 1)] == target:
+                    rep = other
+                    break
+
+            canon_cache[key] = rep
+
+        return rep
+
+    # -----------------------------
+    # Result tracking, seeded by beam search
+    # -----------------------------
+    best_heap = []
+    in_heap = set()
+    evaluated = 0
+    replacements = 0
+
+    def offer(score, team):
+        nonlocal evaluated, replacements
+        evaluated += 1
+
+        if len(best_heap) >= top_k and score <= best_heap[0][0]:
+            return
+
+        team = tuple(sorted(team))
+        if team in in_heap:
+            return
+
+        if stats is not None:
+            stats.first_result()
+
+        if len(best_heap) < top_k:
+            heapq.heappush(best_heap, (score, team))
+        else:
+            in_heap.discard(heapq.heapreplace(best_heap, (score, team))[1])
+            replacements += 1
+        in_heap.add(team)
+
+    seed = find_best_team_beam(max_team_size, hero_index, trait_index, **query)
+
+    for score, team, _ in seed:
+        offer(score, team)
+
+    # -----------------------------
+    # DP over the pool
+    # -----------------------------
+    start_counts = [base_counts[tid] for tid in live]
+    start_value = sum(value_table[slot][start_counts[slot]] for slot in live_range)
+
+    # (picked, canonical counts) -> [(value, picks), ...], best value first
+    states = {}
+
+    if remaining_slots == 0:
+        offer(fixed_score + start_value, core_hero_ids)
+    elif pool_size >= remaining_slots:
+        start_key = tuple(
+            canon(slot, start_counts[slot], min(remaining_slots, carriers_left[0][slot]))
+            for slot in live_range
+        )
+        states[(0, start_key)] = [(start_value, ())]
+
+    peak_states = len(states)
+    transitions = 0
+    pruned = 0
+
+    def merge(target, key, entries):
+        current = target.get(key)
+        if current is None:
+            target[key] = entries
+        else:
+            current.extend(entries)
+
+    for p, hid in enumerate(pool):
+        if not states:
+            break
+
+        hero_quality = quality[hid]
+        slots = pool_slots[hid]
+        after = carriers_left[p + 1]
+        heroes_left = pool_size - p - 1
+        next_states = {}
+        transitions += len(states)
+
+        for (picked, counts), entries in states.items():
+            slots_left = remaining_slots - picked
+
+            # Skip the hero: only its traits lose a carrier
+            if slots_left <= heroes_left:
+                skipped = list(counts)
+                for slot in slots:
+                    skipped[slot] = canon(slot, counts[slot], min(slots_left, after[slot]))
+                merge(next_states, (picked, tuple(skipped)), list(entries))
+
+            # Take the hero
+            taken = list(counts)
+            delta = hero_quality
+            for slot in slots:
+                count = taken[slot]
+                row = value_table[slot]
+                delta += row[count + 1] - row[count]
+                taken[slot] = count + 1
+
+            extended = [(value + delta, picks + (hid,)) for value, picks in entries]
+
+            if slots_left == 1:
+                for value, picks in extended:
+                    offer(fixed_score + value, list(core_hero_ids) + list(picks))
+                continue
+
+            if slots_left - 1 > heroes_left:
+                continue
+
+            for slot in live_range:
+                taken[slot] = canon(slot, taken[slot], min(slots_left - 1, after[slot]))
+            merge(next_states, (picked + 1, tuple(taken)), extended)
+
+        # Keep the top_k partial teams per state, drop states that can't
+        # reach the current k-th best score
+        cutoff = best_heap[0][0] if len(best_heap) >= top_k else None
+        states = {}
+
+        for key, entries in next_states.items():
+            if len(entries) > top_k:
+                entries = heapq.nlargest(top_k, entries, key=lambda x: x[0])
+            elif len(entries) > 1:
+                entries.sort(key=lambda x: -x[0])
+
+            if cutoff is not None:
+                picked, counts = key
+                slots_left = remaining_slots - picked
+                bound = fixed_score + entries[0][0] + suffix_best[p + 1][slots_left]
+
+                if metro_slot is not None:
+                    metro = counts[metro_slot]
+                    reachable = metro + min(slots_left, after[metro_slot])
+                    if metro < METRO_ZERO_THRESHOLD <= reachable:
+                        bound += 2 * METRO_ZERO_BONUS
+
+                if int(bound + 1e-9) <= cutoff:
+                    pruned += 1
+                    continue
+
+                # Survivors get the tighter count-aware bound of
+                # find_best_team_bnb. Canonical counts share their
+                # increments over the horizon, so the ratios stay admissible.
+                ratio = [ratio_rows[slot][counts[slot]][slots_left] for slot in live_range]
+                suffix_gains = [
+                    quality[other] + sum(ratio[slot] for slot in pool_slots[other])
+                    for other in pool[p + 1:]
+                ]
+                bound += sum(heapq.nlargest(slots_left, suffix_gains)) - suffix_best[p + 1][slots_left]
+
+                if int(bound + 1e-9) <= cutoff:
+                    pruned += 1
+                    continue
+
+            states[key] = entries
+
+        peak_states = max(peak_states, len(states))
+
+    # -----------------------------
+    # Results
+    # -----------------------------
+    results = []
+    for _, team in best_heap:
+        score, synergy = evaluate_team(
+            team,
+            hero_index,
+            trait_index,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+        )
+        results.append((score, team, synergy))
+
+    if stats is not None:
+        stats.nodes = transitions
+        stats.leaves = evaluated
+        stats.prune(PRUNE_BOUND, pruned)
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.extra["peak_states"] = peak_states
+        stats.extra["pool"] = pool_size
+        stats.finish()
+
+    return sorted(results, reverse=True, key=lambda x: x[0])
@@ -0,0 +1,388 @@
+"""
+Per-query pool reduction: dead traits, hero equivalence classes, dominance.
+
+For a given query (core heroes, Glory League pair, crystals, team size):
+
+1. A trait is *live* if adding the carriers still available (at most one per
+   open slot) can change its contribution to the score. Every other trait
+   is *dead*: its points (and, for Metro Zero, the bonus) are already fixed.
+
+2. Each free hero is reduced to its *signature*, the live traits it adds to
+   the counts. Heroes with the same signature are interchangeable except
+   for quality, so they form one equivalence class. Heroes whose signature
+   is empty are pure quality filler.
+
+3. Hero A is *dominated* by B when B's signature contains A's and B is at
+   least as good on quality (ties broken by id). A hero with at least
+   top_k + open_slots - 1 dominators can never be needed in the top-k: any
+   team using it can be improved by swapping in k different dominators.
+
+find_best_team_reduced then enumerates how many heroes to take from each
+class (scoring each class with its best-quality members) and only expands
+the winning class vectors back into concrete teams at the end. Scores are
+the same as find_best_team's top-k.
+"""
+
+import heapq
+import itertools
+import time
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    compile_roster,
+    evaluate_team,
+    query_hero_traits,
+    require_default_scoring,
+    trait_tables,
+)
+from stats import PRUNE_CAPACITY
+
+def _trait_value(points_table, tid, count):
+    """Score contribution of one trait at a given count."""
+    value = points_table[tid][count]
+
+    if tid == METRO_ZERO_ID:
+        if count >= METRO_ZERO_THRESHOLD:
+            value += METRO_ZERO_BONUS
+        else:
+            value -= METRO_ZERO_BONUS
+
+    return value
+
+def _dominates(b_sig, b_quality, b_id, a_sig, a_quality, a_id):
+    """True if hero b is at least as good as hero a in every team."""
+    if b_quality < a_quality:
+        return False
+
+    # b must carry every live trait a carries (with multiplicity)
+    remaining = list(b_sig)
+    for tid in a_sig:
+        if tid not in remaining:
+            return False
+        remaining.remove(tid)
+
+    if b_quality > a_quality or remaining:
+        return True
+
+    return b_id < a_id
+
+def reduce_free_pool(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+):
+    """
+    Analyse one query and collapse its free pool.
+
+    Returns a dict with:
+      base_counts    : trait counts from core heroes + crystals
+      live_traits    : set of trait ids that can still change the score
+      classes        : list of (signature, member ids sorted best quality first)
+      dominated      : list of hero ids dropped by the dominance rule
+      points_table   : count -> points tables sized for this query
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    free_pool = [hid for hid in range(roster.num_heroes) if hid not in core_hero_ids]
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, _ = trait_tables(trait_index, max_count)
+
+    # Counts fixed by the query
+    base_counts = [0] * roster.num_traits
+    for hid in core_hero_ids:
+        for tid in hero_traits[hid]:
+            base_counts[tid] += 1
+    for tid, bonus in magic_crystal_ids.items():
+        base_counts[tid] += bonus
+
+    # How much each trait can still grow
+    carriers = [0] * roster.num_traits
+    for hid in free_pool:
+        for tid in hero_traits[hid]:
+            carriers[tid] += 1
+
+    live_traits = set()
+    for tid in range(roster.num_traits):
+        low = base_counts[tid]
+        high = low + min(remaining_slots, carriers[tid])
+        # Trait values never decrease with count, so comparing the ends is enough
+        if _trait_value(points_table, tid, high) != _trait_value(points_table, tid, low):
+            live_traits.add(tid)
+
+    signatures = {
+        hid: tuple(sorted(tid for tid in hero_traits[hid] if tid in live_traits))
+        for hid in free_pool
+    }
+
+    # Dominance cut
+    keep_limit = top_k + remaining_slots - 1
+    dominated = []
+    survivors = []
+
+    for a in free_pool:
+        dominators = 0
+        for b in free_pool:
+            if b != a and _dominates(
+                signatures[b], roster.quality[b], b,
+                signatures[a], roster.quality[a], a,
+            ):
+                dominators += 1
+                if dominators >= keep_limit:
+                    break
+
+        if dominators >= keep_limit:
+            dominated.append(a)
+        else:
+            survivors.append(a)
+
+    # Equivalence classes over the survivors
+    by_signature = {}
+    for hid in survivors:
+        by_signature.setdefault(signatures[hid], []).append(hid)
+
+    classes = [
+        (sig, sorted(members, key=lambda hid: (-roster.quality[hid], hid)))
+        for sig, members in by_signature.items()
+    ]
+
+    return {
+        "base_counts": base_counts,
+        "live_traits": live_traits,
+        "classes": classes,
+        "dominated": dominated,
+        "points_table": points_table,
+    }
+
+def _top_member_picks(members, quality, m, top_k):
+    """
+    Top-k m-subsets of one class by quality sum, best first.
+
+    Only the best m + top_k - 1 members can appear in those subsets.
+    """
+    candidates = members[:m + top_k - 1]
+    picks = [
+        (sum(quality[hid] for hid in combo), combo)
+        for combo in itertools.combinations(candidates, m)
+    ]
+    return heapq.nlargest(top_k, picks, key=lambda x: x[0])
+
+def _expand_vector(classes, vector, quality, top_k):
+    """Top-k concrete member selections for one class-count vector."""
+    selections = [(0, ())]
+
+    for (sig, members), m in zip(classes, vector):
+        if m == 0:
+            continue
+
+        picks = _top_member_picks(members, quality, m, top_k)
+
+        # top-k of a sum only needs the top-k of each part
+        merged = [
+            (q1 + q2, team1 + team2)
+            for q1, team1 in selections
+            for q2, team2 in picks
+        ]
+        selections = heapq.nlargest(top_k, merged, key=lambda x: x[0])
+
+    return [team for _, team in selections]
+
+def find_best_team_reduced(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+    model=None,
+):
+    """
+    find_best_team over hero equivalence classes instead of single heroes.
+
+    Same inputs and top-k scores as find_best_team.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in (leaves are
+                     class vectors)
+    model          : must be None or DEFAULT_SCORING (default scoring only)
+    """
+
+    require_default_scoring(model, "find_best_team_reduced")
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team_reduced")
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    reduction = reduce_free_pool(
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+    )
+
+    classes = reduction["classes"]
+    points_table = reduction["points_table"]
+    trait_counts = list(reduction["base_counts"])
+    quality = [h.quality for h in hero_index]
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    core_quality = sum(quality[hid] for hid in core_hero_ids)
+
+    # Best-quality prefix sums per class: taking m members of a class
+    # always scores best with its m best members
+    prefix_quality = []
+    for _, members in classes:
+        sums = [0]
+        for hid in members:
+            sums.append(sums[-1] + quality[hid])
+        prefix_quality.append(sums)
+
+    # Members left in classes[i:], to stop when the team can't be filled
+    capacity_suffix = [0] * (len(classes) + 1)
+    for i in range(len(classes) - 1, -1, -1):
+        capacity_suffix[i] = capacity_suffix[i + 1] + len(classes[i][1])
+
+    synergy_score = sum(points_table[tid][count] for tid, count in enumerate(trait_counts))
+    current_quality = core_quality
+
+    # MIN-HEAP of (best score, class-count vector)
+    best_vectors = []
+    vector = []
+    evaluated = 0
+    nodes = 0
+    short = 0
+    replacements = 0
+
+    def dfs(class_idx, slots_left):
+        nonlocal synergy_score, current_quality, evaluated, nodes, short, replacements, scoring_seconds
+
+        if slots_left == 0:
+            evaluated += 1
+
+            if timed:
+                scoring_start = time.perf_counter()
+
+            score = synergy_score + current_quality
+            if trait_counts[METRO_ZERO_ID] >= METRO_ZERO_THRESHOLD:
+                score += METRO_ZERO_BONUS
+            else:
+                score -= METRO_ZERO_BONUS
+
+            entry = (score, tuple(vector) + (0,) * (len(classes) - len(vector)))
+
+            if len(best_vectors) < top_k:
+                if not best_vectors and stats is not None:
+                    stats.first_result()
+                heapq.heappush(best_vectors, entry)
+            else:
+                if score > best_vectors[0][0]:
+                    heapq.heapreplace(best_vectors, entry)
+                    replacements += 1
+
+            if timed:
+                scoring_seconds += time.perf_counter() - scoring_start
+
+            return
+
+        nodes += 1
+
+        if capacity_suffix[class_idx] < slots_left:
+            short += 1
+            return
+
+        sig, members = classes[class_idx]
+        sums = prefix_quality[class_idx]
+
+        for m in range(min(len(members), slots_left), -1, -1):
+            for tid in sig:
+                count = trait_counts[tid]
+                synergy_score += points_table[tid][count + m] - points_table[tid][count]
+                trait_counts[tid] = count + m
+            current_quality += sums[m]
+            vector.append(m)
+
+            dfs(class_idx + 1, slots_left - m)
+
+            vector.pop()
+            current_quality -= sums[m]
+            for tid in sig:
+                count = trait_counts[tid]
+                synergy_score += points_table[tid][count - m] - points_table[tid][count]
+                trait_counts[tid] = count - m
+
+    dfs(0, remaining_slots)
+
+    # -----------------------------
+    # Expand winning vectors into concrete teams
+    # -----------------------------
+    if timed:
+        scoring_start = time.perf_counter()
+
+    best_heap = []
+
+    for _, class_vector in sorted(best_vectors, reverse=True):
+        for picked in _expand_vector(classes, class_vector, quality, top_k):
+            team = tuple(sorted(list(core_hero_ids) + list(picked)))
+
+            score, synergy = evaluate_team(
+                team,
+                hero_index,
+                trait_index,
+                glory_league_ids=glory_league_ids,
+                magic_crystal_ids=magic_crystal_ids,
+            )
+
+            entry = (score, team, synergy)
+
+            if len(best_heap) < top_k:
+                heapq.heappush(best_heap, entry)
+            else:
+                if score > best_heap[0][0]:
+                    heapq.heapreplace(best_heap, entry)
+
+    if stats is not None:
+        if timed:
+            scoring_seconds += time.perf_counter() - scoring_start
+        stats.nodes = nodes
+        stats.leaves = evaluated
+        stats.prune(PRUNE_CAPACITY, short)
+        stats.heap_pushes = len(best_vectors)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.extra["classes"] = len(classes)
+        stats.extra["dominated"] = len(reduction["dominated"])
+        stats.extra["live_traits"] = len(reduction["live_traits"])
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
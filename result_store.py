@@ -0,0 +1,243 @@
+"""
+Persistent on-disk store of precomputed optimizer results (single SQLite file).
+
+Rows map a normalized query signature (see cache.query_signature) to the
+top-k (score, team, synergies) tuples find_best_team returns, so results
+survive process restarts. A stored top-k also answers smaller top_k
+requests as a prefix.
+
+Warm the store offline with every legal Glory League pair x team sizes
+5-10 x single magic crystals (no core heroes):
+
+    python result_store.py warm --db results.sqlite
+
+main.py checks the store (read-only) before running a solver.
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+
+from cache import query_signature
+from helper import (
+    GLORY_LEAGUE_ALLOWED_PAIRS,
+    MAGIC_CRYSTAL_ALLOWED,
+    find_best_team_bnb,
+    get_glory_league_hid,
+    get_mcid,
+    initialize_traits_and_heroes,
+    roster_hash,
+)
+
+DEFAULT_STORE_PATH = "results.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    signature TEXT PRIMARY KEY,
+    top_k     INTEGER NOT NULL,
+    results   TEXT NOT NULL
+)
+"""
+
+def _encode_signature(signature):
+    max_team_size, core_ids, glory_league_ids, crystals, roster_key = signature
+    return json.dumps(
+        [max_team_size, list(core_ids), sorted(glory_league_ids), [list(c) for c in crystals], roster_key],
+        separators=(",", ":"),
+    )
+
+def _encode_results(results):
+    return json.dumps(
+        [[score, list(team), sorted(synergy.items())] for score, team, synergy in results],
+        separators=(",", ":"),
+    )
+
+def _decode_results(payload):
+    return [
+        (score, tuple(team), {tid: lvl for tid, lvl in synergy})
+        for score, team, synergy in json.loads(payload)
+    ]
+
+class ResultStore:
+    """
+    SQLite-backed result store.
+
+    readonly=True opens the file without write access (and fails if it
+    does not exist), which is what query-time callers should use.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, readonly=False):
+        self.path = path
+        self.readonly = readonly
+
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            self._conn = sqlite3.connect(path)
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, signature, top_k):
+        """Stored results for signature if at least top_k were stored, else None."""
+        row = self._conn.execute(
+            "SELECT top_k, results FROM results WHERE signature = ?",
+            (_encode_signature(signature),),
+        ).fetchone()
+
+        if row is None or row[0] < top_k:
+            return None
+
+        return _decode_results(row[1])[:top_k]
+
+    def put(self, signature, top_k, results, commit=True):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO results (signature, top_k, results) VALUES (?, ?, ?)",
+            (_encode_signature(signature), top_k, _encode_results(results)),
+        )
+        if commit:
+            self._conn.commit()
+
+    def lookup(
+        self,
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids=None,
+        glory_league_ids=None,
+        magic_crystal_ids=None,
+        top_k=5,
+    ):
+        """find_best_team-style lookup; returns None on a miss."""
+        signature = query_signature(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=core_hero_ids,
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+        )
+        return self.get(signature, top_k)
+
+    def warm(
+        self,
+        hero_index,
+        trait_index,
+        team_sizes=range(5, 11),
+        top_k=5,
+        solver=find_best_team_bnb,
+        progress=None,
+    ):
+        """
+        Precompute the common query space: every legal Glory League pair
+        (plus none) x team_sizes x single magic crystals (plus none).
+
+        Entries already stored with at least top_k results are skipped.
+        Returns the number of queries solved.
+
+        progress       : optional callback(done, total, max_team_size, seconds),
+                         called after every query solved
+        """
+        roster_key = roster_hash(trait_index, hero_index)
+
+        glory_league_options = [set()] + [
+            get_glory_league_hid(hero_index, [one_cost, five_cost])
+            for one_cost, five_costs in sorted(GLORY_LEAGUE_ALLOWED_PAIRS.items())
+            for five_cost in sorted(five_costs)
+        ]
+        crystal_options = [{}] + [
+            get_mcid(trait_index, [name]) for name in sorted(MAGIC_CRYSTAL_ALLOWED)
+        ]
+
+        total = len(glory_league_options) * len(team_sizes) * len(crystal_options)
+        solved = 0
+        done = 0
+
+        for max_team_size in team_sizes:
+            for glory_league_ids in glory_league_options:
+                for magic_crystal_ids in crystal_options:
+                    done += 1
+                    signature = query_signature(
+                        max_team_size,
+                        hero_index,
+                        trait_index,
+                        glory_league_ids=glory_league_ids,
+                        magic_crystal_ids=magic_crystal_ids,
+                        roster_key=roster_key,
+                    )
+
+                    if self.get(signature, top_k) is not None:
+                        continue
+
+                    start = time.perf_counter()
+                    results = solver(
+                        max_team_size,
+                        hero_index,
+                        trait_index,
+                        glory_league_ids=glory_league_ids,
+                        magic_crystal_ids=magic_crystal_ids,
+                        top_k=top_k,
+                    )
+                    self.put(signature, top_k, results)
+                    solved += 1
+
+                    if progress is not None:
+                        progress(done, total, max_team_size, time.perf_counter() - start)
+
+        return solved
+
+def _parse_sizes(text):
+    if "-" in text:
+        low, high = text.split("-", 1)
+        return range(int(low), int(high) + 1)
+    return [int(size) for size in text.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent optimizer result store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    warm_parser = sub.add_parser("warm", help="precompute the common query space")
+    warm_parser.add_argument("--db", default=DEFAULT_STORE_PATH)
+    warm_parser.add_argument("--sizes", default="5-10", help="e.g. 5-10 or 7,8,9")
+    warm_parser.add_argument("--top-k", type=int, default=5)
+
+    info_parser = sub.add_parser("info", help="show how many queries are stored")
+    info_parser.add_argument("--db", default=DEFAULT_STORE_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "warm":
+        from heroes_and_traits import traits, heroes
+
+        traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+
+        with ResultStore(args.db) as store:
+            solved = store.warm(
+                hero_index,
+                traits_index,
+                team_sizes=_parse_sizes(args.sizes),
+                top_k=args.top_k,
+                progress=lambda done, total, size, seconds: print(
+                    f"[{done}/{total}] size {size} solved in {seconds:.2f}s"
+                ),
+            )
+            print(f"Solved {solved:,} queries, {len(store):,} stored in {args.db}")
+
+    elif args.command == "info":
+        with ResultStore(args.db, readonly=True) as store:
+            print(f"{len(store):,} queries stored in {args.db}")
+
+if __name__ == "__main__":
+    main()
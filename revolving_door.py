@@ -0,0 +1,264 @@
+"""
+Minimal-change enumeration for find_best_team(engine="revolving") and
+find_best_team_m0_enforced(engine="revolving").
+
+itertools.combinations can change several heroes between two teams, so
+the reference solvers build and rescore every team from scratch. Here
+teams are visited in revolving-door order (Knuth, TAOCP 7.2.1.3,
+Algorithm R): every team differs from the previous one by exactly one
+swap, one hero out and one hero in. Trait counts, the quality sum, the
+Metro Zero count and the synergy score are updated by that one remove
+and one add, so visiting a team costs a few table lookups, with no
+sort, no tuple and no Counter.
+
+Teams are only built when they enter the top-k heap, and are then
+rescored with evaluate_team, so entries are exactly what find_best_team
+returns. Teams with equal scores may be a different (equally scored)
+choice, since the visiting order differs.
+"""
+
+import heapq
+import time
+
+from helper import (
+    METRO_ZERO_BONUS,
+    METRO_ZERO_THRESHOLD,
+    compile_roster,
+    evaluate_team,
+    query_hero_traits,
+    trait_tables,
+)
+from stats import PRUNE_METRO_ZERO
+
+def revolving_door(n, k):
+    """
+    Swaps (out, in) visiting every k-subset of range(n) once, starting from
+    range(k): C(n, k) - 1 swaps, each removing one item and adding one.
+    """
+    if k <= 0 or k >= n:
+        return   # a single subset, nothing to swap
+
+    # c[0] < c[1] < ... < c[k - 1] is the current subset, c[k] = n a sentinel
+    c = list(range(k)) + [n]
+    odd = k % 2 == 1
+
+    while True:
+        # Easy case: move the smallest item
+        if odd:
+            if c[0] + 1 < c[1]:
+                yield c[0], c[0] + 1
+                c[0] += 1
+                continue
+            j, decrease = 1, True
+        else:
+            if c[0] > 0:
+                yield c[0], c[0] - 1
+                c[0] -= 1
+                continue
+            j, decrease = 1, False
+
+        # Otherwise the first c[j] that can move, alternating direction
+        while True:
+            if j >= k:
+                return
+
+            if decrease:
+                if c[j] >= j + 1:
+                    out, new = c[j], j - 1
+                    c[j] = c[j - 1]
+                    c[j - 1] = j - 1
+                    yield out, new
+                    break
+            elif c[j] + 1 < c[j + 1]:
+                out, new = c[j - 1], c[j] + 1
+                c[j - 1] = c[j]
+                c[j] += 1
+                yield out, new
+                break
+
+            j += 1
+            decrease = not decrease
+
+def find_best_team_revolving(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    metro_zero_only=False,
+    stats=None,
+):
+    """
+    Revolving-door find_best_team. Same inputs and scores.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    metro_zero_only: only enumerate teams with Metro Zero active, like
+                     find_best_team_m0_enforced (Metro Zero heroes and the
+                     others are walked as two nested revolving doors)
+    stats          : optional stats.SolverStats to fill in
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    name = "find_best_team_m0_enforced[revolving]" if metro_zero_only else "find_best_team[revolving]"
+    if stats is not None:
+        stats.start(name)
+    timed = stats is not None and stats.time_split
+    scoring_seconds = 0.0
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    metro_flags = roster.metro_zero
+
+    free_pool = [h for h in range(len(hero_index)) if h not in core_hero_ids]
+    remaining_slots = max_team_size - len(core_hero_ids)
+
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    points_table, _ = trait_tables(trait_index, max_count)
+
+    # -----------------------------
+    # Incremental state
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    synergy = 0
+    quality = 0
+    metro = 0
+    in_team = [False] * len(hero_index)
+
+    def add_hero(hid):
+        nonlocal synergy, quality, metro
+        for tid in hero_traits[hid]:
+            count = trait_counts[tid]
+            synergy += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+        quality += roster.quality[hid]
+        metro += metro_flags[hid]
+        in_team[hid] = True
+
+    def remove_hero(hid):
+        nonlocal synergy, quality, metro
+        for tid in hero_traits[hid]:
+            count = trait_counts[tid]
+            synergy += points_table[tid][count - 1] - points_table[tid][count]
+            trait_counts[tid] = count - 1
+        quality -= roster.quality[hid]
+        metro -= metro_flags[hid]
+        in_team[hid] = False
+
+    for hid in core_hero_ids:
+        add_hero(hid)
+    for tid, bonus in magic_crystal_ids.items():
+        for _ in range(bonus):
+            count = trait_counts[tid]
+            synergy += points_table[tid][count + 1] - points_table[tid][count]
+            trait_counts[tid] = count + 1
+
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    best_heap = []
+    evaluated = 0
+    replacements = 0
+
+    def visit():
+        """Score the current team; build it only if it enters the heap."""
+        nonlocal evaluated, replacements
+        evaluated += 1
+
+        score = synergy + quality
+        if metro >= METRO_ZERO_THRESHOLD:
+            score += METRO_ZERO_BONUS
+        else:
+            score -= METRO_ZERO_BONUS
+
+        if len(best_heap) < top_k or score > best_heap[0][0]:
+            team = tuple(sorted(core_hero_ids + [hid for hid in free_pool if in_team[hid]]))
+            score, synergy_info = evaluate_team(
+                team,
+                hero_index,
+                trait_index,
+                glory_league_ids=glory_league_ids,
+                magic_crystal_ids=magic_crystal_ids,
+            )
+            entry = (score, team, synergy_info)
+
+            if len(best_heap) < top_k:
+                if not best_heap and stats is not None:
+                    stats.first_result()
+                heapq.heappush(best_heap, entry)
+            else:
+                heapq.heapreplace(best_heap, entry)
+                replacements += 1
+
+    def walk(pool, k):
+        """Visit every k-subset of pool added to the current team, then remove it."""
+        for hid in pool[:k]:
+            add_hero(hid)
+        visit()
+
+        for out, new in revolving_door(len(pool), k):
+            remove_hero(pool[out])
+            add_hero(pool[new])
+            visit()
+
+        for hid in pool:
+            if in_team[hid]:
+                remove_hero(hid)
+
+    if timed:
+        scoring_start = time.perf_counter()
+
+    if not metro_zero_only:
+        if remaining_slots <= len(free_pool):
+            walk(free_pool, remaining_slots)
+    else:
+        metro_free = [h for h in free_pool if metro_flags[h]]
+        non_metro_free = [h for h in free_pool if not metro_flags[h]]
+        required_metro = max(0, METRO_ZERO_THRESHOLD - metro)
+
+        if required_metro > len(metro_free) and stats is not None:
+            stats.prune(PRUNE_METRO_ZERO)
+
+        for k in range(required_metro, min(len(metro_free), remaining_slots) + 1):
+            rest = remaining_slots - k
+            if rest > len(non_metro_free):
+                continue
+
+            # Outer door over Metro Zero heroes, full inner door per step
+            for hid in metro_free[:k]:
+                add_hero(hid)
+            walk(non_metro_free, rest)
+
+            for out, new in revolving_door(len(metro_free), k):
+                remove_hero(metro_free[out])
+                add_hero(metro_free[new])
+                walk(non_metro_free, rest)
+
+            for hid in metro_free:
+                if in_team[hid]:
+                    remove_hero(hid)
+
+    if timed:
+        scoring_seconds = time.perf_counter() - scoring_start
+
+    if stats is not None:
+        stats.leaves = evaluated
+        stats.heap_pushes = len(best_heap)
+        stats.heap_replacements = replacements
+        stats.scoring_seconds = scoring_seconds
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
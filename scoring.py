@@ -0,0 +1,258 @@
+"""
+Scoring profiles: the same query scored under several ScoringModels.
+
+    aggressive = ScoringModel(trait_weights={marksman_id: 15}, name="aggressive")
+    safe = ScoringModel(quality_weight=2, mandatory=DEFAULT_SCORING.mandatory, name="safe")
+
+    per_model = find_best_team_profiles(9, hero_index, traits_index, [DEFAULT_SCORING, aggressive, safe])
+    scores = score_profiles(teams, hero_index, traits_index, [aggressive, safe])
+
+Models are compiled once (ScoringModel.compile) into flat per-trait /
+per-hero tables. Trait counts only depend on the team, not on the model,
+so they are computed once per team and looked up in every profile's tables.
+"""
+
+import heapq
+from collections import Counter
+
+from helper import (
+    bnb_pool_order,
+    compile_roster,
+    compile_scoring,
+    gain_ratio_tables,
+    mandatory_suffixes,
+    query_hero_traits,
+    trait_tables,
+)
+from stats import PRUNE_BOUND, PRUNE_CAPACITY
+
+def score_profiles(teams, hero_index, trait_index, models, glory_league_ids=None, magic_crystal_ids=None):
+    """
+    Scores of every team under every model: one list of len(models) scores
+    per team, each equal to evaluate_team(team, ..., model=model)[0].
+    """
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    compiled = [compile_scoring(model, trait_index, hero_index) for model in models]
+    hero_traits = query_hero_traits(compile_roster(trait_index, hero_index), glory_league_ids)
+
+    rows = []
+    for team in teams:
+        trait_counter = Counter(magic_crystal_ids)
+        for hid in team:
+            trait_counter.update(hero_traits[hid])
+
+        row = []
+        for scoring in compiled:
+            score = sum(scoring.quality[hid] for hid in team)
+            for tid, count in trait_counter.items():
+                points = scoring.points_by_count[tid]
+                score += points[min(count, len(points) - 1)]
+            row.append(score + scoring.mandatory_term(trait_counter))
+        rows.append(row)
+
+    return rows
+
+def find_best_team_profiles(
+    max_team_size,
+    hero_index,
+    trait_index,
+    models,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+):
+    """
+    Top-k teams under each model in one branch-and-bound pass. Same scores
+    as find_best_team_bnb(..., model=model) for every model.
+
+    One DFS over shared trait counts, with per-profile synergy / quality
+    sums, top-k heap and bound. A profile drops out of a subtree as soon as
+    its bound can't beat its k-th best score, and the subtree is left when
+    no profile is still active.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    models         : ScoringModels / CompiledScorings (None = DEFAULT_SCORING)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+
+    Returns one sorted result list per model.
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    if stats is not None:
+        stats.start("find_best_team_profiles")
+
+    roster = compile_roster(trait_index, hero_index)
+    hero_traits = query_hero_traits(roster, glory_league_ids)
+    compiled = [compile_scoring(model, trait_index, hero_index) for model in models]
+    profiles = range(len(compiled))
+
+    free_pool = [h.id for h in hero_index if h.id not in core_hero_ids]
+    dfs_pool = bnb_pool_order(hero_index, free_pool)
+    pool_size = len(dfs_pool)
+    pool_traits = [hero_traits[hid] for hid in dfs_pool]
+
+    remaining_slots = max_team_size - len(core_hero_ids)
+    max_count = 2 * max_team_size + sum(magic_crystal_ids.values())
+    _, reached_table = trait_tables(trait_index, max_count)
+
+    # Per-profile tables
+    points_tables = [scoring.points_table(max_count) for scoring in compiled]
+    ratio_tables = [gain_ratio_tables(points, max(remaining_slots, 1)) for points in points_tables]
+    pool_quality = [[scoring.quality[hid] for hid in dfs_pool] for scoring in compiled]
+    mandatory = [mandatory_suffixes(scoring, pool_traits) for scoring in compiled]
+
+    trait_ids_range = range(roster.num_traits)
+
+    # -----------------------------
+    # Incremental state (trait counts shared, scores per profile)
+    # -----------------------------
+    trait_counts = [0] * roster.num_traits
+    synergy = [0] * len(compiled)
+    quality = [0] * len(compiled)
+    team = []
+
+    def add_traits(tids):
+        for tid in tids:
+            count = trait_counts[tid]
+            for p in profiles:
+                points = points_tables[p][tid]
+                synergy[p] += points[count + 1] - points[count]
+            trait_counts[tid] = count + 1
+
+    def remove_traits(tids):
+        for tid in tids:
+            count = trait_counts[tid]
+            for p in profiles:
+                points = points_tables[p][tid]
+                synergy[p] += points[count - 1] - points[count]
+            trait_counts[tid] = count - 1
+
+    for hid in core_hero_ids:
+        add_traits(hero_traits[hid])
+        team.append(hid)
+        for p in profiles:
+            quality[p] += compiled[p].quality[hid]
+
+    for tid, bonus in magic_crystal_ids.items():
+        for _ in range(bonus):
+            add_traits((tid,))
+
+    # -----------------------------
+    # Result tracking
+    # -----------------------------
+    heaps = [[] for _ in profiles]
+    evaluated = 0
+    nodes = 0
+    pruned = 0
+    short = 0
+
+    def upper_bound(p, start_idx, slots_left):
+        """find_best_team_bnb's bound, with profile p's tables."""
+        gain_ratio_table = ratio_tables[p]
+        ratio = [gain_ratio_table[tid][trait_counts[tid]][slots_left] for tid in trait_ids_range]
+        qualities = pool_quality[p]
+
+        gains = [
+            qualities[i] + sum(ratio[tid] for tid in pool_traits[i])
+            for i in range(start_idx, pool_size)
+        ]
+
+        bound = synergy[p] + quality[p] + sum(heapq.nlargest(slots_left, gains))
+        for tid, min_count, bonus, penalty, remaining_suffix, per_carrier in mandatory[p]:
+            reachable = trait_counts[tid] + min(slots_left * per_carrier, remaining_suffix[start_idx])
+            bound += max(bonus, penalty) if reachable >= min_count else penalty
+
+        return bound
+
+    def dfs(active, start_idx, slots_left):
+        nonlocal evaluated, nodes, pruned, short
+
+        # Leaf
+        if slots_left == 0:
+            evaluated += 1
+
+            synergy_info = None
+            for p in active:
+                score = synergy[p] + quality[p]
+                for tid, min_count, bonus, penalty, _, _ in mandatory[p]:
+                    score += bonus if trait_counts[tid] >= min_count else penalty
+
+                best_heap = heaps[p]
+                if len(best_heap) < top_k or score > best_heap[0][0]:
+                    if synergy_info is None:
+                        synergy_info = {
+                            tid: reached_table[tid][count]
+                            for tid, count in enumerate(trait_counts)
+                            if reached_table[tid][count]
+                        }
+                    entry = (score, tuple(sorted(team)), synergy_info)
+
+                    if len(best_heap) < top_k:
+                        if stats is not None and not any(heaps):
+                            stats.first_result()
+                        heapq.heappush(best_heap, entry)
+                    else:
+                        heapq.heapreplace(best_heap, entry)
+            return
+
+        nodes += 1
+
+        # Not enough heroes left to fill the team
+        if pool_size - start_idx < slots_left:
+            short += 1
+            return
+
+        # Bound cut, per profile
+        still_active = [
+            p for p in active
+            if len(heaps[p]) < top_k
+            or int(upper_bound(p, start_idx, slots_left) + 1e-9) > heaps[p][0][0]
+        ]
+        if not still_active:
+            pruned += 1
+            return
+
+        # Expand
+        for i in range(start_idx, pool_size - slots_left + 1):
+            tids = pool_traits[i]
+
+            team.append(dfs_pool[i])
+            add_traits(tids)
+            for p in profiles:
+                quality[p] += pool_quality[p][i]
+
+            dfs(still_active, i + 1, slots_left - 1)
+
+            team.pop()
+            remove_traits(tids)
+            for p in profiles:
+                quality[p] -= pool_quality[p][i]
+
+    dfs(list(profiles), 0, remaining_slots)
+
+    if stats is not None:
+        stats.nodes += nodes
+        stats.leaves += evaluated
+        stats.prune(PRUNE_BOUND, pruned)
+        stats.prune(PRUNE_CAPACITY, short)
+        stats.heap_pushes += sum(len(best_heap) for best_heap in heaps)
+        stats.extra["profiles"] = len(compiled)
+        stats.finish()
+
+    return [sorted(best_heap, reverse=True, key=lambda x: x[0]) for best_heap in heaps]
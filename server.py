@@ -0,0 +1,394 @@
+"""
+Persistent local optimizer server (asyncio, localhost only).
+
+Loads the roster once, keeps a result cache warm and runs searches in a
+pool of worker processes, so the event loop stays free to accept requests
+while a search is running.
+
+    python server.py --port 8765
+    python server.py --unix /tmp/mcgg.sock
+
+    curl -s localhost:8765/query -d '{"size": 9, "core_heroes": ["Irithel", "Hanabi"],
+        "glory_league": ["Kula", "Benedetta"], "magic_crystals": ["Marksman"], "top_k": 5}'
+
+Endpoints
+---------
+POST /query    JSON query in the benchmark scenario format, plus an optional
+               "timeout" in seconds (default --timeout)
+GET  /health   {"ok": true}
+GET  /stats    cache and request counters
+
+A malformed query (unknown names, a bad "size", "top_k" or "timeout")
+answers 400, a search that raises in its worker answers 500.
+
+Searches run find_best_team_anytime with the request timeout as its time
+budget: a search that runs out of time answers with its best teams so far,
+"proven": false and the optimality gap. Only proven answers are cached.
+If the client disconnects while its search is running, the search is told
+to stop (through a shared-memory flag the worker checks at every node) and
+its worker is freed for the next request.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+from anytime import find_best_team_anytime
+from batch import resolve_query
+from cache import QueryCache, query_signature
+from helper import initialize_traits_and_heroes, roster_hash
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 10.0
+MAX_BODY_BYTES = 64 * 1024
+
+# Extra seconds on top of the search budget before a request is answered 504
+TIMEOUT_GRACE = 5.0
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+    504: "Gateway Timeout",
+}
+
+# -----------------------------
+# Worker processes
+# -----------------------------
+# Per-process state set once by _init_worker
+_worker_state = {}
+
+def _init_worker(hero_index, trait_index, cancel_flags):
+    # Ctrl+C is for the server process, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_state["hero_index"] = hero_index
+    _worker_state["trait_index"] = trait_index
+    _worker_state["cancel_flags"] = cancel_flags
+
+def _ready():
+    return True
+
+def _run_query(slot, max_team_size, query, time_budget):
+    """One search in a worker; returns (results, status)."""
+    cancel_flags = _worker_state["cancel_flags"]
+    return find_best_team_anytime(
+        max_team_size,
+        _worker_state["hero_index"],
+        _worker_state["trait_index"],
+        time_budget=time_budget,
+        should_stop=lambda: cancel_flags[slot],
+        **query,
+    )
+
+# -----------------------------
+# Server
+# -----------------------------
+class OptimizerServer:
+    """
+    Usage
+    -----
+    server = OptimizerServer(hero_index, traits_index, workers=2)
+    asyncio.run(server.serve(port=8765))
+    """
+
+    def __init__(self, hero_index, trait_index, workers=1, timeout=DEFAULT_TIMEOUT, cache_size=1024):
+        if workers < 1:
+            raise ValueError("OptimizerServer needs at least 1 worker.")
+
+        self.hero_index = hero_index
+        self.trait_index = trait_index
+        self.workers = workers
+        self.timeout = timeout
+
+        self.cache = QueryCache(maxsize=cache_size, solver=None)
+        self._roster_key = roster_hash(trait_index, hero_index)
+
+        # One cancel flag per worker slot, shared with the worker processes
+        self._cancel_flags = multiprocessing.Array("b", workers, lock=False)
+        self._free_slots = None
+        self._executor = None
+
+        self.requests = 0
+        self.searches = 0
+        self.cancelled = 0
+        self.timeouts = 0
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self):
+        # Spawned, not forked: a forked worker would inherit the open client
+        # sockets and keep connections alive after the server closes them
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.hero_index, self.trait_index, self._cancel_flags),
+        )
+
+        # Start every worker now, so the first queries don't pay for it
+        for future in [self._executor.submit(_ready) for _ in range(self.workers)]:
+            future.result()
+
+        self._free_slots = asyncio.Queue()
+        for slot in range(self.workers):
+            self._free_slots.put_nowait(slot)
+
+    def close(self):
+        if self._executor is not None:
+            for slot in range(self.workers):
+                self._cancel_flags[slot] = 1
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def serve(self, port=DEFAULT_PORT, unix_path=None, ready=None):
+        """
+        Serve until cancelled. ready, if given, is called with the bound
+        address once the server accepts connections.
+        """
+        self.start()
+        try:
+            # SIGTERM stops the server like Ctrl+C, so the pool is shut down
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+            except (NotImplementedError, RuntimeError):
+                pass   # no signal handlers on this platform / thread
+
+            if unix_path is not None:
+                server = await asyncio.start_unix_server(self.handle, path=unix_path)
+                address = unix_path
+            else:
+                server = await asyncio.start_server(self.handle, HOST, port)
+                address = server.sockets[0].getsockname()[:2]
+
+            if ready is not None:
+                ready(address)
+
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "searches": self.searches,
+            "cancelled": self.cancelled,
+            "timeouts": self.timeouts,
+            "workers": self.workers,
+            "cache": self.cache.stats(),
+        }
+
+    # -----------------------------
+    # HTTP
+    # -----------------------------
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request = await self._read_request(reader)
+            except ValueError as exc:
+                await self._respond(writer, 400, {"error": str(exc)})
+                return
+
+            if request is None:
+                return
+
+            method, path, body = request
+            self.requests += 1
+
+            if path == "/health":
+                await self._respond(writer, 200, {"ok": True})
+            elif path == "/stats":
+                await self._respond(writer, 200, self.stats())
+            elif path != "/query":
+                await self._respond(writer, 404, {"error": f"Unknown path: {path}"})
+            elif method != "POST":
+                await self._respond(writer, 405, {"error": "Use POST /query"})
+            else:
+                status, payload = await self._query(body, reader)
+                if status is not None:
+                    await self._respond(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader):
+        """(method, path, body bytes), or None if the client sent nothing."""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise ValueError(f"Bad request line: {lines[0]!r}") from None
+
+        length = 0
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value.strip())
+
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Request body over {MAX_BODY_BYTES} bytes.")
+
+        body = await reader.readexactly(length) if length else b""
+        return method, path.split("?", 1)[0], body
+
+    async def _respond(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    async def _query(self, body, reader):
+        """(HTTP status, JSON payload), or (None, None) if the client left."""
+        try:
+            spec = json.loads(body or b"{}")
+            if not isinstance(spec, dict) or "size" not in spec:
+                raise ValueError('Query must be a JSON object with at least "size".')
+
+            max_team_size, query = resolve_query(spec, self.hero_index, self.trait_index)
+            timeout = float(spec.get("timeout", self.timeout))
+
+            # bool is an int subclass, but {"size": true} is not a team size
+            if type(max_team_size) is not int or not 1 <= max_team_size <= len(self.hero_index):
+                raise ValueError(f'"size" must be an integer from 1 to {len(self.hero_index)}.')
+
+            if type(query["top_k"]) is not int or query["top_k"] < 1:
+                raise ValueError('"top_k" must be a positive integer.')
+
+            if not timeout > 0:
+                raise ValueError('"timeout" must be a positive number of seconds.')
+
+            if len(query["core_hero_ids"]) > max_team_size:
+                raise ValueError(
+                    f"Core heroes ({len(query['core_hero_ids'])}) exceed team size ({max_team_size})."
+                )
+        except (ValueError, TypeError, KeyError) as exc:
+            return 400, {"error": str(exc)}
+
+        signature = query_signature(
+            max_team_size,
+            self.hero_index,
+            self.trait_index,
+            core_hero_ids=query["core_hero_ids"],
+            glory_league_ids=query["glory_league_ids"],
+            magic_crystal_ids=query["magic_crystal_ids"],
+            roster_key=self._roster_key,
+        )
+
+        cached = self.cache.get(signature, query["top_k"])
+        if cached is not None:
+            self.cache.hits += 1
+            return 200, self._payload(cached, {"proven": True, "gap": 0, "elapsed": 0.0}, cached=True)
+
+        self.cache.misses += 1
+
+        slot = await self._free_slots.get()
+        try:
+            self._cancel_flags[slot] = 0
+            self.searches += 1
+
+            search = asyncio.get_running_loop().run_in_executor(
+                self._executor, _run_query, slot, max_team_size, query, timeout
+            )
+            hangup = asyncio.ensure_future(reader.read(1))
+
+            done, _ = await asyncio.wait(
+                {search, hangup},
+                timeout=timeout + TIMEOUT_GRACE,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            # Extra bytes after the request are not a hangup, only EOF is
+            if hangup in done and search not in done and hangup.result():
+                done, _ = await asyncio.wait({search}, timeout=timeout + TIMEOUT_GRACE)
+
+            if search not in done:
+                # Client gone (EOF) or search overran its budget: stop it
+                self._cancel_flags[slot] = 1
+                hangup.cancel()
+                await asyncio.wait({search})
+
+                if hangup in done and not hangup.result():
+                    self.cancelled += 1
+                    return None, None
+
+                self.timeouts += 1
+                return 504, {"error": f"Search did not finish within {timeout + TIMEOUT_GRACE:g}s."}
+
+            hangup.cancel()
+
+            # A search that raised answers with its error, not a closed socket
+            try:
+                results, status = search.result()
+            except Exception as exc:
+                return 500, {"error": f"Search failed: {type(exc).__name__}: {exc}"}
+        finally:
+            self._free_slots.put_nowait(slot)
+
+        if status["proven"]:
+            self.cache.put(signature, query["top_k"], results)
+        else:
+            self.timeouts += 1
+
+        return 200, self._payload(results, status, cached=False)
+
+    def _payload(self, results, status, cached):
+        return {
+            "results": [
+                {
+                    "score": score,
+                    "heroes": [self.hero_index[hid].name for hid in team],
+                    "synergies": {self.trait_index[tid].name: level for tid, level in synergies.items()},
+                }
+                for score, team, synergies in results
+            ],
+            "proven": status["proven"],
+            "gap": status["gap"],
+            "seconds": round(status["elapsed"], 6),
+            "cached": cached,
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local optimizer server (localhost only).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="serve on this Unix socket path instead of TCP")
+    parser.add_argument("--workers", type=int, default=1, help="search worker processes")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="default search budget in seconds")
+    args = parser.parse_args(argv)
+
+    from heroes_and_traits import traits, heroes
+
+    traits_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+    server = OptimizerServer(hero_index, traits_index, workers=args.workers, timeout=args.timeout)
+
+    try:
+        asyncio.run(server.serve(
+            port=args.port,
+            unix_path=args.unix,
+            ready=lambda address: print(f"Listening on {address}"),
+        ))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+Stateful optimizer session for re-querying as the board changes mid-match.
+
+Every shop roll changes the query a little: one more core hero, a new
+crystal, a Glory League pick, a bigger team. A session keeps the last
+answer and applies those deltas to it instead of starting from scratch:
+
+    session = OptimizerSession(hero_index, traits_index, max_team_size=9)
+    session.add_core("Irithel")
+    session.add_crystal("Marksman")
+    results = session.best_teams()
+    session.set_team_size(10)
+    results = session.best_teams()
+
+best_teams() answers in the cheapest way that is still exact:
+
+1. cache    the same query was solved earlier in the session
+2. reuse    the new query only added core heroes and every previous top-k
+            team already has them: those teams are still the top-k
+3. seeded   the previous top-k teams are repaired to fit the new query
+            (core heroes swapped in, heroes added / dropped for the new
+            size) and rescored. k distinct repaired teams prove a k-th best
+            score, which find_best_team_bnb's search starts from as its
+            cutoff instead of filling its heap from nothing
+4. cold     nothing to start from (first query)
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty).
+"""
+
+import heapq
+from collections import Counter, OrderedDict
+from types import SimpleNamespace
+
+from cache import _copy_results, query_signature
+from helper import (
+    _bnb_search,
+    evaluate_team,
+    get_glory_league_hid,
+    get_hid,
+    get_mcid,
+    roster_hash,
+)
+
+class OptimizerSession:
+    """
+    One match's board, updated in place by deltas.
+
+    Heroes and crystals are given by name, like get_core_hid / get_mcid.
+    Deltas are validated and applied immediately; the search only runs when
+    best_teams() is called, so several deltas between two queries cost one
+    search.
+    """
+
+    def __init__(
+        self,
+        hero_index,
+        trait_index,
+        max_team_size,
+        core_hero_ids=None,
+        glory_league_ids=None,
+        magic_crystal_ids=None,
+        top_k=5,
+        history=64,
+    ):
+        """
+        max_team_size  : final team size (ex: 5, 6, 7)
+        core_hero_ids  : list of hero IDs that must be in the team
+        history        : solved queries kept for instant answers (LRU, 0 keeps none)
+        """
+        self.hero_index = hero_index
+        self.trait_index = trait_index
+        self.top_k = top_k
+
+        self.core_hero_ids = list(core_hero_ids or [])
+        self.glory_league_ids = set(glory_league_ids or ())
+        self.magic_crystal_ids = dict(magic_crystal_ids or {})
+
+        self._check_team_size(max_team_size)
+        self.max_team_size = max_team_size
+
+        if history < 0:
+            raise ValueError("Session history must be 0 or more.")
+
+        self._roster_key = roster_hash(trait_index, hero_index)
+
+        # signature -> results of the queries solved so far, oldest first
+        self.history = history
+        self._history = OrderedDict()
+
+        # Last solved query and its results, the starting point for the next one
+        self._previous_query = None
+        self._previous = None
+
+    # -----------------------------
+    # Deltas
+    # -----------------------------
+    def add_core(self, hero_name):
+        hid = get_hid(self.hero_index, hero_name)
+
+        if hid in self.core_hero_ids:
+            raise ValueError(f"{self.hero_index[hid].name} is already a core hero.")
+
+        if len(self.core_hero_ids) >= self.max_team_size:
+            raise ValueError(
+                f"Core heroes ({len(self.core_hero_ids) + 1}) exceed team size ({self.max_team_size})."
+            )
+
+        self.core_hero_ids.append(hid)
+
+    def remove_core(self, hero_name):
+        hid = get_hid(self.hero_index, hero_name)
+
+        if hid not in self.core_hero_ids:
+            raise ValueError(f"{self.hero_index[hid].name} is not a core hero.")
+
+        self.core_hero_ids.remove(hid)
+
+    def add_crystal(self, trait_name):
+        for tid, bonus in get_mcid(self.trait_index, [trait_name]).items():
+            self.magic_crystal_ids[tid] = self.magic_crystal_ids.get(tid, 0) + bonus
+
+    def remove_crystal(self, trait_name):
+        for tid, bonus in get_mcid(self.trait_index, [trait_name]).items():
+            if tid not in self.magic_crystal_ids:
+                raise ValueError(f"No {self.trait_index[tid].name} magic crystal to remove.")
+
+            self.magic_crystal_ids[tid] -= bonus
+            if self.magic_crystal_ids[tid] <= 0:
+                del self.magic_crystal_ids[tid]
+
+    def set_glory_league(self, hero_names=None):
+        """Set this match's Glory League pair (None or [] disables it)."""
+        self.glory_league_ids = get_glory_league_hid(self.hero_index, hero_names)
+
+    def set_team_size(self, max_team_size):
+        self._check_team_size(max_team_size)
+        self.max_team_size = max_team_size
+
+    def _check_team_size(self, max_team_size):
+        if len(self.core_hero_ids) > max_team_size:
+            raise ValueError(
+                f"Core heroes ({len(self.core_hero_ids)}) exceed team size ({max_team_size})."
+            )
+
+        if max_team_size > len(self.hero_index):
+            raise ValueError(
+                f"Team size ({max_team_size}) exceeds the roster ({len(self.hero_index)} heroes)."
+            )
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def query(self):
+        """Current board as find_best_team keyword arguments."""
+        return dict(
+            core_hero_ids=list(self.core_hero_ids),
+            glory_league_ids=set(self.glory_league_ids),
+            magic_crystal_ids=dict(self.magic_crystal_ids),
+            top_k=self.top_k,
+        )
+
+    def best_teams(self, stats=None):
+        """
+        Top-k teams for the current board, same results as find_best_team.
+
+        stats          : optional stats.SolverStats to fill in; extra["warm_start"]
+                         says how the answer was found (cache / reuse / seeded / cold)
+        """
+        if stats is not None:
+            stats.start("OptimizerSession")
+
+        query = self.query()
+        signature = query_signature(
+            self.max_team_size,
+            self.hero_index,
+            self.trait_index,
+            core_hero_ids=query["core_hero_ids"],
+            glory_league_ids=query["glory_league_ids"],
+            magic_crystal_ids=query["magic_crystal_ids"],
+            roster_key=self._roster_key,
+        )
+
+        results = self._recall(signature)
+        if results is not None:
+            how = "cache"
+        else:
+            results, how = self._solve(query, stats)
+            self._remember(signature, results)
+
+        self._previous_query = (self.max_team_size, query)
+        self._previous = results
+
+        if stats is not None:
+            stats.extra["warm_start"] = how
+            stats.finish()
+
+        return list(results)
+
+    # -----------------------------
+    # History
+    # -----------------------------
+    def _recall(self, signature):
+        """Results of an earlier query with this signature and top_k, or None."""
+        entry = self._history.get(signature)
+
+        if entry is None or entry[0] < self.top_k:
+            return None
+
+        self._history.move_to_end(signature)
+        return _copy_results(entry[1][:self.top_k])
+
+    def _remember(self, signature, results):
+        if not self.history:
+            return
+
+        self._history[signature] = (self.top_k, _copy_results(results))
+        self._history.move_to_end(signature)
+
+        while len(self._history) > self.history:
+            self._history.popitem(last=False)
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+    def _solve(self, query, stats):
+        if self._previous is None:
+            return self._search(query, [], stats), "cold"
+
+        if self._still_top(query):
+            return list(self._previous), "reuse"
+
+        seeds = self._seed_teams(query)
+        if stats is not None:
+            stats.extra["seeds"] = len(seeds)
+
+        return self._search(query, seeds, stats), "seeded"
+
+    def _still_top(self, query):
+        """
+        True if the previous top-k is exactly the current top-k: only core
+        heroes were added (every current team was also a candidate before,
+        scored the same) and every previous top team has all of them.
+        """
+        previous_size, previous = self._previous_query
+
+        if (
+            previous_size != self.max_team_size
+            or previous["top_k"] < self.top_k
+            or previous["glory_league_ids"] != query["glory_league_ids"]
+            or previous["magic_crystal_ids"] != query["magic_crystal_ids"]
+        ):
+            return False
+
+        if Counter(previous["core_hero_ids"]) - Counter(query["core_hero_ids"]):
+            return False   # a core hero was removed: more teams to consider
+
+        cores = Counter(query["core_hero_ids"])
+        return all(not cores - Counter(team) for _, team, _ in self._previous)
+
+    # -----------------------------
+    # Warm start
+    # -----------------------------
+    def _score(self, team, query):
+        return evaluate_team(
+            team,
+            self.hero_index,
+            self.trait_index,
+            glory_league_ids=query["glory_league_ids"],
+            magic_crystal_ids=query["magic_crystal_ids"],
+        )
+
+    def _repair(self, team, query):
+        """
+        Turn a previous top team into a valid team for the current query:
+        keep the current core heroes, keep as many of its other heroes as fit,
+        then greedily drop the least useful / add the most useful heroes
+        until it has the current team size.
+        """
+        missing = Counter(query["core_hero_ids"])
+        kept = []
+        for hid in team:
+            if missing[hid]:
+                missing[hid] -= 1
+            else:
+                kept.append(hid)
+
+        cores = list(query["core_hero_ids"])
+
+        while len(cores) + len(kept) > self.max_team_size:
+            drop = max(
+                range(len(kept)),
+                key=lambda i: self._score(cores + kept[:i] + kept[i + 1:], query)[0],
+            )
+            kept.pop(drop)
+
+        while len(cores) + len(kept) < self.max_team_size:
+            members = set(cores) | set(kept)
+            kept.append(max(
+                (h.id for h in self.hero_index if h.id not in members),
+                key=lambda hid: self._score(cores + kept + [hid], query)[0],
+            ))
+
+        return tuple(sorted(cores + kept))
+
+    def _seed_teams(self, query):
+        """Distinct repaired previous teams, rescored for the current query."""
+        teams = {self._repair(team, query) for _, team, _ in self._previous}
+
+        seeds = []
+        for team in teams:
+            score, synergy = self._score(team, query)
+            seeds.append((score, team, synergy))
+
+        return seeds
+
+    def _search(self, query, seeds, stats):
+        # k distinct seed teams prove the k-th best score is at least their
+        # k-th best, so the search can cut anything that can't beat it. Teams
+        # tied with it may be cut too, which is why the seeds are merged back.
+        shared_cutoff = None
+        if len(seeds) >= self.top_k:
+            cutoff = heapq.nlargest(self.top_k, (score for score, _, _ in seeds))[-1]
+            shared_cutoff = SimpleNamespace(value=cutoff)
+
+            if stats is not None:
+                stats.extra["seed_cutoff"] = cutoff
+
+        best_heap = _bnb_search(
+            self.max_team_size,
+            self.hero_index,
+            self.trait_index,
+            shared_cutoff=shared_cutoff,
+            stats=stats,
+            **query,
+        )
+
+        merged = {}
+        for entry in list(best_heap) + seeds:
+            merged.setdefault(entry[1], entry)
+
+        return heapq.nlargest(self.top_k, merged.values(), key=lambda x: x[0])
@@ -0,0 +1,138 @@
+"""
+Solver instrumentation.
+
+Every solver takes an optional stats=SolverStats() and fills it in instead
+of printing. Hot loops keep their counters in local variables and only
+write them to the stats object once at the end, so passing stats=None (the
+default) costs next to nothing.
+
+    stats = SolverStats()
+    results = find_best_team_bnb(9, hero_index, traits_index, stats=stats)
+    print(stats.summary())
+
+SolverStats(time_split=True) also times the scoring step (scoring a leaf
+and updating the top-k heap). That calls time.perf_counter around every
+leaf, so it is opt-in.
+
+profile_query runs one solver call under cProfile and writes a .prof file
+(open it with pstats, snakeviz, or turn it into a flame graph with flameprof).
+"""
+
+import cProfile
+import pstats
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# Prune reasons
+PRUNE_BOUND = "bound"            # optimistic bound can't beat the k-th best score
+PRUNE_METRO_ZERO = "metro_zero"  # Metro Zero can't be (or wasn't) reached
+PRUNE_CAPACITY = "capacity"      # not enough heroes left to fill the team
+PRUNE_TARGET = "target"          # a required trait level can't be reached
+
+@dataclass(slots=True)
+class SolverStats:
+    time_split: bool = False              # opt in: time scoring separately
+    solver: str = ""
+    nodes: int = 0                        # search nodes expanded
+    leaves: int = 0                       # complete teams (or class vectors) scored
+    pruned: Dict[str, int] = field(default_factory=dict)
+    heap_pushes: int = 0
+    heap_replacements: int = 0
+    scoring_seconds: float = 0.0          # only with time_split
+    first_result_seconds: Optional[float] = None
+    elapsed: float = 0.0
+    extra: Dict[str, object] = field(default_factory=dict)   # solver-specific counters
+    started: float = field(default=0.0, repr=False)
+
+    def start(self, solver):
+        """Reset the counters (keeps time_split) and start the clock."""
+        self.solver = solver
+        self.nodes = 0
+        self.leaves = 0
+        self.pruned = {}
+        self.heap_pushes = 0
+        self.heap_replacements = 0
+        self.scoring_seconds = 0.0
+        self.first_result_seconds = None
+        self.elapsed = 0.0
+        self.extra = {}
+        self.started = time.perf_counter()
+
+    def first_result(self):
+        """Record the time of the first result, if not already recorded."""
+        if self.first_result_seconds is None:
+            self.first_result_seconds = time.perf_counter() - self.started
+
+    def prune(self, reason, count=1):
+        if count:
+            self.pruned[reason] = self.pruned.get(reason, 0) + count
+
+    def absorb(self, other):
+        """Add another run's counters (ex: a parallel shard) to this one."""
+        self.nodes += other.nodes
+        self.leaves += other.leaves
+        for reason, count in other.pruned.items():
+            self.prune(reason, count)
+        self.heap_pushes += other.heap_pushes
+        self.heap_replacements += other.heap_replacements
+        self.scoring_seconds += other.scoring_seconds
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def enumeration_seconds(self):
+        """Time not spent scoring (None unless time_split)."""
+        if not self.time_split:
+            return None
+        return max(0.0, self.elapsed - self.scoring_seconds)
+
+    def summary(self):
+        """One line, in the style of the old "Checked N teams" prints."""
+        details = []
+        if self.nodes:
+            details.append(f"{self.nodes:,} nodes expanded")
+        for reason, count in sorted(self.pruned.items()):
+            details.append(f"{count:,} pruned ({reason})")
+        for key, value in self.extra.items():
+            if isinstance(value, int) and not isinstance(value, bool):
+                details.append(f"{key} {value:,}")
+            else:
+                details.append(f"{key} {value}")
+
+        line = f"Checked {self.leaves:,} teams"
+        if details:
+            line += f" ({', '.join(details)})"
+        line += f" in {self.elapsed:.3f}s"
+
+        if self.time_split:
+            line += f" [scoring {self.scoring_seconds:.3f}s, enumeration {self.enumeration_seconds:.3f}s]"
+
+        return line
+
+    def as_dict(self):
+        return {
+            "solver": self.solver,
+            "nodes": self.nodes,
+            "leaves": self.leaves,
+            "pruned": dict(self.pruned),
+            "heap_pushes": self.heap_pushes,
+            "heap_replacements": self.heap_replacements,
+            "scoring_seconds": self.scoring_seconds if self.time_split else None,
+            "enumeration_seconds": self.enumeration_seconds,
+            "first_result_seconds": self.first_result_seconds,
+            "elapsed": self.elapsed,
+            "extra": dict(self.extra),
+        }
+
+def profile_query(solver, *args, path="solver.prof", **kwargs):
+    """
+    Run solver(*args, **kwargs) under cProfile and write the profile to path.
+
+    Returns (solver result, pstats.Stats).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(solver, *args, **kwargs)
+    profiler.dump_stats(path)
+    return result, pstats.Stats(profiler)
@@ -0,0 +1,167 @@
+"""
+Lazy ranked results: iter_best_teams yields teams best first, on demand.
+
+    teams = iter_best_teams(9, hero_index, traits_index, core_hero_ids=core_hero_ids)
+    best = next(teams)
+    next_five = list(itertools.islice(teams, 5))
+
+Lawler-style partitioning. A subproblem is (heroes forced in, heroes forced
+out); its best team is found with the find_best_team_bnb search (top_k=1,
+forced heroes as extra core heroes, forced-out heroes left out of the pool).
+Once a subproblem's best team S is yielded, the rest of that subproblem is
+split into disjoint subproblems, one per hero s1..sm that S picked beyond the
+forced ones:
+
+    forced in + s1..s(j-1), forced out + sj      for j = 1..m
+
+so every team is reached exactly once, and teams come out in non-increasing
+score order from a priority queue of subproblems keyed by their best score.
+
+Children are queued with their parent's score as key (an upper bound, since
+their teams are a subset of the parent's) and only searched when they reach
+the top of the queue. Each team yielded adds at most (team size - core
+heroes) subproblems, so the queue holds at most 1 + yielded * free slots
+entries: memory grows with how many teams the consumer reads, not with the
+number of possible teams or how long the searches take.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty,
+or the given scoring model's rules).
+"""
+
+import heapq
+from collections import Counter
+
+from helper import _bnb_search, compile_scoring
+
+# Queue entry kinds, in pop order for equal keys
+_TEAM = 0     # solved subproblem, key is its best team's score
+_STALE = 1    # unsolved subproblem, key is its parent's score
+
+def iter_best_teams(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    stats=None,
+    model=None,
+):
+    """
+    Generator of (score, team, synergy) tuples, best score first.
+
+    Same teams and scores as find_best_team with an unlimited top_k; take
+    the first k with itertools.islice for a top-k query.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats, updated at every team yielded
+                     (search counters summed over the subproblems solved,
+                     extra["yielded"] the teams yielded, extra["subproblems"]
+                     the searches run, extra["queue_peak"] the largest queue)
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING)
+    """
+
+    if core_hero_ids is None:
+        core_hero_ids = []
+
+    if magic_crystal_ids is None:
+        magic_crystal_ids = {}
+
+    # Error handling: Core heroes exceed team size
+    if len(core_hero_ids) > max_team_size:
+        raise ValueError(
+            f"Core heroes ({len(core_hero_ids)}) exceed team size ({max_team_size})."
+        )
+
+    return _iter_best_teams(
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids,
+        glory_league_ids,
+        magic_crystal_ids,
+        stats,
+        compile_scoring(model, trait_index, hero_index),
+    )
+
+def _iter_best_teams(
+    max_team_size,
+    hero_index,
+    trait_index,
+    core_hero_ids,
+    glory_league_ids,
+    magic_crystal_ids,
+    stats,
+    scoring,
+):
+    if stats is not None:
+        stats.start("iter_best_teams")
+
+    core_set = set(core_hero_ids)
+    pool = [h.id for h in hero_index if h.id not in core_set]
+
+    def solve(forced_in, forced_out):
+        """Best team with forced_in and without forced_out, or None."""
+        best_heap = _bnb_search(
+            max_team_size,
+            hero_index,
+            trait_index,
+            core_hero_ids=list(core_hero_ids) + list(forced_in),
+            glory_league_ids=glory_league_ids,
+            magic_crystal_ids=magic_crystal_ids,
+            top_k=1,
+            free_pool=[hid for hid in pool if hid not in forced_in and hid not in forced_out],
+            stats=stats,
+            model=scoring,
+        )
+        return best_heap[0] if best_heap else None
+
+    # -----------------------------
+    # Best-first search over subproblems
+    # -----------------------------
+    # (-key, kind, sequence, forced_in, forced_out, best team entry or None)
+    queue = []
+    sequence = 0
+    subproblems = 0
+    yielded = 0
+    queue_peak = 0
+
+    def push(key, kind, forced_in, forced_out, entry):
+        nonlocal sequence, queue_peak
+        sequence += 1
+        heapq.heappush(queue, (-key, kind, sequence, forced_in, forced_out, entry))
+        if len(queue) > queue_peak:
+            queue_peak = len(queue)
+
+    def report():
+        if stats is not None:
+            if yielded:
+                stats.first_result()
+            stats.extra["yielded"] = yielded
+            stats.extra["subproblems"] = subproblems
+            stats.extra["queue_peak"] = queue_peak
+            stats.finish()
+
+    push(0, _STALE, (), frozenset(), None)
+
+    while queue:
+        neg_key, kind, _, forced_in, forced_out, entry = heapq.heappop(queue)
+
+        if kind == _STALE:
+            subproblems += 1
+            entry = solve(forced_in, forced_out)
+            if entry is not None:
+                push(entry[0], _TEAM, forced_in, forced_out, entry)
+            continue
+
+        yielded += 1
+        report()
+        yield entry
+
+        # Split what is left of this subproblem on the heroes the team picked
+        picks = sorted((Counter(entry[1]) - Counter(core_hero_ids) - Counter(forced_in)).elements())
+        for j, hid in enumerate(picks):
+            push(-neg_key, _STALE, forced_in + tuple(picks[:j]), forced_out | {hid}, None)
+
+    report()
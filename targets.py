@@ -0,0 +1,113 @@
+"""
+Synergy-target queries: the best teams that reach given trait levels.
+
+    targets = get_target_ids(traits_index, {"Marksman": 6})
+    results = find_best_team_targets(9, hero_index, traits_index, targets, core_hero_ids=core_hero_ids)
+
+    get_target_ids(traits_index, {"Soul Vessels": 4, "Mage": 4})
+
+Instead of a large top_k on find_best_team and filtering afterwards, the
+targets drive the search: find_best_team_bnb's search (helper._bnb_search)
+runs with the targets as its required counts. Each required trait gets a
+carrier suffix count (helper.carrier_suffix), the way
+find_best_team_m0_increment_dfs tracks remaining Metro Zero heroes, and a
+branch is cut as soon as one target can't be reached any more with the
+open slots and the heroes left. Carriers of the required traits are
+branched over first. The usual bound cut runs on top of it.
+
+Scores follow evaluate_team / find_best_team (Metro Zero bonus or penalty),
+targets only decide which teams qualify.
+"""
+
+from helper import _bnb_search, bnb_pool_order
+from names import trait_name_index
+
+def get_target_ids(trait_index, targets):
+    """
+    Convert {trait name: level} to {trait ID: level}.
+
+    Names are case-insensitive and typo-tolerant (see names.NameIndex). A
+    level is one of the trait's thresholds (ex: Marksman 2, 4 or 6), and a
+    team meets it when at least that many of the trait are counted.
+
+    Raises
+    ------
+    ValueError
+        If a trait is unknown or the level is not one of its thresholds.
+    """
+    if not targets:
+        return {}
+
+    names = trait_name_index(trait_index)
+    target_ids = {}
+
+    for name, level in targets.items():
+        tid = names.resolve(name)
+        trait = trait_index[tid]
+
+        if level not in trait.thresholds:
+            raise ValueError(
+                f"{trait.name} has no level {level}. "
+                f"Levels: {list(trait.thresholds)}"
+            )
+
+        target_ids[tid] = max(level, target_ids.get(tid, 0))
+
+    return target_ids
+
+def find_best_team_targets(
+    max_team_size,
+    hero_index,
+    trait_index,
+    targets,
+    core_hero_ids=None,
+    glory_league_ids=None,
+    magic_crystal_ids=None,
+    top_k=5,
+    stats=None,
+    model=None,
+):
+    """
+    Top-k teams whose trait counts reach every target. Same scores as
+    find_best_team_bnb; an empty list if no team can reach them.
+
+    max_team_size  : final team size (ex: 5, 6, 7)
+    targets        : trait ID -> minimum count (see get_target_ids)
+    core_hero_ids  : list of hero IDs that must be in the team
+    stats          : optional stats.SolverStats to fill in
+    model          : optional ScoringModel / CompiledScoring (default: DEFAULT_SCORING)
+    """
+
+    for tid in targets:
+        if not 0 <= tid < len(trait_index):
+            raise ValueError(f"Unknown trait ID in targets: {tid}")
+
+    if stats is not None:
+        stats.start("find_best_team_targets")
+
+    # Carriers of the most targets first, then the usual bnb order: a
+    # branch that skipped too many of them dies right away
+    def targets_first(hero_ids, hero_traits):
+        return sorted(
+            bnb_pool_order(hero_index, hero_ids),
+            key=lambda hid: -sum(tid in targets for tid in hero_traits[hid]),
+        )
+
+    best_heap = _bnb_search(
+        max_team_size,
+        hero_index,
+        trait_index,
+        core_hero_ids=core_hero_ids,
+        glory_league_ids=glory_league_ids,
+        magic_crystal_ids=magic_crystal_ids,
+        top_k=top_k,
+        stats=stats,
+        model=model,
+        required=targets,
+        pool_order=targets_first,
+    )
+
+    if stats is not None:
+        stats.finish()
+
+    return sorted(best_heap, reverse=True, key=lambda x: x[0])
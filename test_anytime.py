@@ -0,0 +1,59 @@
+from anytime import find_best_team_anytime
+from conftest import HERO_INDEX, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+
+def test_anytime_without_budget_matches_find_best_team(query):
+    results, status = find_best_team_anytime(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert status["proven"]
+    assert status["gap"] == 0
+    assert scores(results) == scores(reference(query))
+
+def test_anytime_without_budget_matches_bnb_on_wide_queries(wide_query):
+    results, status = find_best_team_anytime(wide_query.size, HERO_INDEX, TRAIT_INDEX, **wide_query.kwargs())
+
+    assert status["proven"]
+    assert scores(results) == scores(wide_reference(wide_query))
+
+def test_node_budget_reports_a_valid_gap():
+    query = WIDE_QUERIES[0]
+    exact = wide_reference(query, top_k=50)
+    snapshots = []
+
+    results, status = find_best_team_anytime(
+        query.size,
+        HERO_INDEX,
+        TRAIT_INDEX,
+        node_budget=20,
+        on_snapshot=lambda results, status: snapshots.append(status),
+        **query.kwargs(),
+    )
+
+    assert not status["proven"]
+    assert snapshots and len(results) == 5
+
+    # The k-th best so far plus the gap is the upper bound, and no team
+    # missing from the results scores above it
+    assert status["gap"] == status["upper_bound"] - results[-1][0] >= 0
+    found = {team for _, team, _ in results}
+    assert all(score <= status["upper_bound"] for score, team, _ in exact if team not in found)
+
+    # Each result is a real team, never better than the exact top-k
+    assert all(got <= best for got, best in zip(scores(results), scores(exact)))
+
+def test_should_stop_ends_the_search_early():
+    query = WIDE_QUERIES[0]
+    results, status = find_best_team_anytime(
+        query.size, HERO_INDEX, TRAIT_INDEX, should_stop=lambda: True, **query.kwargs()
+    )
+
+    # Only the greedy seed is there
+    assert not status["proven"]
+    assert len(results) == 1
+    assert results[0][0] <= wide_reference(query)[0][0]
+
+def test_time_budget_zero_still_answers():
+    query = WIDE_QUERIES[0]
+    results, status = find_best_team_anytime(query.size, HERO_INDEX, TRAIT_INDEX, time_budget=0, **query.kwargs())
+
+    assert results
+    assert not status["proven"]
@@ -0,0 +1,76 @@
+import pytest
+
+from batch import run_batch
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from helper import find_best_team_bnb, get_mcid
+
+def _spec(query, top_k=5):
+    return {
+        "size": query.size,
+        "core_heroes": [HERO_INDEX[hid].name for hid in query.core_hero_ids],
+        "glory_league": [HERO_INDEX[hid].name for hid in sorted(query.glory_league_ids)],
+        "magic_crystals": [
+            TRAIT_INDEX[tid].name
+            for tid, count in query.magic_crystal_ids.items()
+            for _ in range(count)
+        ],
+        "top_k": top_k,
+    }
+
+def test_batch_matches_find_best_team():
+    batch = run_batch([_spec(query) for query in QUERIES], HERO_INDEX, TRAIT_INDEX)
+
+    for query, result in zip(QUERIES, batch):
+        assert scores(result.results) == scores(reference(query))
+
+def test_batch_matches_bnb_on_wide_queries():
+    batch = run_batch([_spec(query) for query in WIDE_QUERIES], HERO_INDEX, TRAIT_INDEX)
+
+    for query, result in zip(WIDE_QUERIES, batch):
+        assert scores(result.results) == scores(wide_reference(query))
+
+def test_identical_queries_are_solved_once():
+    query = QUERIES[-1]
+    spec = _spec(query)
+
+    # Same query with the core heroes in another order, and a smaller top_k
+    reordered = dict(spec, core_heroes=list(reversed(spec["core_heroes"])))
+    smaller = dict(spec, top_k=2)
+
+    batch = run_batch([spec, reordered, smaller], HERO_INDEX, TRAIT_INDEX)
+
+    assert batch[0].duplicate_of is None
+    assert batch[1].duplicate_of == 0
+    assert batch[2].duplicate_of == 0
+    assert len({result.group for result in batch}) == 1
+
+    assert scores(batch[1].results) == scores(batch[0].results) == scores(reference(query))
+    assert scores(batch[2].results) == scores(reference(query))[:2]
+
+def test_crystal_variants_share_a_group():
+    base = WIDE_QUERIES[1]
+    crystals = [[], ["Marksman"], ["Mage"], ["Marksman", "Marksman"]]
+    specs = [dict(_spec(base), magic_crystals=names) for names in crystals]
+
+    # Another core: a group of its own
+    specs.append(_spec(WIDE_QUERIES[0]))
+
+    batch = run_batch(specs, HERO_INDEX, TRAIT_INDEX)
+
+    assert len({result.group for result in batch[:4]}) == 1
+    assert batch[4].group != batch[0].group
+    assert all(result.duplicate_of is None for result in batch)
+
+    for names, result in zip(crystals, batch):
+        expected = find_best_team_bnb(
+            base.size,
+            HERO_INDEX,
+            TRAIT_INDEX,
+            core_hero_ids=base.core_hero_ids,
+            magic_crystal_ids=get_mcid(TRAIT_INDEX, names),
+        )
+        assert scores(result.results) == scores(expected)
+
+def test_bad_spec_is_rejected_before_solving():
+    with pytest.raises(ValueError):
+        run_batch([_spec(QUERIES[0]), {"size": 5, "core_heroes": ["Nobody"]}], HERO_INDEX, TRAIT_INDEX)
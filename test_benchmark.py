@@ -0,0 +1,93 @@
+import copy
+import json
+
+import pytest
+
+from benchmark import Solver, build_scenarios, compare_reports, default_solvers, main, run_benchmark
+from conftest import HERO_INDEX, TRAIT_INDEX
+from helper import find_best_team_bnb
+
+SMALL_MATRIX = dict(sizes=(4,), core_counts=(2, 3), glory_league=(False, True), crystal_counts=(0, 1))
+
+def _off_by_one(*args, **kwargs):
+    return [(score + 1, team, synergy) for score, team, synergy in find_best_team_bnb(*args, **kwargs)]
+
+def _top_one(*args, **kwargs):
+    return find_best_team_bnb(*args, **kwargs)[:1]
+
+def _broken(*args, **kwargs):
+    raise RuntimeError("broken")
+
+def _run(solvers):
+    scenarios = build_scenarios(hero_index=HERO_INDEX, **SMALL_MATRIX)
+    return run_benchmark(scenarios, solvers, HERO_INDEX, TRAIT_INDEX, log=lambda line: None)
+
+@pytest.fixture(scope="module")
+def report():
+    # Every solver on a small matrix: they all have to agree
+    return _run(default_solvers())
+
+def test_every_solver_agrees_on_a_small_matrix(report):
+    assert len(report["scenarios"]) == 8
+    assert {run["status"] for run in report["runs"]} == {"ok"}
+
+def test_mismatches_and_errors_are_reported():
+    report = _run([
+        Solver("find_best_team_bnb", find_best_team_bnb),
+        Solver("off_by_one", _off_by_one),
+        Solver("top_one", _top_one),
+        Solver("broken", _broken),
+    ])
+
+    status = {}
+    for run in report["runs"]:
+        status.setdefault(run["solver"], set()).add(run["status"])
+
+    assert status == {
+        "find_best_team_bnb": {"ok"},
+        "off_by_one": {"mismatch"},   # rescoring catches it
+        "top_one": {"mismatch"},      # the reference scores catch it
+        "broken": {"error"},
+    }
+
+def test_same_report_has_no_regressions(report):
+    assert compare_reports(report, copy.deepcopy(report)) == []
+
+def test_compare_flags_regressions(report):
+    current = copy.deepcopy(report)
+    slower, changed, broken, faster = current["runs"][:4]
+
+    slower["seconds"] = slower["seconds"] * 3 + 1
+    changed["scores"] = [score - 1 for score in changed["scores"]]
+    broken["status"], broken["detail"] = "mismatch", "scores differ"
+    faster["seconds"] /= 2
+
+    regressions = compare_reports(report, current)
+
+    assert len(regressions) == 3
+    for run in (slower, changed, broken):
+        assert any(line.startswith(f"{run['scenario']} {run['solver']}:") for line in regressions)
+
+def test_compare_ignores_noise_and_flags_a_new_roster(report):
+    current = copy.deepcopy(report)
+    for run in current["runs"]:
+        run["seconds"] += 0.01   # below the noise floor
+
+    assert compare_reports(report, current) == []
+
+    current["meta"]["roster"] = "another roster"
+    assert compare_reports(report, current) == ["roster changed since the baseline: scores are not comparable"]
+
+def test_compare_command_exit_status(report, tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(report))
+
+    current.write_text(json.dumps(report))
+    assert main(["compare", str(baseline), str(current)]) == 0
+
+    regressed = copy.deepcopy(report)
+    regressed["runs"][0]["seconds"] = regressed["runs"][0]["seconds"] * 3 + 1
+    current.write_text(json.dumps(regressed))
+    assert main(["compare", str(baseline), str(current)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,29 @@
+import itertools
+
+import pytest
+
+from bitset_engine import iter_masks
+from conftest import HERO_INDEX, TRAIT_INDEX, reference, scores
+from helper import find_best_team
+
+def _combinations(n, mask):
+    """Items of a mask, bit n - 1 - j standing for item j."""
+    return tuple(j for j in range(n) if mask >> (n - 1 - j) & 1)
+
+@pytest.mark.parametrize("n", range(7))
+def test_iter_masks_follows_combinations(n):
+    for k in range(n + 1):
+        masks = list(iter_masks(n, k))
+        assert [_combinations(n, mask) for mask in masks] == list(itertools.combinations(range(n), k))
+
+def test_iter_masks_edge_cases():
+    assert list(iter_masks(5, 0)) == [0]
+    assert list(iter_masks(5, 5)) == [0b11111]
+    assert list(iter_masks(0, 0)) == [0]
+    assert list(iter_masks(5, 6)) == []
+    assert list(iter_masks(5, -1)) == []
+
+def test_bitset_engine_matches_find_best_team(query):
+    results = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, engine="bitset", **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
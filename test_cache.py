@@ -0,0 +1,104 @@
+import copy
+
+import pytest
+
+from cache import QueryCache, query_signature
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, reference
+from heroes_and_traits import heroes, traits
+from helper import find_best_team_bnb, initialize_traits_and_heroes
+
+class CountingSolver:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, max_team_size, hero_index, trait_index, top_k=5, **query):
+        self.calls.append(top_k)
+        return find_best_team_bnb(max_team_size, hero_index, trait_index, top_k=top_k, **query)
+
+def _ask(cache, query, top_k=5, hero_index=HERO_INDEX, trait_index=TRAIT_INDEX):
+    return cache.find_best_team(query.size, hero_index, trait_index, top_k=top_k, **query.kwargs())
+
+def test_smaller_top_k_is_served_as_a_prefix():
+    solver = CountingSolver()
+    cache = QueryCache(solver=solver)
+    query = QUERIES[-1]
+
+    full = _ask(cache, query, top_k=10)
+    prefix = _ask(cache, query, top_k=3)
+
+    assert solver.calls == [10]
+    assert prefix == full[:3] == reference(query, top_k=10)[:3]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_larger_top_k_is_a_miss_that_replaces_the_entry():
+    solver = CountingSolver()
+    cache = QueryCache(solver=solver)
+    query = QUERIES[-1]
+
+    _ask(cache, query, top_k=3)
+    _ask(cache, query, top_k=10)
+    _ask(cache, query, top_k=7)
+
+    assert solver.calls == [3, 10]
+    assert len(cache) == 1
+    assert cache.stats()["misses"] == 2 and cache.stats()["hits"] == 1
+
+def test_reordered_query_hits():
+    solver = CountingSolver()
+    cache = QueryCache(solver=solver)
+    query = QUERIES[-1]
+
+    _ask(cache, query)
+    _ask(cache, query._replace(core_hero_ids=list(reversed(query.core_hero_ids))))
+
+    assert solver.calls == [5]
+
+def test_least_recently_used_entry_is_evicted():
+    solver = CountingSolver()
+    cache = QueryCache(maxsize=2, solver=solver)
+    first, second, third = QUERIES[:3]
+
+    _ask(cache, first)
+    _ask(cache, second)
+    _ask(cache, first)    # first is now the most recent
+    _ask(cache, third)    # evicts second
+    _ask(cache, first)
+
+    assert cache.stats() == {"hits": 2, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2}
+
+    _ask(cache, second)
+    assert len(solver.calls) == 4
+    assert cache.stats()["evictions"] == 2
+
+def test_roster_edit_invalidates():
+    solver = CountingSolver()
+    cache = QueryCache(solver=solver)
+    query = QUERIES[0]
+
+    trait_index, hero_index = initialize_traits_and_heroes(traits, heroes)
+    before = query_signature(query.size, hero_index, trait_index)
+    _ask(cache, query, hero_index=hero_index, trait_index=trait_index)
+
+    hero_index[0].quality += 1
+    assert query_signature(query.size, hero_index, trait_index) != before
+
+    _ask(cache, query, hero_index=hero_index, trait_index=trait_index)
+    assert len(solver.calls) == 2
+
+def test_callers_cannot_change_cached_results():
+    cache = QueryCache(solver=CountingSolver())
+    query = QUERIES[-1]
+
+    first = _ask(cache, query)
+    expected = copy.deepcopy(first)
+    first[0][2].clear()
+    first.pop()
+
+    second = _ask(cache, query)
+    second[0][2]["edited"] = 1
+
+    assert _ask(cache, query) == expected
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        QueryCache(maxsize=0)
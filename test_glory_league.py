@@ -0,0 +1,62 @@
+import pytest
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, scores
+from glory_league import find_best_glory_league_pair
+from helper import find_best_team, find_best_team_bnb, glory_league_rules
+
+def _ranked(query, **kwargs):
+    return find_best_glory_league_pair(
+        query.size,
+        HERO_INDEX,
+        TRAIT_INDEX,
+        core_hero_ids=query.core_hero_ids,
+        magic_crystal_ids=query.magic_crystal_ids,
+        **kwargs,
+    )
+
+def _solve(solver, query, pair):
+    return solver(
+        query.size,
+        HERO_INDEX,
+        TRAIT_INDEX,
+        core_hero_ids=query.core_hero_ids,
+        glory_league_ids=set(pair),
+        magic_crystal_ids=query.magic_crystal_ids,
+    )
+
+@pytest.mark.parametrize(
+    "query, solver",
+    [(QUERIES[1], find_best_team), (QUERIES[-1], find_best_team_bnb)],
+    ids=lambda value: getattr(value, "name", getattr(value, "__name__", None)),
+)
+def test_every_pair_matches_a_single_pair_search(query, solver):
+    ranked = _ranked(query)
+
+    assert {pair for pair, _ in ranked} == glory_league_rules(HERO_INDEX).allowed
+    for pair, results in ranked:
+        assert scores(results) == scores(_solve(solver, query, pair))
+
+def test_pairs_ranked_best_first():
+    query = WIDE_QUERIES[1]
+    ranked = _ranked(query)
+
+    for pair, results in ranked:
+        assert scores(results) == scores(_solve(find_best_team_bnb, query, pair))
+
+    # Best score first, then the rest of the top-k
+    ranking = [scores(results) for _, results in ranked]
+    assert ranking == sorted(ranking, reverse=True)
+
+def test_only_the_given_pairs_are_searched():
+    query = QUERIES[1]
+    pairs = sorted(glory_league_rules(HERO_INDEX).allowed)[:2]
+
+    assert sorted(pair for pair, _ in _ranked(query, pairs=pairs)) == pairs
+
+def test_illegal_pair_is_rejected():
+    one_id, five_id = sorted(glory_league_rules(HERO_INDEX).allowed)[0]
+
+    # Reversed (5-cost first), and a pair the rules don't allow
+    for pair in [(five_id, one_id), (one_id, one_id)]:
+        with pytest.raises(ValueError):
+            _ranked(QUERIES[1], pairs=[pair])
@@ -0,0 +1,72 @@
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX, reference, scores
+from helper import (
+    METRO_ZERO_ID,
+    METRO_ZERO_THRESHOLD,
+    evaluate_team,
+    find_best_team,
+    find_best_team_bnb,
+    find_best_team_increment_dfs,
+    find_best_team_m0_enforced,
+    find_best_team_m0_increment_dfs,
+)
+
+def test_bnb_matches_find_best_team(query):
+    results = find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_bnb_results_rescore(query):
+    results = find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **query.kwargs())
+
+    for score, team, synergy in results:
+        assert len(team) == query.size
+        assert set(query.core_hero_ids) <= set(team)
+        assert (score, synergy) == evaluate_team(
+            team,
+            HERO_INDEX,
+            TRAIT_INDEX,
+            glory_league_ids=query.glory_league_ids,
+            magic_crystal_ids=query.magic_crystal_ids,
+        )
+
+def test_m0_increment_dfs_matches_m0_enforced(query):
+    results = find_best_team_m0_increment_dfs(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **query.kwargs())
+    expected = find_best_team_m0_enforced(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **query.kwargs())
+
+    assert scores(results) == scores(expected)
+
+    # A single core Metro Zero hero doesn't make Metro Zero active
+    for score, team, synergy in results:
+        assert sum(METRO_ZERO_ID in HERO_INDEX[hid].trait_ids for hid in team) >= METRO_ZERO_THRESHOLD
+        assert (score, synergy) == evaluate_team(
+            team,
+            HERO_INDEX,
+            TRAIT_INDEX,
+            glory_league_ids=query.glory_league_ids,
+            magic_crystal_ids=query.magic_crystal_ids,
+        )
+
+def _teams(results):
+    return [(score, team) for score, team, _ in results]
+
+@pytest.mark.parametrize("top_k", [1, 10, 40])
+@pytest.mark.parametrize(
+    "solver",
+    [find_best_team_m0_increment_dfs, find_best_team_increment_dfs],
+    ids=["m0_increment_dfs", "increment_dfs"],
+)
+def test_dfs_solvers_match_m0_enforced_exactly(solver, top_k, query):
+    # Same teams, synergy and tie order, also where the top_k cut splits a tie
+    results = solver(query.size, HERO_INDEX, TRAIT_INDEX, top_k=top_k, **query.kwargs())
+    expected = find_best_team_m0_enforced(query.size, HERO_INDEX, TRAIT_INDEX, top_k=top_k, **query.kwargs())
+
+    assert results == expected
+
+def test_ties_are_broken_by_team(query):
+    results = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, top_k=40, **query.kwargs())
+    everything = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10**6, **query.kwargs())
+
+    assert _teams(results) == sorted(_teams(results), reverse=True)
+    assert _teams(results) == _teams(everything)[:40]
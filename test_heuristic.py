@@ -0,0 +1,58 @@
+from conftest import HERO_INDEX, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from helper import evaluate_team
+from heuristic import beam_gap_report, find_best_team_beam
+
+def _check_valid(results, query):
+    teams = [team for _, team, _ in results]
+    assert len(set(teams)) == len(teams)
+    assert scores(results) == sorted(scores(results), reverse=True)
+
+    for score, team, synergy in results:
+        assert len(set(team)) == len(team) == query.size
+        assert set(query.core_hero_ids) <= set(team)
+        assert (score, synergy) == evaluate_team(
+            team,
+            HERO_INDEX,
+            TRAIT_INDEX,
+            glory_league_ids=query.glory_league_ids,
+            magic_crystal_ids=query.magic_crystal_ids,
+        )
+
+def test_beam_teams_are_valid_and_never_beat_the_optimum(query):
+    results = find_best_team_beam(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    _check_valid(results, query)
+    assert all(got <= best for got, best in zip(scores(results), scores(reference(query))))
+
+def test_narrow_beam_without_local_search(wide_query):
+    results = find_best_team_beam(
+        wide_query.size, HERO_INDEX, TRAIT_INDEX, beam_width=4, local_search=False, **wide_query.kwargs()
+    )
+
+    _check_valid(results, wide_query)
+    assert results[0][0] <= wide_reference(wide_query)[0][0]
+
+def test_local_search_never_makes_the_best_team_worse(wide_query):
+    plain = find_best_team_beam(wide_query.size, HERO_INDEX, TRAIT_INDEX, beam_width=4, local_search=False, **wide_query.kwargs())
+    refined = find_best_team_beam(wide_query.size, HERO_INDEX, TRAIT_INDEX, beam_width=4, **wide_query.kwargs())
+
+    assert refined[0][0] >= plain[0][0]
+
+def test_gap_report():
+    query = WIDE_QUERIES[1]
+    report = beam_gap_report(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+    beam = find_best_team_beam(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert report["exact_scores"] == scores(wide_reference(query))
+    assert report["beam_scores"] == scores(beam)
+    assert report["best_gap"] == report["exact_scores"][0] - report["beam_scores"][0] >= 0
+    assert report["kth_gap"] == report["exact_scores"][-1] - report["beam_scores"][-1] >= 0
+
+def test_gap_report_with_fewer_beam_teams():
+    # A 4-wide beam without local search ends with fewer than top_k teams
+    query = WIDE_QUERIES[1]
+    report = beam_gap_report(query.size, HERO_INDEX, TRAIT_INDEX, beam_width=4, local_search=False, **query.kwargs())
+
+    assert len(report["beam_scores"]) < len(report["exact_scores"]) == 5
+    assert report["best_gap"] == report["exact_scores"][0] - report["beam_scores"][0] >= 0
+    assert report["kth_gap"] is None
@@ -0,0 +1,22 @@
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from helper import find_best_team_m0_enforced
+from mitm import find_best_team_mitm
+
+def test_mitm_matches_find_best_team(query):
+    results = find_best_team_mitm(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+@pytest.mark.parametrize("query", [WIDE_QUERIES[1], WIDE_QUERIES[-1]], ids=lambda query: query.name)
+def test_mitm_matches_bnb_on_wide_queries(query):
+    results = find_best_team_mitm(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **query.kwargs())
+
+    assert scores(results) == scores(wide_reference(query, top_k=10))
+
+def test_mitm_metro_zero_only_matches_m0_enforced(query):
+    results = find_best_team_mitm(query.size, HERO_INDEX, TRAIT_INDEX, metro_zero_only=True, **query.kwargs())
+    expected = find_best_team_m0_enforced(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(expected)
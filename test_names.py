@@ -0,0 +1,88 @@
+import dataclasses
+
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX
+from helper import get_hid, glory_league_rules
+from names import hero_name_index, trait_name_index
+
+def _hero(name):
+    return HERO_INDEX[hero_name_index(HERO_INDEX).resolve(name)].name
+
+def _trait(name):
+    return TRAIT_INDEX[trait_name_index(TRAIT_INDEX).resolve(name)].name
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Irithel", "Irithel"),
+        ("IRITHEL", "Irithel"),
+        ("irith", "Irithel"),      # unique prefix
+        ("xborg", "X.Borg"),       # punctuation ignored
+        ("k prime", "K'"),         # alias
+        ("yagami", "Iori Yagami"), # prefix of a later word
+        ("hanabbi", "Hanabi"),     # close spelling
+    ],
+)
+def test_hero_names(name, expected):
+    assert _hero(name) == expected
+
+@pytest.mark.parametrize("name", ["kof", "KOF", "king of fighters"])
+def test_kof_aliases(name):
+    assert _trait(name) == "KOF"
+
+def test_ambiguous_prefix_raises_with_the_candidates():
+    with pytest.raises(ValueError, match=r"Ambiguous hero name: 'ka'.*\['Kadita', 'Kagura'\]"):
+        _hero("ka")
+
+    with pytest.raises(ValueError, match="Ambiguous trait name"):
+        _trait("ma")
+
+def test_unknown_name_raises_with_suggestions():
+    with pytest.raises(ValueError, match=r"Unknown hero name: 'lansalot'. Did you mean \['Arlott'\]\? Available heroes"):
+        _hero("lansalot")
+
+    with pytest.raises(ValueError, match="Unknown trait name: 'zzz'. Available traits"):
+        _trait("zzz")
+
+def test_errors_are_memoized_too():
+    names = hero_name_index(HERO_INDEX)
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Unknown hero name"):
+            names.resolve("zzz")
+
+def test_empty_name_raises():
+    with pytest.raises(ValueError, match="cannot be empty"):
+        get_hid(HERO_INDEX, "  ")
+
+def test_equal_rosters_share_an_index():
+    copy = [dataclasses.replace(hero) for hero in HERO_INDEX]
+
+    assert hero_name_index(copy) is hero_name_index(HERO_INDEX)
+    assert glory_league_rules(copy) is glory_league_rules(HERO_INDEX)
+
+def test_roster_edited_in_place_is_reindexed():
+    roster = [dataclasses.replace(hero) for hero in HERO_INDEX]
+    irithel = get_hid(roster, "Irithel")
+    assert get_hid(roster, "irith") == irithel
+
+    roster[irithel].name = "Zed"
+
+    assert get_hid(roster, "Zed") == irithel
+    with pytest.raises(ValueError, match="Unknown hero name"):
+        get_hid(roster, "Irithel")
+
+    # The shared roster's index is untouched
+    assert get_hid(HERO_INDEX, "Irithel") == irithel
+
+def test_shorter_roster_is_reindexed():
+    roster = [dataclasses.replace(hero) for hero in HERO_INDEX]
+    last = roster.pop()
+
+    with pytest.raises(ValueError):
+        get_hid(roster, last.name)
+
+def test_refresh_rebuilds():
+    names = hero_name_index(HERO_INDEX)
+
+    assert hero_name_index(HERO_INDEX, refresh=True) is not names
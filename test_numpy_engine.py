@@ -0,0 +1,41 @@
+import itertools
+
+import pytest
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, reference, scores
+from helper import evaluate_team, find_best_team
+
+np = pytest.importorskip("numpy")
+
+from numpy_engine import build_incidence, build_points_lut, find_best_team_numpy, score_block
+
+def test_numpy_engine_matches_find_best_team(query):
+    results = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, engine="numpy", **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_small_blocks_match_find_best_team():
+    # Block edges fall inside the heap updates
+    query = QUERIES[-1]
+    results = find_best_team_numpy(query.size, HERO_INDEX, TRAIT_INDEX, block_size=7, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_score_block_matches_evaluate_team():
+    query = QUERIES[3]   # Glory League pair
+    magic_crystal_ids = {tid: 1 for tid in range(3)}
+    teams = list(itertools.islice(itertools.combinations(range(len(HERO_INDEX)), 4), 0, 2000, 13))
+
+    incidence = build_incidence(HERO_INDEX, TRAIT_INDEX, query.glory_league_ids)
+    quality = np.array([h.quality for h in HERO_INDEX], dtype=np.int32)
+    offset = np.zeros(len(TRAIT_INDEX), dtype=np.int16)
+    for tid, bonus in magic_crystal_ids.items():
+        offset[tid] += bonus
+
+    got = score_block(np.array(teams), incidence, quality, offset, build_points_lut(TRAIT_INDEX, 2 * 4 + 3))
+
+    expected = [
+        evaluate_team(team, HERO_INDEX, TRAIT_INDEX, glory_league_ids=query.glory_league_ids, magic_crystal_ids=magic_crystal_ids)[0]
+        for team in teams
+    ]
+    assert got.tolist() == expected
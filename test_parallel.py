@@ -0,0 +1,27 @@
+from math import comb
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from parallel import find_best_team_parallel, make_shards
+
+def test_parallel_matches_find_best_team(query):
+    results = find_best_team_parallel(query.size, HERO_INDEX, TRAIT_INDEX, workers=1, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_parallel_with_worker_processes():
+    for query in (QUERIES[-1], WIDE_QUERIES[-1]):
+        results = find_best_team_parallel(query.size, HERO_INDEX, TRAIT_INDEX, workers=2, **query.kwargs())
+        expected = reference(query) if query in QUERIES else wide_reference(query)
+
+        assert scores(results) == scores(expected)
+
+def test_shards_cover_every_team_once():
+    query = WIDE_QUERIES[1]
+    remaining_slots = query.size - len(query.core_hero_ids)
+    free = len(HERO_INDEX) - len(query.core_hero_ids)
+
+    shards = make_shards(HERO_INDEX, query.core_hero_ids, remaining_slots)
+
+    # Shard i fixes its first pick and branches over the heroes after it
+    assert all(first not in pool and first not in query.core_hero_ids for first, pool in shards)
+    assert sum(comb(len(pool), remaining_slots - 1) for _, pool in shards) == comb(free, remaining_slots)
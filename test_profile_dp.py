@@ -0,0 +1,12 @@
+from conftest import HERO_INDEX, TRAIT_INDEX, reference, scores, wide_reference
+from profile_dp import find_best_team_dp
+
+def test_dp_matches_find_best_team(query):
+    results = find_best_team_dp(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_dp_matches_bnb_on_wide_queries(wide_query):
+    results = find_best_team_dp(wide_query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **wide_query.kwargs())
+
+    assert scores(results) == scores(wide_reference(wide_query, top_k=10))
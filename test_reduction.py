@@ -0,0 +1,30 @@
+from conftest import HERO_INDEX, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from reduction import find_best_team_reduced, reduce_free_pool
+
+def test_reduced_matches_find_best_team(query):
+    results = find_best_team_reduced(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_reduced_expands_ties_for_a_large_top_k(query):
+    # Equivalent heroes are one class; a large top_k has to expand them
+    results = find_best_team_reduced(query.size, HERO_INDEX, TRAIT_INDEX, top_k=30, **query.kwargs())
+
+    assert scores(results) == scores(reference(query, top_k=30))
+    assert len({team for _, team, _ in results}) == len(results)
+
+def test_reduced_matches_bnb_with_four_open_slots():
+    # Reduction still enumerates, so one wide query is enough
+    query = WIDE_QUERIES[1]
+    results = find_best_team_reduced(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(wide_reference(query))
+
+def test_free_pool_is_partitioned(query):
+    reduction = reduce_free_pool(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    members = [hid for _, class_members in reduction["classes"] for hid in class_members]
+    kept = members + list(reduction["dominated"])
+
+    # Every free hero is in exactly one class, or dropped as dominated
+    assert sorted(kept) == sorted(h.id for h in HERO_INDEX if h.id not in query.core_hero_ids)
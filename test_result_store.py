@@ -0,0 +1,17 @@
+from conftest import HERO_INDEX, TRAIT_INDEX
+from result_store import ResultStore
+
+def test_warm_reports_through_progress(tmp_path, capsys):
+    calls = []
+
+    with ResultStore(str(tmp_path / "results.sqlite")) as store:
+        solved = store.warm(HERO_INDEX, TRAIT_INDEX, team_sizes=[2], progress=lambda *args: calls.append(args))
+
+        assert solved == len(calls) == len(store)
+        assert [done for done, _, _, _ in calls] == list(range(1, solved + 1))
+        assert all(total == solved and size == 2 for _, total, size, _ in calls)
+
+        # Everything is stored now, so a second pass solves nothing
+        assert store.warm(HERO_INDEX, TRAIT_INDEX, team_sizes=[2]) == 0
+
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,35 @@
+import itertools
+from math import comb
+
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX, reference, scores
+from helper import find_best_team, find_best_team_m0_enforced
+from revolving_door import revolving_door
+
+@pytest.mark.parametrize("n", range(1, 9))
+def test_revolving_door_visits_every_subset_once(n):
+    for k in range(n + 1):
+        current = set(range(k))
+        seen = [frozenset(current)]
+
+        for out, new in revolving_door(n, k):
+            # One swap: out leaves the subset, new joins it
+            assert out in current and new not in current and 0 <= new < n
+            current.remove(out)
+            current.add(new)
+            seen.append(frozenset(current))
+
+        assert len(seen) == len(set(seen)) == comb(n, k)
+        assert set(seen) == {frozenset(c) for c in itertools.combinations(range(n), k)}
+
+def test_revolving_engine_matches_find_best_team(query):
+    results = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, engine="revolving", **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+
+def test_revolving_m0_engine_matches_m0_enforced(query):
+    results = find_best_team_m0_enforced(query.size, HERO_INDEX, TRAIT_INDEX, engine="revolving", **query.kwargs())
+    expected = find_best_team_m0_enforced(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs())
+
+    assert scores(results) == scores(expected)
@@ -0,0 +1,153 @@
+import itertools
+
+import pytest
+
+from anytime import find_best_team_anytime
+from batch import run_batch
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, scores
+from glory_league import find_best_glory_league_pair
+from helper import (
+    DEFAULT_SCORING,
+    METRO_ZERO_ID,
+    compile_scoring,
+    evaluate_team,
+    find_best_team,
+    find_best_team_bnb,
+    find_best_team_m0_enforced,
+)
+from heuristic import find_best_team_beam
+from mitm import find_best_team_mitm
+from models import MandatoryTrait, ScoringModel
+from profile_dp import find_best_team_dp
+from reduction import find_best_team_reduced
+from scoring import find_best_team_profiles, score_profiles
+
+TRAIT_IDS = {trait.name: trait.id for trait in TRAIT_INDEX}
+
+MODELS = [
+    DEFAULT_SCORING,
+    ScoringModel(trait_weights={TRAIT_IDS["Marksman"]: 15}, name="aggressive"),
+    ScoringModel(quality_weight=2, mandatory=DEFAULT_SCORING.mandatory, name="safe"),
+    ScoringModel(
+        level_weight=7,
+        threshold_points={TRAIT_IDS["Mage"]: {1: 3, 2: 40}},
+        mandatory=(MandatoryTrait(TRAIT_IDS["Mage"], 2, 100, -50),),
+        name="mages",
+    ),
+]
+
+SMALL_QUERIES = [QUERIES[1], QUERIES[4]]
+
+def _brute_force(query, model, top_k=5):
+    """Top-k scores of every team of the query, rescored one by one."""
+    scoring = compile_scoring(model, TRAIT_INDEX, HERO_INDEX)
+    free_pool = [h.id for h in HERO_INDEX if h.id not in query.core_hero_ids]
+    slots = query.size - len(query.core_hero_ids)
+
+    team_scores = [
+        evaluate_team(
+            list(query.core_hero_ids) + list(picks),
+            HERO_INDEX,
+            TRAIT_INDEX,
+            glory_league_ids=query.glory_league_ids,
+            magic_crystal_ids=query.magic_crystal_ids,
+            model=scoring,
+        )[0]
+        for picks in itertools.combinations(free_pool, slots)
+    ]
+    return sorted(team_scores, reverse=True)[:top_k]
+
+def _rescored(results, query, model):
+    scoring = compile_scoring(model, TRAIT_INDEX, HERO_INDEX)
+    return [
+        evaluate_team(
+            team,
+            HERO_INDEX,
+            TRAIT_INDEX,
+            glory_league_ids=query.glory_league_ids,
+            magic_crystal_ids=query.magic_crystal_ids,
+            model=scoring,
+        )[0]
+        for _, team, _ in results
+    ]
+
+@pytest.mark.parametrize("query", SMALL_QUERIES, ids=lambda query: query.name)
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_bnb_with_a_custom_model_matches_brute_force(query, model):
+    results = find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, model=model, **query.kwargs())
+
+    assert scores(results) == _brute_force(query, model)
+    assert _rescored(results, query, model) == scores(results)
+
+@pytest.mark.parametrize("query", SMALL_QUERIES, ids=lambda query: query.name)
+def test_profiles_match_brute_force(query):
+    per_model = find_best_team_profiles(query.size, HERO_INDEX, TRAIT_INDEX, MODELS, **query.kwargs())
+
+    assert len(per_model) == len(MODELS)
+    for model, results in zip(MODELS, per_model):
+        assert scores(results) == _brute_force(query, model)
+        assert _rescored(results, query, model) == scores(results)
+
+def test_score_profiles_matches_evaluate_team():
+    query = QUERIES[4]
+    teams = [team for _, team, _ in find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10, **query.kwargs())]
+
+    rows = score_profiles(
+        teams,
+        HERO_INDEX,
+        TRAIT_INDEX,
+        MODELS,
+        glory_league_ids=query.glory_league_ids,
+        magic_crystal_ids=query.magic_crystal_ids,
+    )
+
+    columns = [_rescored([(None, team, None) for team in teams], query, model) for model in MODELS]
+    assert rows == [list(row) for row in zip(*columns)]
+
+@pytest.mark.parametrize(
+    "weights",
+    [
+        dict(level_weight=10.5),
+        dict(quality_weight=2.0),
+        dict(trait_weights={0: "15"}),
+        dict(threshold_points={0: {1: 0.5}}),
+        dict(mandatory=(MandatoryTrait(METRO_ZERO_ID, 2, 500.0, -500),)),
+    ],
+)
+def test_non_int_weights_raise(weights):
+    with pytest.raises(ValueError, match="weights must be ints"):
+        ScoringModel(name="bad", **weights)
+
+CUSTOM = MODELS[1]
+QUERY = QUERIES[1]
+ARGS = (QUERY.size, HERO_INDEX, TRAIT_INDEX)
+
+DEFAULT_ONLY = {
+    "anytime": lambda model: find_best_team_anytime(*ARGS, model=model, **QUERY.kwargs()),
+    "beam": lambda model: find_best_team_beam(*ARGS, model=model, **QUERY.kwargs()),
+    "dp": lambda model: find_best_team_dp(*ARGS, model=model, **QUERY.kwargs()),
+    "reduced": lambda model: find_best_team_reduced(*ARGS, model=model, **QUERY.kwargs()),
+    "mitm": lambda model: find_best_team_mitm(*ARGS, model=model, **QUERY.kwargs()),
+    "glory_league": lambda model: find_best_glory_league_pair(
+        *ARGS, core_hero_ids=QUERY.core_hero_ids, pairs=[], model=model,
+    ),
+    "batch": lambda model: run_batch([], HERO_INDEX, TRAIT_INDEX, model=model),
+    "bitset": lambda model: find_best_team(*ARGS, engine="bitset", model=model, **QUERY.kwargs()),
+    "revolving": lambda model: find_best_team(*ARGS, engine="revolving", model=model, **QUERY.kwargs()),
+    "numpy": lambda model: find_best_team(*ARGS, engine="numpy", model=model, **QUERY.kwargs()),
+    "m0_revolving": lambda model: find_best_team_m0_enforced(
+        *ARGS, engine="revolving", model=model, **QUERY.kwargs(),
+    ),
+}
+
+@pytest.mark.parametrize("solver", DEFAULT_ONLY.values(), ids=DEFAULT_ONLY.keys())
+def test_default_only_solvers_reject_custom_models(solver):
+    with pytest.raises(ValueError, match="only scores with DEFAULT_SCORING"):
+        solver(CUSTOM)
+
+@pytest.mark.parametrize("solver", DEFAULT_ONLY.values(), ids=DEFAULT_ONLY.keys())
+def test_default_only_solvers_accept_the_default_model(solver):
+    if solver is DEFAULT_ONLY["numpy"]:
+        pytest.importorskip("numpy")
+
+    solver(DEFAULT_SCORING)
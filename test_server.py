@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX
+from server import OptimizerServer
+
+@pytest.mark.parametrize("spec", [
+    {"size": 0},
+    {"size": len(HERO_INDEX) + 1},
+    {"size": "5"},
+    {"size": 5.0},
+    {"size": True},
+    {"size": 5, "top_k": 0},
+    {"size": 5, "top_k": -2},
+    {"size": 5, "top_k": "3"},
+    {"size": 5, "timeout": 0},
+    {"size": 2, "core_heroes": ["Irithel", "Hanabi", "Claude"]},
+    {"size": 5, "core_heroes": ["Nobody"]},
+])
+def test_bad_query_is_rejected(spec):
+    # Rejected before any cache lookup or worker is involved
+    server = OptimizerServer(HERO_INDEX, TRAIT_INDEX)
+    status, payload = asyncio.run(server._query(json.dumps(spec).encode(), reader=None))
+
+    assert status == 400
+    assert "error" in payload
+
+def test_failed_search_answers_500(monkeypatch):
+    import server
+
+    # An argument the worker's solver doesn't take makes the search raise
+    resolve_query = server.resolve_query
+
+    def broken(spec, hero_index, trait_index):
+        max_team_size, query = resolve_query(spec, hero_index, trait_index)
+        return max_team_size, dict(query, unknown_argument=1)
+
+    monkeypatch.setattr(server, "resolve_query", broken)
+
+    class OpenConnection:
+        async def read(self, n):
+            await asyncio.sleep(60)
+
+    async def run():
+        optimizer = OptimizerServer(HERO_INDEX, TRAIT_INDEX)
+        optimizer.start()
+        try:
+            return await optimizer._query(b'{"size": 3}', OpenConnection())
+        finally:
+            optimizer.close()
+
+    status, payload = asyncio.run(run())
+
+    assert status == 500
+    assert "unknown_argument" in payload["error"]
@@ -0,0 +1,123 @@
+import pytest
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, reference, scores
+from helper import find_best_team_bnb
+from session import OptimizerSession
+from stats import SolverStats
+
+def _expected(session):
+    return find_best_team_bnb(session.max_team_size, HERO_INDEX, TRAIT_INDEX, **session.query())
+
+def _best(session):
+    stats = SolverStats()
+    return session.best_teams(stats=stats), stats.extra["warm_start"]
+
+def test_session_matches_find_best_team(query):
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, **query.kwargs())
+
+    assert scores(session.best_teams()) == scores(reference(query))
+
+def test_every_delta_matches_bnb():
+    query = QUERIES[-1]
+
+    # Start one core hero short of the query, then walk the board around
+    session = OptimizerSession(
+        HERO_INDEX,
+        TRAIT_INDEX,
+        query.size,
+        core_hero_ids=query.core_hero_ids[:-1],
+        glory_league_ids=query.glory_league_ids,
+        magic_crystal_ids=query.magic_crystal_ids,
+    )
+    results, how = _best(session)
+    assert how == "cold"
+    assert scores(results) == scores(_expected(session))
+
+    deltas = [
+        lambda: session.add_core(HERO_INDEX[query.core_hero_ids[-1]].name),
+        lambda: session.remove_crystal("Marksman"),
+        lambda: session.add_crystal("Mage"),
+        lambda: session.set_glory_league(None),
+        lambda: session.set_team_size(6),
+        lambda: session.remove_core("Barats"),
+        lambda: session.set_team_size(7),
+    ]
+
+    for delta in deltas:
+        delta()
+        results, how = _best(session)
+        assert how != "cache"
+        assert scores(results) == scores(_expected(session))
+
+def test_adding_a_core_hero_of_every_top_team_reuses_the_answer():
+    query = WIDE_QUERIES[-1]
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, **query.kwargs())
+    results, _ = _best(session)
+
+    shared = set.intersection(*(set(team) for _, team, _ in results)) - set(query.core_hero_ids)
+    assert shared   # X.Borg and Benedetta on the shipped roster
+
+    session.add_core(HERO_INDEX[min(shared)].name)
+    reused, how = _best(session)
+
+    assert how == "reuse"
+    assert scores(reused) == scores(_expected(session))
+
+def test_going_back_is_answered_from_history():
+    query = QUERIES[-1]
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, **query.kwargs())
+    first, _ = _best(session)
+
+    session.remove_crystal("Marksman")
+    _best(session)
+    session.add_crystal("Marksman")
+    again, how = _best(session)
+
+    assert how == "cache"
+    assert again == first
+
+def test_history_is_a_bounded_lru():
+    query = QUERIES[0]
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, history=1, **query.kwargs())
+    _best(session)
+
+    session.set_team_size(4)
+    _best(session)
+    session.set_team_size(query.size)
+    _, how = _best(session)   # evicted by the size-4 query
+
+    assert how != "cache"
+    assert _best(session)[1] == "cache"
+
+def test_history_zero_keeps_nothing():
+    query = QUERIES[0]
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, history=0, **query.kwargs())
+    _best(session)
+
+    assert _best(session)[1] != "cache"
+
+def test_history_answers_are_copies():
+    query = QUERIES[0]
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, query.size, **query.kwargs())
+    first, _ = _best(session)
+    expected = [(score, team, dict(synergy)) for score, team, synergy in first]
+
+    first[0][2].clear()
+    again, how = _best(session)
+    again[0][2].clear()
+
+    assert how == "cache"
+    assert _best(session)[0] == expected
+
+def test_team_size_larger_than_the_roster_raises():
+    with pytest.raises(ValueError, match="exceeds the roster"):
+        OptimizerSession(HERO_INDEX, TRAIT_INDEX, len(HERO_INDEX) + 1)
+
+    session = OptimizerSession(HERO_INDEX, TRAIT_INDEX, 3)
+    with pytest.raises(ValueError, match="exceeds the roster"):
+        session.set_team_size(len(HERO_INDEX) + 1)
+    assert session.max_team_size == 3
+
+def test_negative_history_raises():
+    with pytest.raises(ValueError):
+        OptimizerSession(HERO_INDEX, TRAIT_INDEX, 3, history=-1)
@@ -0,0 +1,98 @@
+from math import comb
+
+import pytest
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from helper import find_best_team, find_best_team_bnb
+from stats import PRUNE_BOUND, SolverStats, profile_query
+
+ENGINES = ["python", "bitset", "revolving", "numpy"]
+
+def _teams(query):
+    free = len(HERO_INDEX) - len(query.core_hero_ids)
+    return comb(free, query.size - len(query.core_hero_ids))
+
+def _check_clock(stats):
+    assert stats.elapsed > 0
+    assert 0 <= stats.first_result_seconds <= stats.elapsed
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_exhaustive_engines_count_every_team(engine, query):
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+
+    stats = SolverStats()
+    results = find_best_team(query.size, HERO_INDEX, TRAIT_INDEX, engine=engine, stats=stats, **query.kwargs())
+
+    assert scores(results) == scores(reference(query))
+    assert stats.solver
+    assert stats.leaves == _teams(query)
+    assert stats.pruned == {}
+    assert stats.heap_pushes == len(results) == 5
+    assert 0 <= stats.heap_replacements <= stats.leaves - stats.heap_pushes
+    _check_clock(stats)
+
+def test_bnb_counters(wide_query):
+    stats = SolverStats()
+    results = find_best_team_bnb(wide_query.size, HERO_INDEX, TRAIT_INDEX, stats=stats, **wide_query.kwargs())
+
+    assert scores(results) == scores(wide_reference(wide_query))
+    assert stats.solver == "find_best_team_bnb"
+    assert 0 < stats.leaves < _teams(wide_query)
+    assert stats.nodes > 0
+    assert stats.pruned[PRUNE_BOUND] > 0
+    assert stats.heap_pushes == 5
+    _check_clock(stats)
+
+def test_bnb_without_a_cutoff_scores_every_team():
+    # A top_k larger than the number of teams never fills the heap: no bound cut
+    query = QUERIES[1]
+    stats = SolverStats()
+    results = find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, top_k=10**6, stats=stats, **query.kwargs())
+
+    assert stats.leaves == len(results) == stats.heap_pushes == _teams(query)
+    assert PRUNE_BOUND not in stats.pruned
+    assert stats.heap_replacements == 0
+
+def test_time_split_and_restart():
+    query = WIDE_QUERIES[1]
+    stats = SolverStats(time_split=True)
+
+    find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, stats=stats, **query.kwargs())
+    first = stats.as_dict()
+
+    assert 0 < stats.scoring_seconds <= stats.elapsed
+    assert stats.enumeration_seconds == pytest.approx(stats.elapsed - stats.scoring_seconds)
+    assert stats.summary().startswith(f"Checked {stats.leaves:,} teams")
+
+    # start() resets the counters, so a reused stats object reports one run
+    find_best_team_bnb(query.size, HERO_INDEX, TRAIT_INDEX, stats=stats, **query.kwargs())
+    assert stats.leaves == first["leaves"] and stats.nodes == first["nodes"]
+    assert stats.time_split
+
+def test_enumeration_seconds_needs_time_split():
+    assert SolverStats().enumeration_seconds is None
+    assert SolverStats().as_dict()["scoring_seconds"] is None
+
+def test_absorb_adds_counters():
+    total, shard = SolverStats(), SolverStats()
+    total.nodes, total.leaves = 3, 4
+    total.prune(PRUNE_BOUND, 2)
+    shard.nodes, shard.leaves, shard.heap_pushes = 10, 20, 5
+    shard.prune(PRUNE_BOUND, 1)
+    shard.prune("capacity", 0)   # zero counts are not recorded
+
+    total.absorb(shard)
+
+    assert (total.nodes, total.leaves, total.heap_pushes) == (13, 24, 5)
+    assert total.pruned == {PRUNE_BOUND: 3}
+
+def test_profile_query(tmp_path):
+    query = QUERIES[0]
+    path = tmp_path / "bnb.prof"
+
+    results, profile = profile_query(find_best_team_bnb, query.size, HERO_INDEX, TRAIT_INDEX, path=str(path), **query.kwargs())
+
+    assert path.stat().st_size > 0
+    assert scores(results) == scores(reference(query))
+    assert profile.total_calls > 0
@@ -0,0 +1,44 @@
+import itertools
+
+from conftest import HERO_INDEX, QUERIES, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from stats import SolverStats
+from stream import iter_best_teams
+
+def _first(query, count, **kwargs):
+    teams = iter_best_teams(query.size, HERO_INDEX, TRAIT_INDEX, **query.kwargs(), **kwargs)
+    return list(itertools.islice(teams, count))
+
+def test_stream_matches_find_best_team(query):
+    assert scores(_first(query, 10)) == scores(reference(query, top_k=10))
+
+def test_stream_matches_bnb_on_wide_queries(wide_query):
+    assert scores(_first(wide_query, 10)) == scores(wide_reference(wide_query, top_k=10))
+
+def test_every_team_comes_out_once():
+    # C(50, 2) teams when 3 core heroes fill a team of 5
+    query = QUERIES[3]._replace(size=5)
+    teams = _first(query, 2000)
+
+    assert len(teams) == 1225
+    assert len({team for _, team, _ in teams}) == 1225
+    assert scores(teams) == sorted(scores(teams), reverse=True)
+
+def test_queue_grows_with_the_teams_read():
+    query = WIDE_QUERIES[-1]
+    slots = query.size - len(query.core_hero_ids)
+
+    for count in (1, 5, 20):
+        stats = SolverStats()
+        teams = _first(query, count, stats=stats)
+
+        assert len(teams) == stats.extra["yielded"] == count
+        assert stats.extra["queue_peak"] <= 1 + count * slots
+        assert stats.extra["subproblems"] <= 1 + count * slots
+        assert stats.nodes > 0 and stats.first_result_seconds is not None
+
+def test_full_team_of_core_heroes_is_the_only_team():
+    query = QUERIES[3]
+    core = query.core_hero_ids + [hid for hid in range(len(HERO_INDEX)) if hid not in query.core_hero_ids][:3]
+    teams = list(iter_best_teams(6, HERO_INDEX, TRAIT_INDEX, core_hero_ids=core))
+
+    assert [team for _, team, _ in teams] == [tuple(sorted(core))]
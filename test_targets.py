@@ -0,0 +1,42 @@
+import pytest
+
+from conftest import HERO_INDEX, TRAIT_INDEX, WIDE_QUERIES, reference, scores, wide_reference
+from targets import find_best_team_targets, get_target_ids
+
+# Enough to hold every team of the test queries (at most C(53, 3))
+ALL_TEAMS = 25_000
+
+def _meets(team, query, targets):
+    counts = dict(query.magic_crystal_ids)
+    for hid in team:
+        for tid in HERO_INDEX[hid].trait_ids:
+            counts[tid] = counts.get(tid, 0) + 1
+    return all(counts.get(tid, 0) >= level for tid, level in targets.items())
+
+@pytest.mark.parametrize("wanted", [{"Marksman": 2}, {"Mage": 2, "Metro Zero": 2}])
+def test_targets_match_filtered_find_best_team(query, wanted):
+    targets = get_target_ids(TRAIT_INDEX, wanted)
+    results = find_best_team_targets(query.size, HERO_INDEX, TRAIT_INDEX, targets, **query.kwargs())
+
+    # Glory League is not targeted here, so plain trait counts decide
+    expected = [entry for entry in reference(query, top_k=ALL_TEAMS) if _meets(entry[1], query, targets)][:5]
+    assert scores(results) == scores(expected)
+
+def test_target_level_must_be_a_threshold():
+    with pytest.raises(ValueError):
+        get_target_ids(TRAIT_INDEX, {"Marksman": 5})
+
+def test_wide_results_meet_their_targets(wide_query):
+    targets = get_target_ids(TRAIT_INDEX, {"Marksman": 4})
+    results = find_best_team_targets(wide_query.size, HERO_INDEX, TRAIT_INDEX, targets, **wide_query.kwargs())
+
+    assert len(results) == 5
+    assert all(_meets(team, wide_query, targets) for _, team, _ in results)
+    assert scores(results) == sorted(scores(results), reverse=True)
+    assert results[0][0] <= wide_reference(wide_query)[0][0]
+
+def test_unreachable_targets_give_no_teams():
+    query = WIDE_QUERIES[0]
+    targets = get_target_ids(TRAIT_INDEX, {"Marksman": 6, "Mage": 6})
+
+    assert find_best_team_targets(query.size, HERO_INDEX, TRAIT_INDEX, targets, **query.kwargs()) == []